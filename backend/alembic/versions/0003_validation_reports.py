@@ -0,0 +1,52 @@
+"""add validation_reports cache table
+
+Revision ID: 0003_validation_reports
+Revises: 0002_drafts_shares
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_validation_reports"
+down_revision = "0002_drafts_shares"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "validation_reports",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("bbdsl_version", sa.String(32), nullable=False),
+        sa.Column("schema_version", sa.String(16), nullable=False),
+        sa.Column("report", sa.JSON(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("warning_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_sha256",
+            "bbdsl_version",
+            "schema_version",
+            name="uq_validation_report_key",
+        ),
+    )
+    op.create_index(
+        "ix_validation_reports_content_sha256",
+        "validation_reports",
+        ["content_sha256"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_validation_reports_content_sha256", table_name="validation_reports"
+    )
+    op.drop_table("validation_reports")
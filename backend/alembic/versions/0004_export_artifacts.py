@@ -0,0 +1,80 @@
+"""add conventions.content_sha256 and export_artifacts table
+
+Revision ID: 0004_export_artifacts
+Revises: 0003_validation_reports
+Create Date: 2026-10-17
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_export_artifacts"
+down_revision = "0003_validation_reports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # --- conventions.content_sha256 (backfilled from yaml_content) ---
+    op.add_column(
+        "conventions", sa.Column("content_sha256", sa.String(64), nullable=True)
+    )
+    op.create_index(
+        "ix_conventions_content_sha256", "conventions", ["content_sha256"]
+    )
+    conn = op.get_bind()
+    conventions = sa.table(
+        "conventions",
+        sa.column("id", sa.Integer()),
+        sa.column("yaml_content", sa.Text()),
+        sa.column("content_sha256", sa.String(64)),
+    )
+    rows = conn.execute(sa.select(conventions.c.id, conventions.c.yaml_content))
+    for conv_id, yaml_content in rows.fetchall():
+        conn.execute(
+            conventions.update()
+            .where(conventions.c.id == conv_id)
+            .values(
+                content_sha256=hashlib.sha256(yaml_content.encode("utf-8")).hexdigest()
+            )
+        )
+
+    # --- export_artifacts ---
+    op.create_table(
+        "export_artifacts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("fmt", sa.String(16), nullable=False),
+        sa.Column("locale", sa.String(16), nullable=False, server_default="en"),
+        sa.Column("bbdsl_version", sa.String(32), nullable=False),
+        sa.Column("etag", sa.String(64), nullable=False),
+        sa.Column("media_type", sa.String(64), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_sha256",
+            "fmt",
+            "locale",
+            "bbdsl_version",
+            name="uq_export_artifact_key",
+        ),
+    )
+    op.create_index(
+        "ix_export_artifacts_content_sha256", "export_artifacts", ["content_sha256"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_artifacts_content_sha256", table_name="export_artifacts")
+    op.drop_table("export_artifacts")
+    op.drop_index("ix_conventions_content_sha256", table_name="conventions")
+    op.drop_column("conventions", "content_sha256")
@@ -0,0 +1,52 @@
+"""add diff_reports table
+
+Revision ID: 0005_diff_reports
+Revises: 0004_export_artifacts
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_diff_reports"
+down_revision = "0004_export_artifacts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "diff_reports",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("sha_a", sa.String(64), nullable=False),
+        sa.Column("sha_b", sa.String(64), nullable=False),
+        sa.Column("n_deals", sa.Integer(), nullable=False),
+        sa.Column("seed", sa.BigInteger(), nullable=False),
+        sa.Column("shard_deals", sa.Integer(), nullable=False),
+        sa.Column("bbdsl_version", sa.String(32), nullable=False),
+        sa.Column("report", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "sha_a",
+            "sha_b",
+            "n_deals",
+            "seed",
+            "shard_deals",
+            "bbdsl_version",
+            name="uq_diff_report_key",
+        ),
+    )
+    op.create_index("ix_diff_reports_sha_a", "diff_reports", ["sha_a"])
+    op.create_index("ix_diff_reports_sha_b", "diff_reports", ["sha_b"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_diff_reports_sha_b", table_name="diff_reports")
+    op.drop_index("ix_diff_reports_sha_a", table_name="diff_reports")
+    op.drop_table("diff_reports")
@@ -0,0 +1,44 @@
+"""add auction_indexes table
+
+Revision ID: 0006_auction_indexes
+Revises: 0005_diff_reports
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_auction_indexes"
+down_revision = "0005_diff_reports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auction_indexes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("index_version", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("node_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_sha256", "index_version", name="uq_auction_index_key"
+        ),
+    )
+    op.create_index(
+        "ix_auction_indexes_content_sha256", "auction_indexes", ["content_sha256"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auction_indexes_content_sha256", table_name="auction_indexes")
+    op.drop_table("auction_indexes")
@@ -0,0 +1,61 @@
+"""add revalidation_runs and revalidation_results tables
+
+Revision ID: 0007_revalidation_runs
+Revises: 0006_auction_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_revalidation_runs"
+down_revision = "0006_auction_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revalidation_runs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("bbdsl_version", sa.String(32), nullable=False),
+        sa.Column("sources", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("cursor", sa.JSON(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("invalid", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("elapsed_seconds", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "revalidation_results",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(32), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("valid", sa.Boolean(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("warning_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["revalidation_runs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("run_id", "source", "row_id", name="uq_revalidation_result_row"),
+    )
+    op.create_index(
+        "ix_revalidation_results_run_id", "revalidation_results", ["run_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revalidation_results_run_id", table_name="revalidation_results")
+    op.drop_table("revalidation_results")
+    op.drop_table("revalidation_runs")
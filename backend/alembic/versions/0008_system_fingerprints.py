@@ -0,0 +1,60 @@
+"""add system_fingerprints and lsh_buckets tables
+
+Revision ID: 0008_system_fingerprints
+Revises: 0007_revalidation_runs
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_system_fingerprints"
+down_revision = "0007_revalidation_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "system_fingerprints",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("fingerprint_version", sa.Integer(), nullable=False),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.Column("shingle_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_sha256", "fingerprint_version", name="uq_system_fingerprint_key"
+        ),
+    )
+    op.create_index(
+        "ix_system_fingerprints_content_sha256", "system_fingerprints", ["content_sha256"]
+    )
+    op.create_table(
+        "lsh_buckets",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("fingerprint_version", sa.Integer(), nullable=False),
+        sa.Column("band", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_sha256", "fingerprint_version", "band", name="uq_lsh_bucket_band"
+        ),
+    )
+    op.create_index(
+        "ix_lsh_buckets_lookup", "lsh_buckets", ["fingerprint_version", "band", "bucket"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lsh_buckets_lookup", table_name="lsh_buckets")
+    op.drop_table("lsh_buckets")
+    op.drop_index("ix_system_fingerprints_content_sha256", table_name="system_fingerprints")
+    op.drop_table("system_fingerprints")
@@ -0,0 +1,35 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: 0009_keyset_indexes
+Revises: 0008_system_fingerprints
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0009_keyset_indexes"
+down_revision = "0008_system_fingerprints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_conventions_created_at_id", "conventions", ["created_at", "id"])
+    op.create_index("ix_conventions_downloads_id", "conventions", ["downloads", "id"])
+    op.create_index("ix_conventions_name_id", "conventions", ["name", "id"])
+    op.create_index(
+        "ix_comments_convention_created_at_id",
+        "comments",
+        ["convention_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_drafts_user_updated_at_id", "drafts", ["user_id", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_drafts_user_updated_at_id", table_name="drafts")
+    op.drop_index("ix_comments_convention_created_at_id", table_name="comments")
+    op.drop_index("ix_conventions_name_id", table_name="conventions")
+    op.drop_index("ix_conventions_downloads_id", table_name="conventions")
+    op.drop_index("ix_conventions_created_at_id", table_name="conventions")
@@ -0,0 +1,44 @@
+"""add full-text search index for conventions
+
+PostgreSQL: a ``search_vector`` tsvector column with a GIN index.
+SQLite: an FTS5 table ``conventions_fts`` keyed by convention id.
+Fill it for existing rows with ``python -m app.cli reindex-search``.
+
+Revision ID: 0010_convention_search
+Revises: 0009_keyset_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0010_convention_search"
+down_revision = "0009_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+# A copy of app.models.convention.SEARCH_DDL as of this revision.
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS conventions_fts USING fts5("
+        "title, summary, body, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+    "postgresql": [
+        "ALTER TABLE conventions ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        "CREATE INDEX IF NOT EXISTS ix_conventions_search_vector "
+        "ON conventions USING gin (search_vector)",
+    ],
+}
+
+
+def upgrade() -> None:
+    for statement in SEARCH_DDL.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_conventions_search_vector")
+        op.execute("ALTER TABLE conventions DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS conventions_fts")
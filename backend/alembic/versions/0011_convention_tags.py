@@ -0,0 +1,90 @@
+"""add normalized tags and convention_tags tables
+
+Backfills them from the comma-separated ``conventions.tags`` column,
+which is kept for display.
+
+Revision ID: 0011_convention_tags
+Revises: 0010_convention_search
+Create Date: 2026-10-17
+"""
+
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_convention_tags"
+down_revision = "0010_convention_search"
+branch_labels = None
+depends_on = None
+
+MAX_TAG_LENGTH = 64  # tags.name
+
+
+def parse_tags(tags: str | None) -> list[str]:
+    """Distinct normalized tags of a comma-separated string, in order.
+
+    A copy of app.services.tag_service.parse_tags as of this revision,
+    except that stored tags cannot be rejected: longer ones are cut to
+    fit ``tags.name``.
+    """
+    if not tags:
+        return []
+    names = (" ".join(tag.split()).lower()[:MAX_TAG_LENGTH] for tag in tags.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def upgrade() -> None:
+    tags = op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(64), nullable=False),
+        sa.Column("convention_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_tags_convention_count", "tags", ["convention_count"])
+    convention_tags = op.create_table(
+        "convention_tags",
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("convention_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.ForeignKeyConstraint(["convention_id"], ["conventions.id"]),
+        sa.PrimaryKeyConstraint("tag_id", "convention_id"),
+    )
+    op.create_index(
+        "ix_convention_tags_convention_id", "convention_tags", ["convention_id"]
+    )
+
+    bind = op.get_bind()
+    tagged = [
+        (conv_id, parse_tags(value))
+        for conv_id, value in bind.execute(
+            sa.text("SELECT id, tags FROM conventions WHERE tags IS NOT NULL")
+        )
+    ]
+    counts = Counter(name for _, names in tagged for name in names)
+    if not counts:
+        return
+    ids = {name: i for i, name in enumerate(sorted(counts), start=1)}
+    op.bulk_insert(
+        tags,
+        [{"id": ids[name], "name": name, "convention_count": n} for name, n in counts.items()],
+    )
+    op.bulk_insert(
+        convention_tags,
+        [
+            {"tag_id": ids[name], "convention_id": conv_id}
+            for conv_id, names in tagged
+            for name in names
+        ],
+    )
+    if bind.dialect.name == "postgresql":
+        op.execute("SELECT setval(pg_get_serial_sequence('tags', 'id'), max(id)) FROM tags")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_convention_tags_convention_id", table_name="convention_tags")
+    op.drop_table("convention_tags")
+    op.drop_index("ix_tags_convention_count", table_name="tags")
+    op.drop_table("tags")
@@ -0,0 +1,57 @@
+"""add rating aggregates to conventions
+
+``rating_sum``, ``rating_count``, ``rating_avg`` and a 1–5 star
+histogram, backfilled from ``ratings`` and indexed for sorting by
+rating.  ``python -m app.cli repair-ratings`` recomputes them later.
+
+Revision ID: 0012_rating_aggregates
+Revises: 0011_convention_tags
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_rating_aggregates"
+down_revision = "0011_convention_tags"
+branch_labels = None
+depends_on = None
+
+COUNTERS = ["rating_sum", "rating_count"] + [f"rating_{score}" for score in range(1, 6)]
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column(
+            "conventions", sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+        )
+    op.add_column(
+        "conventions", sa.Column("rating_avg", sa.Float(), nullable=False, server_default="0")
+    )
+
+    def of_ratings(expr: str) -> str:
+        return (
+            f"(SELECT COALESCE({expr}, 0) FROM ratings "
+            "WHERE ratings.convention_id = conventions.id)"
+        )
+
+    histogram = ", ".join(
+        f"rating_{s} = {of_ratings(f'SUM(CASE WHEN score = {s} THEN 1 ELSE 0 END)')}"
+        for s in range(1, 6)
+    )
+    op.execute(
+        f"UPDATE conventions SET rating_sum = {of_ratings('SUM(score)')}, "
+        f"rating_count = {of_ratings('COUNT(*)')}, {histogram}"
+    )
+    op.execute(
+        "UPDATE conventions SET rating_avg = CAST(rating_sum AS FLOAT) / rating_count "
+        "WHERE rating_count > 0"
+    )
+    op.create_index("ix_conventions_rating_avg_id", "conventions", ["rating_avg", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conventions_rating_avg_id", table_name="conventions")
+    op.drop_column("conventions", "rating_avg")
+    for name in reversed(COUNTERS):
+        op.drop_column("conventions", name)
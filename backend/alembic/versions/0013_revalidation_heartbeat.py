@@ -0,0 +1,30 @@
+"""add a heartbeat to revalidation runs
+
+A run is claimed by a conditional ``UPDATE`` of its status and kept by
+refreshing ``heartbeat_at``, so only one process (of any API worker or
+CLI) executes it and a run left "running" by a dead process can be
+taken over.
+
+Revision ID: 0013_revalidation_heartbeat
+Revises: 0012_rating_aggregates
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_revalidation_heartbeat"
+down_revision = "0012_rating_aggregates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "revalidation_runs",
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("revalidation_runs", "heartbeat_at")
@@ -0,0 +1,38 @@
+"""record the simulation phase in diff_reports
+
+A row is written when a simulation starts (``status`` running, with
+``updated_at`` as the runner's heartbeat) and completed with the report
+or the error, so any API process can answer for it.  Existing rows are
+finished reports.
+
+Revision ID: 0014_diff_simulation_phase
+Revises: 0013_revalidation_heartbeat
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_diff_simulation_phase"
+down_revision = "0013_revalidation_heartbeat"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("diff_reports") as batch:
+        batch.add_column(
+            sa.Column("status", sa.String(16), nullable=False, server_default="ready")
+        )
+        batch.add_column(sa.Column("error", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+        batch.alter_column("report", existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM diff_reports WHERE status <> 'ready'")
+    with op.batch_alter_table("diff_reports") as batch:
+        batch.alter_column("report", existing_type=sa.JSON(), nullable=False)
+        batch.drop_column("updated_at")
+        batch.drop_column("error")
+        batch.drop_column("status")
@@ -0,0 +1,159 @@
+"""Admin endpoints — registry-wide maintenance jobs."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+
+from app.core.security import require_admin
+from app.models.revalidation import RevalidationRun
+from app.models.user import User
+from app.services.revalidation_service import (
+    SOURCES,
+    RevalidationError,
+    check_resumable,
+    create_run,
+    get_run,
+    is_active,
+    list_invalid,
+    rows_per_second,
+    run_revalidation,
+)
+
+router = APIRouter()
+
+
+class RevalidationRequest(BaseModel):
+    """Request body for starting a bulk revalidation run."""
+    sources: list[str] = Field(default_factory=lambda: ["conventions"], min_length=1)
+    batch_size: int | None = Field(None, ge=1, le=10_000)
+
+
+class RevalidationStatus(BaseModel):
+    """Progress of a revalidation run."""
+    id: int
+    bbdsl_version: str
+    sources: list[str]
+    status: str  # pending | running | completed | failed | interrupted
+    active: bool  # held by a live process (recent heartbeat)
+    cursor: dict[str, int]  # last committed row id per source
+    processed: int
+    invalid: int
+    rows_per_second: float
+    error: str | None
+    created_at: str
+    finished_at: str | None
+
+
+class RevalidationFailure(BaseModel):
+    """A stored row that failed revalidation."""
+    id: int
+    source: str
+    row_id: int
+    content_sha256: str
+    error_count: int
+    warning_count: int
+    error: str | None
+
+
+def _to_status(run: RevalidationRun) -> RevalidationStatus:
+    return RevalidationStatus(
+        id=run.id,
+        bbdsl_version=run.bbdsl_version,
+        sources=run.sources,
+        status=run.status,
+        active=is_active(run),
+        cursor=run.cursor,
+        processed=run.processed,
+        invalid=run.invalid,
+        rows_per_second=round(rows_per_second(run), 2),
+        error=run.error,
+        created_at=run.created_at.isoformat(),
+        finished_at=run.finished_at.isoformat() if run.finished_at else None,
+    )
+
+
+@router.post(
+    "/admin/revalidations",
+    response_model=RevalidationStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_revalidation(
+    body: RevalidationRequest,
+    background_tasks: BackgroundTasks,
+    _: User = Depends(require_admin),
+):
+    """Revalidate every stored row of *sources* with the installed bbdsl.
+
+    Runs in the background; poll ``GET /admin/revalidations/{id}``.
+    Same as ``python -m app.cli revalidate``.
+    """
+    try:
+        run = await create_run(body.sources)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{exc}. Known sources: {', '.join(SOURCES)}",
+        )
+    background_tasks.add_task(run_revalidation, run.id, body.batch_size)
+    return _to_status(run)
+
+
+@router.post(
+    "/admin/revalidations/{run_id}/resume",
+    response_model=RevalidationStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def resume_revalidation(
+    run_id: int,
+    background_tasks: BackgroundTasks,
+    batch_size: int | None = Query(None, ge=1, le=10_000),
+    _: User = Depends(require_admin),
+):
+    """Continue an interrupted or failed run after its last committed row."""
+    try:
+        run = await check_resumable(run_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except RevalidationError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    background_tasks.add_task(run_revalidation, run.id, batch_size)
+    return _to_status(run)
+
+
+@router.get("/admin/revalidations/{run_id}", response_model=RevalidationStatus)
+async def get_revalidation(run_id: int, _: User = Depends(require_admin)):
+    """Progress and throughput of a run."""
+    run = await get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Revalidation run not found")
+    return _to_status(run)
+
+
+@router.get(
+    "/admin/revalidations/{run_id}/failures",
+    response_model=list[RevalidationFailure],
+)
+async def get_revalidation_failures(
+    run_id: int,
+    source: str | None = Query(None, description="Only rows of this source table"),
+    after: int = Query(0, ge=0, description="Id of the last failure already seen"),
+    limit: int = Query(100, ge=1, le=1000),
+    _: User = Depends(require_admin),
+):
+    """Rows that failed validation in a run, in the order they were checked."""
+    if await get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="Revalidation run not found")
+    results = await list_invalid(run_id, source=source, after=after, limit=limit)
+    return [
+        RevalidationFailure(
+            id=r.id,
+            source=r.source,
+            row_id=r.row_id,
+            content_sha256=r.content_sha256,
+            error_count=r.error_count,
+            warning_count=r.warning_count,
+            error=r.error,
+        )
+        for r in results
+    ]
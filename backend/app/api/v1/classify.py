@@ -0,0 +1,85 @@
+"""Batch hand classification — the opening bid a stored system assigns."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.convention import Convention
+from app.services.bbdsl_service import content_hash
+from app.services.classify_service import classify_stream, get_classifier
+from app.services.hand_classifier import parse_pbn_hands, unpack_hands
+from app.services.registry_service import yaml_loader
+
+router = APIRouter()
+
+PACKED_MEDIA_TYPE = "application/octet-stream"
+
+
+class ClassifyRequest(BaseModel):
+    """JSON request body: PBN hands in S.H.D.C order, e.g. ``AKQ2.K32.Q5.J432``."""
+    hands: list[str] = Field(..., min_length=1)
+
+
+@router.post("/conventions/{conv_id}/classify")
+async def classify_hands(
+    conv_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Return the opening bid of every hand in a batch (``P`` if none).
+
+    The body is either JSON (:class:`ClassifyRequest`) or, with
+    ``Content-Type: application/octet-stream``, packed hands: one
+    little-endian uint64 per hand with bit ``suit * 13 + rank`` set per
+    card (suits S, H, D, C; ranks A..2).
+
+    The response streams NDJSON lines ``{"hand": i, "bid": "1NT"}`` in
+    input order.  Hand constraints the classifier does not evaluate are
+    listed in the ``X-BBDSL-Ignored-Constraints`` header.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type == PACKED_MEDIA_TYPE:
+            hands = unpack_hands(body)
+        else:
+            hands = parse_pbn_hands(ClassifyRequest.model_validate_json(body).hands)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if len(hands) > settings.classify_max_hands:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.classify_max_hands} hands per request.",
+        )
+
+    result = await db.execute(
+        select(Convention.content_sha256).where(Convention.id == conv_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
+
+    load_yaml = yaml_loader(db, conv_id)
+    sha256 = row.content_sha256 or content_hash(await load_yaml())
+    try:
+        classifier = await get_classifier(sha256, load_yaml)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    headers = {}
+    if classifier.ignored:
+        headers["X-BBDSL-Ignored-Constraints"] = ",".join(classifier.ignored)
+    return StreamingResponse(
+        classify_stream(classifier, hands),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
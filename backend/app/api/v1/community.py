@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import InvalidCursorError, count_rows, keyset_page, next_cursor
 from app.core.security import get_current_user, require_user
 from app.models.convention import Convention
 from app.models.rating import Comment, Rating
 from app.models.user import User
+from app.services.rating_service import HISTOGRAM, histogram, record_rating
 
 router = APIRouter()
 
@@ -40,6 +44,7 @@ class RatingStats(BaseModel):
     convention_id: int
     average: float
     count: int
+    histogram: list[int]  # number of 1…5-star ratings
     user_rating: int | None = None  # current user's rating, if any
 
 
@@ -61,9 +66,11 @@ class CommentResponse(BaseModel):
 
 class CommentListResponse(BaseModel):
     items: list[CommentResponse]
-    total: int
+    total: int | None
+    total_estimated: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 class RecommendationItem(BaseModel):
@@ -106,33 +113,28 @@ async def upsert_rating(
     if conv is None:
         raise HTTPException(status_code=404, detail="Convention not found")
 
-    # Check existing rating
+    # Check existing rating (locked, so the aggregates see every change once)
     result = await db.execute(
-        select(Rating).where(
+        select(Rating)
+        .where(
             Rating.convention_id == convention_id,
             Rating.user_id == user.id,
         )
+        .with_for_update()
     )
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        existing.score = body.score
-        await db.commit()
-        await db.refresh(existing)
-        return RatingResponse(
-            id=existing.id,
-            convention_id=existing.convention_id,
-            user_id=existing.user_id,
-            score=existing.score,
-            created_at=existing.created_at.isoformat(),
-        )
+    rating = result.scalar_one_or_none()
 
-    rating = Rating(
-        convention_id=convention_id,
-        user_id=user.id,
-        score=body.score,
-    )
-    db.add(rating)
+    if rating:
+        await record_rating(db, convention_id, rating.score, body.score)
+        rating.score = body.score
+    else:
+        rating = Rating(
+            convention_id=convention_id,
+            user_id=user.id,
+            score=body.score,
+        )
+        db.add(rating)
+        await record_rating(db, convention_id, None, body.score)
     await db.commit()
     await db.refresh(rating)
     return RatingResponse(
@@ -153,21 +155,21 @@ async def get_rating_stats(
     user: User | None = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get aggregated rating statistics for a convention."""
-    # Verify convention exists
-    conv = await db.get(Convention, convention_id)
-    if conv is None:
-        raise HTTPException(status_code=404, detail="Convention not found")
+    """Get aggregated rating statistics for a convention.
 
-    result = await db.execute(
-        select(
-            func.avg(Rating.score).label("average"),
-            func.count(Rating.id).label("count"),
-        ).where(Rating.convention_id == convention_id)
-    )
-    row = result.one()
-    avg = float(row.average) if row.average is not None else 0.0
-    count = row.count
+    Reads the aggregates stored on the convention row.
+    """
+    row = (
+        await db.execute(
+            select(
+                Convention.rating_avg,
+                Convention.rating_count,
+                *HISTOGRAM.values(),
+            ).where(Convention.id == convention_id)
+        )
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
 
     # Get current user's rating if logged in
     user_rating: int | None = None
@@ -184,8 +186,9 @@ async def get_rating_stats(
 
     return RatingStats(
         convention_id=convention_id,
-        average=round(avg, 2),
-        count=count,
+        average=round(row.rating_avg, 2),
+        count=row.rating_count,
+        histogram=histogram(row),
         user_rating=user_rating,
     )
 
@@ -236,33 +239,41 @@ async def create_comment(
 )
 async def list_comments(
     convention_id: int,
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    count: Literal["auto", "exact", "none"] = Query("auto", description="Total to return"),
+    page: int = Query(1, ge=1, description="Offset paging; prefer cursor"),
     page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
-    """List comments for a convention with pagination (newest first)."""
-    conv = await db.get(Convention, convention_id)
-    if conv is None:
+    """List comments for a convention with pagination (newest first).
+
+    Follow ``next_cursor`` for older comments; see ``GET /conventions``
+    for ``count``.
+    """
+    exists = await db.scalar(select(Convention.id).where(Convention.id == convention_id))
+    if exists is None:
         raise HTTPException(status_code=404, detail="Convention not found")
 
-    # Count
-    count_result = await db.execute(
-        select(func.count(Comment.id)).where(
-            Comment.convention_id == convention_id
+    stmt = select(Comment).where(Comment.convention_id == convention_id)
+    total, estimated = await count_rows(db, stmt, count, cursor)
+
+    try:
+        stmt = keyset_page(
+            stmt,
+            [Comment.created_at, Comment.id],
+            sort="newest",
+            descending=True,
+            cursor=cursor,
+            limit=page_size,
         )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if cursor is None and page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
+    result = await db.execute(stmt)
+    comments, next_page = next_cursor(
+        list(result.scalars()), "newest", lambda c: (c.created_at, c.id), page_size
     )
-    total = count_result.scalar_one()
-
-    # Paginated list
-    offset = (page - 1) * page_size
-    result = await db.execute(
-        select(Comment)
-        .where(Comment.convention_id == convention_id)
-        .order_by(Comment.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
-    )
-    comments = result.scalars().all()
 
     return CommentListResponse(
         items=[
@@ -277,8 +288,10 @@ async def list_comments(
             for c in comments
         ],
         total=total,
+        total_estimated=estimated,
         page=page,
         page_size=page_size,
+        next_cursor=next_page,
     )
 
 
@@ -344,14 +357,9 @@ async def get_recommendations(
         # 2. Not already rated by user
         # 3. Share tags with user's interests OR are popular
         query = (
-            select(
-                Convention,
-                func.avg(Rating.score).label("avg_rating"),
-            )
-            .outerjoin(Rating, Rating.convention_id == Convention.id)
+            select(Convention)
             .where(Convention.author_id != user.id)
-            .group_by(Convention.id)
-            .order_by(func.count(Rating.id).desc(), Convention.downloads.desc())
+            .order_by(Convention.rating_count.desc(), Convention.downloads.desc())
             .limit(limit)
         )
 
@@ -363,19 +371,11 @@ async def get_recommendations(
     else:
         # Anonymous: return most popular conventions
         result = await db.execute(
-            select(
-                Convention,
-                func.avg(Rating.score).label("avg_rating"),
-            )
-            .outerjoin(Rating, Rating.convention_id == Convention.id)
-            .group_by(Convention.id)
-            .order_by(Convention.downloads.desc())
-            .limit(limit)
+            select(Convention).order_by(Convention.downloads.desc()).limit(limit)
         )
 
-    rows = result.all()
     items = []
-    for conv, avg_rating in rows:
+    for conv in result.scalars():
         items.append(
             RecommendationItem(
                 id=conv.id,
@@ -385,7 +385,7 @@ async def get_recommendations(
                 description=conv.description,
                 tags=conv.tags,
                 downloads=conv.downloads,
-                avg_rating=round(float(avg_rating), 2) if avg_rating else None,
+                avg_rating=round(conv.rating_avg, 2) if conv.rating_count else None,
                 author_name=conv.author.name if conv.author else "unknown",
             )
         )
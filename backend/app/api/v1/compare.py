@@ -2,32 +2,152 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from typing import Literal
 
-from app.services.bbdsl_service import diff
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.services.bbdsl_service import WorkerPoolError
+from app.services.diff_service import (
+    SystemSource,
+    compare_sources,
+    compare_structural,
+    get_simulation,
+    inline_source,
+    start_simulation,
+)
+from app.services.registry_service import resolve_source
 
 router = APIRouter()
 
 
+class ConventionRef(BaseModel):
+    """A registry convention, by id or by namespace + version."""
+    id: int | None = None
+    namespace: str | None = None
+    version: str | None = None
+
+    @model_validator(mode="after")
+    def _check_complete(self) -> ConventionRef:
+        if self.id is None and (self.namespace is None or self.version is None):
+            raise ValueError("Give either id, or namespace and version")
+        return self
+
+
 class CompareRequest(BaseModel):
-    """Request body for system comparison."""
-    yaml_a: str
-    yaml_b: str
-    n_deals: int = 20
-    seed: int = 42
+    """Request body for system comparison.
+
+    Each side is either inline YAML (``yaml_a``) or a registry reference
+    (``ref_a``), which is resolved server-side without a round trip
+    through the client.
+    """
+    yaml_a: str | None = None
+    yaml_b: str | None = None
+    ref_a: ConventionRef | None = None
+    ref_b: ConventionRef | None = None
+    n_deals: int = Field(20, ge=1, le=settings.diff_max_deals)
+    seed: int = Field(42, ge=-(2**63), lt=2**63)  # stored as BIGINT in diff_reports
+    # "structural" compares the bidding trees only and returns at once
+    mode: Literal["simulated", "structural"] = "simulated"
+    # structural mode: also start the simulation as a background phase
+    simulate: bool = False
+    locale: str = "en"
+
+    @model_validator(mode="after")
+    def _check_sides(self) -> CompareRequest:
+        for side in ("a", "b"):
+            if (getattr(self, f"yaml_{side}") is None) == (getattr(self, f"ref_{side}") is None):
+                raise ValueError(f"Give exactly one of yaml_{side} and ref_{side}")
+        return self
+
+
+async def _source(db: AsyncSession, content: str | None, ref: ConventionRef | None) -> SystemSource:
+    if content is not None:
+        return inline_source(content)
+    source = await resolve_source(db, ref.id, ref.namespace, ref.version)
+    if source is None:
+        raise HTTPException(status_code=404, detail=f"Convention not found: {ref.model_dump()}")
+    return source
 
 
 @router.post("/diff")
-async def compare_systems(body: CompareRequest):
-    """Compare two BBDSL systems and return a structured diff report."""
+async def compare_systems(body: CompareRequest, db: AsyncSession = Depends(get_db)):
+    """Compare two BBDSL systems and return a structured diff report.
+
+    ``mode=simulated`` (default): deals are simulated in shards across
+    the worker pool; the report is the same for a given seed however
+    many workers are configured.  Reports are cached per (system A,
+    system B, n_deals, seed), each direction separately.
+
+    ``mode=structural``: the two bidding trees are compared bid by bid
+    without dealing hands.  The report's ``simulation`` entry says
+    whether the simulated report is ready, running (with
+    ``simulate=true``) or not requested, and where to collect it.
+    """
+    source_a = await _source(db, body.yaml_a, body.ref_a)
+    source_b = await _source(db, body.yaml_b, body.ref_b)
     try:
-        report = diff(
-            body.yaml_a,
-            body.yaml_b,
-            n_deals=body.n_deals,
-            seed=body.seed,
-        )
+        if body.mode == "simulated":
+            report, _ = await compare_sources(
+                source_a, source_b, n_deals=body.n_deals, seed=body.seed
+            )
+            return report
+
+        report = await compare_structural(source_a, source_b, locale=body.locale)
+        if body.simulate:
+            phase = await start_simulation(
+                source_a, source_b, n_deals=body.n_deals, seed=body.seed
+            )
+        else:
+            phase = "not_requested"
+    except WorkerPoolError:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    report["simulation"] = {
+        "status": phase,
+        "url": (
+            f"/api/v1/diff/simulation/{source_a.sha256}/{source_b.sha256}"
+            f"?n_deals={body.n_deals}&seed={body.seed}"
+        ),
+    }
+    return report
+
+
+@router.get("/diff/simulation/{sha_a}/{sha_b}")
+async def get_simulated_diff(
+    sha_a: str,
+    sha_b: str,
+    n_deals: int = Query(20, ge=1, le=settings.diff_max_deals),
+    seed: int = Query(42, ge=-(2**63), lt=2**63),
+    wait: float = Query(0.0, ge=0, le=30, description="Seconds to wait for a running simulation"),
+):
+    """Collect the simulated phase of a structural diff.
+
+    Returns the report (200) once ready and ``{"status": "running"}``
+    (202) while it runs, in whichever API process.  A simulation that
+    was never started answers 404 ``{"status": "not_started"}``, one
+    that failed (or whose process died) 422 ``{"status": "failed",
+    "error": ...}``; either is (re)started by ``POST /diff`` with
+    ``simulate=true``, or by requesting ``mode=simulated``.
+    """
+    try:
+        status, report = await get_simulation(sha_a, sha_b, n_deals, seed, wait=wait)
+    except WorkerPoolError:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=422, detail=str(exc))
+    if status == "not_started":
+        return JSONResponse(
+            status_code=404, content={"status": status, "detail": "Simulation not started"}
+        )
+    if status == "failed":
+        return JSONResponse(status_code=422, content={"status": status, **report})
+    if status == "running":
+        return JSONResponse(status_code=202, content={"status": "running"})
     return report
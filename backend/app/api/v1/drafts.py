@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import InvalidCursorError, count_rows, keyset_page, next_cursor
 from app.core.security import require_user
 from app.models.draft import Draft
 from app.models.user import User
@@ -48,9 +51,11 @@ class DraftListResponse(BaseModel):
     """Paginated list of drafts."""
 
     items: list[DraftResponse]
-    total: int
+    total: int | None  # see the ``count`` parameter
+    total_estimated: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 # ────────────────────── Endpoints ──────────────────────
@@ -80,27 +85,46 @@ async def create_draft(
 
 @router.get("/drafts", response_model=DraftListResponse)
 async def list_drafts(
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    count: Literal["auto", "exact", "none"] = Query("auto", description="Total to return"),
+    page: int = Query(1, ge=1, description="Offset paging; prefer cursor"),
     page_size: int = Query(20, ge=1, le=100),
     user: User = Depends(require_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List the current user's drafts (newest first)."""
-    stmt = select(Draft).where(Draft.user_id == user.id)
-
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
+    """List the current user's drafts (newest first).
 
-    stmt = stmt.order_by(Draft.updated_at.desc())
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    Follow ``next_cursor`` for older drafts; see ``GET /conventions`` for
+    ``count``.
+    """
+    stmt = select(Draft).where(Draft.user_id == user.id)
+    total, estimated = await count_rows(db, stmt, count, cursor)
+
+    try:
+        stmt = keyset_page(
+            stmt,
+            [Draft.updated_at, Draft.id],
+            sort="updated",
+            descending=True,
+            cursor=cursor,
+            limit=page_size,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if cursor is None and page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
     result = await db.execute(stmt)
-    items = result.scalars().all()
+    items, next_page = next_cursor(
+        list(result.scalars()), "updated", lambda d: (d.updated_at, d.id), page_size
+    )
 
     return DraftListResponse(
         items=[_to_response(d) for d in items],
         total=total,
+        total_estimated=estimated,
         page=page,
         page_size=page_size,
+        next_cursor=next_page,
     )
 
 
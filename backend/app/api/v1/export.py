@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import PlainTextResponse, Response
-from pydantic import BaseModel
+import secrets
 
-from app.services.bbdsl_service import export
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.convention import Convention
+from app.services.artifact_service import MEDIA_TYPES, get_artifact, get_or_build_artifact
+from app.services.bbdsl_service import WorkerPoolError, export, run_in_pool
+from app.services.export_service import open_board_stream, open_bundle_stream
 
 router = APIRouter()
 
-SUPPORTED_FORMATS = {"bml", "bboalert", "svg", "html", "pbn", "lin"}
+SUPPORTED_FORMATS = set(MEDIA_TYPES)
+STREAMING_FORMATS = {"pbn", "lin"}
 
 
 class ExportRequest(BaseModel):
@@ -18,36 +27,155 @@ class ExportRequest(BaseModel):
     yaml_content: str
     locale: str = "en"
     suit_symbols: bool = False
-    # PBN-specific
-    n_deals: int = 10
+    # PBN/LIN-specific
+    n_deals: int = Field(10, ge=1, le=100_000)
     seed: int | None = None
+    deals_only: bool = False  # plain random deals, no bbdsl annotations
+
+
+class BundleRequest(BaseModel):
+    """Request body for a multi-format zip export."""
+    yaml_content: str
+    formats: list[str] = Field(
+        default_factory=lambda: ["bml", "bboalert", "html"], min_length=1
+    )
+    locales: list[str] = Field(default_factory=lambda: ["en"], min_length=1, max_length=4)
+    # PBN/LIN entries are rendered in memory, so keep them small
+    n_deals: int = Field(10, ge=1, le=1000)
+    seed: int | None = None
+
+
+@router.post("/export/bundle")
+async def export_bundle(body: BundleRequest):
+    """Export one YAML to several formats/locales as a streamed zip archive.
+
+    Entries are named ``<locale>/system.<ext>`` and appear in the order
+    their exports finish.
+    """
+    for fmt in body.formats:
+        _check_format(fmt)
+    seed = body.seed if body.seed is not None else secrets.randbelow(2**31)
+    try:
+        stream = await open_bundle_stream(
+            body.yaml_content,
+            list(dict.fromkeys(body.formats)),
+            list(dict.fromkeys(body.locales)),
+            body.n_deals,
+            seed,
+        )
+    except WorkerPoolError:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return StreamingResponse(
+        stream,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="bbdsl-export.zip"',
+            "X-BBDSL-Seed": str(seed),
+        },
+    )
 
 
 @router.post("/export/{fmt}")
 async def export_document(fmt: str, body: ExportRequest):
     """Export BBDSL YAML to the specified format.
 
-    Supported formats: bml, bboalert, svg, html, pbn.
+    Supported formats: bml, bboalert, svg, html, pbn, lin.
+    PBN and LIN are streamed board by board (chunked transfer); the seed
+    used is echoed in the ``X-BBDSL-Seed`` header so the set can be
+    reproduced.  With ``deals_only`` the boards are plain random deals
+    from the platform's vectorized deal engine.
     """
-    if fmt not in SUPPORTED_FORMATS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported format: {fmt}. Use one of {sorted(SUPPORTED_FORMATS)}.",
+    _check_format(fmt)
+    if fmt in STREAMING_FORMATS:
+        seed = body.seed if body.seed is not None else secrets.randbelow(2**31)
+        try:
+            stream = await open_board_stream(
+                body.yaml_content,
+                fmt,
+                body.n_deals,
+                seed,
+                locale=body.locale,
+                deals_only=body.deals_only,
+            )
+        except WorkerPoolError:
+            raise
+        except Exception as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        return StreamingResponse(
+            stream,
+            media_type=MEDIA_TYPES[fmt],
+            headers={"X-BBDSL-Seed": str(seed)},
         )
+
     try:
-        result = export(body.yaml_content, fmt, locale=body.locale)
+        result = await run_in_pool(export, body.yaml_content, fmt, locale=body.locale)
+    except WorkerPoolError:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
-    content_types = {
-        "bml": "text/plain; charset=utf-8",
-        "bboalert": "text/plain; charset=utf-8",
-        "svg": "image/svg+xml",
-        "html": "text/html; charset=utf-8",
-        "pbn": "text/plain; charset=utf-8",
-        "lin": "text/plain; charset=utf-8",
-    }
     return Response(
         content=result,
-        media_type=content_types.get(fmt, "text/plain"),
+        media_type=MEDIA_TYPES.get(fmt, "text/plain"),
     )
+
+
+@router.get("/conventions/{conv_id}/export/{fmt}")
+async def export_convention(
+    conv_id: int,
+    fmt: str,
+    locale: str = Query("en"),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Serve the precomputed export of a stored convention.
+
+    Artifacts are content-addressed, so the response carries a strong
+    ETag and a matching ``If-None-Match`` is answered with 304.
+    Missing artifacts are rendered on first request and stored.
+    """
+    _check_format(fmt)
+    result = await db.execute(
+        select(Convention.content_sha256).where(Convention.id == conv_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
+
+    artifact = await get_artifact(row.content_sha256, fmt, locale) if row.content_sha256 else None
+    if artifact is None:
+        yaml_content = (
+            await db.execute(
+                select(Convention.yaml_content).where(Convention.id == conv_id)
+            )
+        ).scalar_one()
+        try:
+            artifact = await get_or_build_artifact(yaml_content, fmt, locale)
+        except WorkerPoolError:
+            raise
+        except Exception as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    etag = f'"{artifact.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=artifact.body, media_type=artifact.media_type, headers=headers)
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format: {fmt}. Use one of {sorted(SUPPORTED_FORMATS)}.",
+        )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header (weak comparison, RFC 9110)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
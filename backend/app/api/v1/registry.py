@@ -2,18 +2,48 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+import hashlib
+import json
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import case, false, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import InvalidCursorError, count_rows, keyset_page, next_cursor
 from app.core.security import require_user
 from app.models.convention import Convention
 from app.models.namespace import Namespace
+from app.models.rating import Comment
 from app.models.user import User
-from app.services.bbdsl_service import validate_yaml
-from app.services.registry_service import increment_downloads
+from app.services.artifact_service import build_all_artifacts
+from app.services.auction_index import decode_bid, parse_sequence
+from app.services.auction_service import ensure_auction_index, get_tree_tile, get_trie
+from app.services.bbdsl_service import BBDSL_VERSION, WorkerPoolError, content_hash
+from app.services.diff_service import compare_sources, compare_structural
+from app.services.registry_service import increment_downloads, resolve_source, yaml_loader
+from app.services.search_service import index_convention, ranked_matches, unindex_convention
+from app.services.similarity_service import ensure_fingerprint, find_similar
+from app.services.tag_service import (
+    clear_convention_tags,
+    parse_tags,
+    set_convention_tags,
+    tag_counts,
+    tagged_ids,
+)
+from app.services.validation_service import schema_version, validate_cached
 
 router = APIRouter()
 
@@ -31,6 +61,12 @@ class ConventionCreate(BaseModel):
     tags: str | None = None
     yaml_content: str
 
+    @field_validator("tags")
+    @classmethod
+    def _check_tags(cls, tags: str | None) -> str | None:
+        parse_tags(tags)  # rejects over-long tags
+        return tags
+
 
 class ConventionUpdate(BaseModel):
     """Request body for updating a convention (partial)."""
@@ -40,6 +76,12 @@ class ConventionUpdate(BaseModel):
     tags: str | None = None
     yaml_content: str | None = None
 
+    @field_validator("tags")
+    @classmethod
+    def _check_tags(cls, tags: str | None) -> str | None:
+        parse_tags(tags)  # rejects over-long tags
+        return tags
+
 
 class ConventionResponse(BaseModel):
     """Convention data returned to the client."""
@@ -59,13 +101,47 @@ class ConventionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ConventionSummary(BaseModel):
+    """Listing entry: ``id`` plus the requested ``fields`` only."""
+
+    id: int
+    name: str | None = None
+    namespace: str | None = None
+    version: str | None = None
+    description: str | None = None
+    tags: str | None = None
+    downloads: int | None = None
+    author_name: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+    content_sha256: str | None = None
+    rating_avg: float | None = None
+    rating_count: int | None = None
+    comment_count: int | None = None
+
+
+class TagCount(BaseModel):
+    """A tag and the number of conventions carrying it."""
+
+    name: str
+    count: int
+
+
+class TagListResponse(BaseModel):
+    """Most used tags, most used first."""
+
+    items: list[TagCount]
+
+
 class ConventionListResponse(BaseModel):
     """Paginated list of conventions."""
 
-    items: list[ConventionResponse]
-    total: int
+    items: list[ConventionSummary]
+    total: int | None  # see the ``count`` parameter
+    total_estimated: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 class VersionInfo(BaseModel):
@@ -76,6 +152,50 @@ class VersionInfo(BaseModel):
     downloads: int
 
 
+class ValidationReportResponse(BaseModel):
+    """Stored (or freshly computed) validation report of a convention."""
+
+    convention_id: int
+    content_sha256: str
+    bbdsl_version: str
+    schema_version: str
+    cached: bool
+    report: dict
+
+
+class AuctionCall(BaseModel):
+    """A call that continues an auction, with its meaning if defined."""
+
+    bid: str
+    meaning: dict | None = None
+
+
+class AuctionResponse(BaseModel):
+    """Meaning of an auction sequence in a convention."""
+
+    convention_id: int
+    sequence: list[str]
+    node: dict | None  # meaning, id, ref, convention… of the last call
+    continuations: list[AuctionCall]
+
+
+class SimilarConvention(BaseModel):
+    """A convention structurally similar to another one."""
+
+    id: int
+    name: str
+    namespace: str
+    version: str
+    similarity: float  # estimated Jaccard similarity of auctions and meanings
+
+
+class SimilarResponse(BaseModel):
+    """Nearest conventions by structural fingerprint."""
+
+    convention_id: int
+    items: list[SimilarConvention]
+
+
 class NamespaceCreate(BaseModel):
     """Request body for claiming a new namespace."""
 
@@ -107,9 +227,11 @@ class NamespaceListResponse(BaseModel):
     """Paginated list of namespaces."""
 
     items: list[NamespaceResponse]
-    total: int
+    total: int | None
+    total_estimated: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 # ────────────────────── Convention CRUD (5.1.2) ──────────────────────
@@ -122,13 +244,18 @@ class NamespaceListResponse(BaseModel):
 )
 async def create_convention(
     body: ConventionCreate,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a new convention. YAML is validated automatically (5.1.3)."""
+    """Upload a new convention. YAML is validated automatically (5.1.3).
+
+    Export artifacts for every format, the auction index and the
+    structural fingerprint are built in the background.
+    """
 
     # ── 5.1.3: auto-validate on upload ──
-    report = validate_yaml(body.yaml_content)
+    report, _ = await validate_cached(body.yaml_content)
     if report.get("error_count", 0) > 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -158,65 +285,233 @@ async def create_convention(
         description=body.description,
         tags=body.tags,
         yaml_content=body.yaml_content,
+        content_sha256=content_hash(body.yaml_content),
         author_id=user.id,
     )
     db.add(conv)
+    await db.flush()
+    await set_convention_tags(db, conv.id, conv.tags)
+    await index_convention(db, conv)
     await db.commit()
     await db.refresh(conv)
+    background_tasks.add_task(build_all_artifacts, conv.yaml_content)
+    background_tasks.add_task(ensure_auction_index, conv.yaml_content)
+    background_tasks.add_task(ensure_fingerprint, conv.yaml_content)
 
     return _to_response(conv)
 
 
-@router.get("/conventions", response_model=ConventionListResponse)
+# Listing fields: the summary returned by default, then extras only
+# returned when asked for (comment_count costs an aggregate).
+LIST_FIELDS = (
+    "name",
+    "namespace",
+    "version",
+    "description",
+    "tags",
+    "downloads",
+    "author_name",
+    "created_at",
+    "updated_at",
+)
+LIST_EXTRA_FIELDS = ("content_sha256", "rating_avg", "rating_count", "comment_count")
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if fields is None:
+        return list(LIST_FIELDS)
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f != "id" and f not in LIST_FIELDS + LIST_EXTRA_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(('id',) + LIST_FIELDS + LIST_EXTRA_FIELDS)}"
+            ),
+        )
+    return [f for f in requested if f != "id"]
+
+
+# sort → (key columns ending with a unique one, descending)
+LIST_SORTS = {
+    "newest": ((Convention.created_at, Convention.id), True),
+    "oldest": ((Convention.created_at, Convention.id), False),
+    "downloads": ((Convention.downloads, Convention.id), True),
+    "name": ((Convention.name, Convention.id), False),
+    "rating": ((Convention.rating_avg, Convention.id), True),
+}
+
+
+def _summary_select(fields: list[str], key_columns: tuple = ()):
+    """Select ``id``, *fields* and the sort *key_columns* (as ``key_<i>``).
+
+    Never loads the YAML or any relationship.
+    """
+    columns = [Convention.id]
+    columns.extend(column.label(f"key_{i}") for i, column in enumerate(key_columns))
+    joins = []
+    if "comment_count" in fields:
+        comments = (
+            select(Comment.convention_id, func.count().label("comment_count"))
+            .group_by(Comment.convention_id)
+            .subquery()
+        )
+        joins.append((comments, comments.c.convention_id == Convention.id))
+    for field in fields:
+        if field == "author_name":
+            columns.append(User.name.label("author_name"))
+        elif field == "rating_avg":
+            # Stored as 0 for unrated conventions (so it sorts); listed as null
+            columns.append(
+                case((Convention.rating_count > 0, Convention.rating_avg)).label("rating_avg")
+            )
+        elif field == "comment_count":
+            columns.append(func.coalesce(comments.c.comment_count, 0).label("comment_count"))
+        else:
+            columns.append(getattr(Convention, field))
+    stmt = select(*columns).join(Convention.author)
+    for subquery, on in joins:
+        stmt = stmt.outerjoin(subquery, on)
+    return stmt
+
+
+def _to_summary(row, fields: list[str]) -> ConventionSummary:
+    values = {"id": row.id}
+    for field in fields:
+        value = getattr(row, field)
+        if field in ("created_at", "updated_at"):
+            value = value.isoformat()
+        elif field == "rating_avg" and value is not None:
+            value = round(float(value), 2)
+        values[field] = value
+    return ConventionSummary(**values)
+
+
+@router.get(
+    "/conventions",
+    response_model=ConventionListResponse,
+    response_model_exclude_unset=True,
+)
 async def list_conventions(
-    q: str | None = Query(None, description="Search by name or namespace"),
-    tag: str | None = Query(None, description="Filter by tag"),
+    q: str | None = Query(
+        None, description="Full-text search: name, descriptions, tags and the YAML's prose"
+    ),
+    tag: list[str] | None = Query(
+        None, description="Filter by exact tag (repeatable, or comma-separated)"
+    ),
+    tag_mode: Literal["all", "any"] = Query(
+        "all", description="Match all of the given tags, or any of them"
+    ),
     namespace: str | None = Query(None, description="Filter by exact namespace"),
     author: str | None = Query(None, description="Filter by author name"),
-    sort: str = Query("newest", description="Sort: newest | oldest | downloads | name"),
-    page: int = Query(1, ge=1),
+    sort: str | None = Query(
+        None,
+        description="Sort: relevance | newest | oldest | downloads | name | rating "
+        "(default: relevance with q, else newest)",
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Comma-separated fields of each item (id is always included). "
+            "Default: the summary fields; content_sha256, rating_avg, "
+            "rating_count and comment_count only when listed."
+        ),
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    count: Literal["auto", "exact", "none"] = Query("auto", description="Total to return"),
+    page: int = Query(1, ge=1, description="Offset paging; prefer cursor"),
     page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search and list conventions with pagination (5.1.4)."""
-    stmt = select(Convention).join(Convention.author)
+    """Search and list conventions with pagination (5.1.4).
+
+    ``q`` is matched against the full-text index (words in any order,
+    the last one as a prefix; zh-TW as consecutive characters) and
+    results are ranked by relevance unless another sort is asked for.
+    Items are built from the selected columns only: the YAML and the
+    ratings / comments are never loaded.  Follow ``next_cursor`` for the
+    next page (keyset pagination; ``page`` is ignored with a cursor).
+    With ``count=auto`` the total is given only without a cursor, and is
+    a planner estimate on PostgreSQL.
+    """
+    selected = _parse_fields(fields)
+    matches = ranked_matches(db, q) if q else None
 
     # ── Filters ──
-    if q:
+    filters = []
+    if q and matches is None:
         like_q = f"%{q}%"
-        stmt = stmt.where(
-            Convention.name.ilike(like_q) | Convention.namespace.ilike(like_q)
-        )
+        filters.append(Convention.name.ilike(like_q) | Convention.namespace.ilike(like_q))
     if tag:
-        stmt = stmt.where(Convention.tags.ilike(f"%{tag}%"))
+        tags = [t for value in tag for t in value.split(",")]
+        tagged = await tagged_ids(db, tags, match_all=tag_mode == "all")
+        filters.append(false() if tagged is None else Convention.id.in_(tagged))
     if namespace:
-        stmt = stmt.where(Convention.namespace == namespace)
+        filters.append(Convention.namespace == namespace)
     if author:
-        stmt = stmt.where(User.name.ilike(f"%{author}%"))
-
-    # ── Sorting ──
-    order_map = {
-        "newest": Convention.created_at.desc(),
-        "oldest": Convention.created_at.asc(),
-        "downloads": Convention.downloads.desc(),
-        "name": Convention.name.asc(),
-    }
-    stmt = stmt.order_by(order_map.get(sort, Convention.created_at.desc()))
-
-    # Count total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
+        filters.append(User.name.ilike(f"%{author}%"))
+
+    if matches is not None and sort in (None, "relevance"):
+        sort = "relevance"
+        key_columns, descending = (matches.c.rank, Convention.id), True
+    else:
+        sort = sort if sort in LIST_SORTS else "newest"
+        key_columns, descending = LIST_SORTS[sort]
+
+    def filtered(stmt):
+        if matches is not None:
+            stmt = stmt.join(matches, matches.c.id == Convention.id)
+        return stmt.where(*filters)
+
+    total, estimated = await count_rows(
+        db, filtered(select(Convention.id).join(Convention.author)), count, cursor
+    )
 
-    # Paginate
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    result = await db.execute(stmt)
-    items = result.scalars().all()
+    try:
+        stmt = keyset_page(
+            filtered(_summary_select(selected, key_columns)),
+            list(key_columns),
+            sort=sort,
+            descending=descending,
+            cursor=cursor,
+            limit=page_size,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if cursor is None and page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
+    rows, next_page = next_cursor(
+        (await db.execute(stmt)).all(),
+        sort,
+        lambda row: (row.key_0, row.key_1),
+        page_size,
+    )
 
     return ConventionListResponse(
-        items=[_to_response(c) for c in items],
+        items=[_to_summary(row, selected) for row in rows],
         total=total,
+        total_estimated=estimated,
         page=page,
         page_size=page_size,
+        next_cursor=next_page,
+    )
+
+
+@router.get("/tags", response_model=TagListResponse)
+async def list_tags(
+    response: Response,
+    q: str | None = Query(None, description="Only tags starting with this prefix"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Most used tags with the number of conventions carrying each.
+
+    Counts are kept up to date on every write, so this reads one index.
+    """
+    response.headers["Cache-Control"] = f"public, max-age={settings.tags_http_max_age}"
+    return TagListResponse(
+        items=[TagCount(name=name, count=count) for name, count in await tag_counts(db, q, limit)]
     )
 
 
@@ -234,6 +529,7 @@ async def get_convention(
 async def update_convention(
     conv_id: int,
     body: ConventionUpdate,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -248,13 +544,17 @@ async def update_convention(
 
     # If YAML content is being updated, re-validate
     if body.yaml_content is not None:
-        report = validate_yaml(body.yaml_content)
+        report, _ = await validate_cached(body.yaml_content)
         if report.get("error_count", 0) > 0:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail={"message": "YAML validation failed", "report": report},
             )
         conv.yaml_content = body.yaml_content
+        conv.content_sha256 = content_hash(body.yaml_content)
+        background_tasks.add_task(build_all_artifacts, body.yaml_content)
+        background_tasks.add_task(ensure_auction_index, body.yaml_content)
+        background_tasks.add_task(ensure_fingerprint, body.yaml_content)
 
     if body.name is not None:
         conv.name = body.name
@@ -262,7 +562,9 @@ async def update_convention(
         conv.description = body.description
     if body.tags is not None:
         conv.tags = body.tags
+        await set_convention_tags(db, conv.id, conv.tags)
 
+    await index_convention(db, conv)
     await db.commit()
     await db.refresh(conv)
     return _to_response(conv)
@@ -286,6 +588,8 @@ async def delete_convention(
             detail="Only the author can delete this convention.",
         )
 
+    await unindex_convention(db, conv.id)
+    await clear_convention_tags(db, conv.id)
     await db.delete(conv)
     await db.commit()
 
@@ -305,9 +609,228 @@ async def download_convention(
     return _to_response(conv)
 
 
+@router.get(
+    "/conventions/{conv_id}/validation",
+    response_model=ValidationReportResponse,
+)
+async def get_convention_validation(
+    conv_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Return the validation report of a convention under the installed bbdsl."""
+    conv = await _get_convention_or_404(db, conv_id)
+    try:
+        report, cached = await validate_cached(conv.yaml_content)
+    except WorkerPoolError:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return ValidationReportResponse(
+        convention_id=conv.id,
+        content_sha256=content_hash(conv.yaml_content),
+        bbdsl_version=BBDSL_VERSION,
+        schema_version=schema_version(conv.yaml_content),
+        cached=cached,
+        report=report,
+    )
+
+
+@router.get(
+    "/conventions/{conv_id}/auction",
+    response_model=AuctionResponse,
+)
+async def get_convention_auction(
+    conv_id: int,
+    seq: str = Query("", description="Calls separated by '-', e.g. 1NT-2C; empty for openings"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Look up what an auction means in a convention, plus its continuations.
+
+    Served from the convention's compiled auction trie, so the lookup
+    costs O(len(seq)) and never parses the YAML once the index exists.
+    """
+    try:
+        codes = parse_sequence(seq)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    result = await db.execute(
+        select(Convention.content_sha256).where(Convention.id == conv_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
+
+    load_yaml = yaml_loader(db, conv_id)
+    sha256 = row.content_sha256 or content_hash(await load_yaml())
+    try:
+        trie = await get_trie(sha256, load_yaml)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    node = trie.find(codes)
+    if node is None:
+        raise HTTPException(
+            status_code=404, detail="Auction is not defined in this convention"
+        )
+    return AuctionResponse(
+        convention_id=conv_id,
+        sequence=[decode_bid(code) for code in codes],
+        node=trie.payloads[node],
+        continuations=[
+            AuctionCall(bid=bid, meaning=(trie.payloads[child] or {}).get("meaning"))
+            for bid, child in trie.children(node)
+        ],
+    )
+
+
+@router.get("/conventions/{conv_id}/tree.svg")
+async def get_convention_tree_tile(
+    conv_id: int,
+    prefix: str = Query("", description="Auction the tile starts at, e.g. 1NT-2C"),
+    depth: int = Query(2, ge=1, le=settings.tree_tile_max_depth),
+    locale: str = Query("en"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Render one level-of-detail tile of the bidding tree as SVG.
+
+    The tile shows the calls *depth* levels below *prefix*.  Nodes with
+    further continuations are drawn collapsed (class ``bbdsl-collapsed``)
+    with ``data-auction`` set to the prefix of the tile that expands them
+    and ``data-children`` to the number of hidden calls.
+    """
+    try:
+        codes = parse_sequence(prefix)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    result = await db.execute(
+        select(Convention.content_sha256).where(Convention.id == conv_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
+
+    load_yaml = yaml_loader(db, conv_id)
+    sha256 = row.content_sha256 or content_hash(await load_yaml())
+    try:
+        svg = await get_tree_tile(sha256, load_yaml, codes, depth, locale)
+    except KeyError:
+        raise HTTPException(
+            status_code=404, detail="Auction is not defined in this convention"
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return Response(content=svg, media_type="image/svg+xml")
+
+
+@router.get("/conventions/{conv_id}/similar", response_model=SimilarResponse)
+async def get_similar_conventions(
+    conv_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    same_namespace: bool = Query(False, description="Include other versions of this system"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Find structurally similar systems.
+
+    Compares the MinHash fingerprints of the conventions' auctions and
+    meanings, reading only the LSH buckets this convention falls into.
+    """
+    result = await db.execute(
+        select(Convention.content_sha256, Convention.namespace).where(
+            Convention.id == conv_id
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Convention not found")
+
+    load_yaml = yaml_loader(db, conv_id)
+    sha256 = row.content_sha256 or content_hash(await load_yaml())
+    try:
+        similar = await find_similar(
+            conv_id,
+            sha256,
+            load_yaml,
+            limit=limit,
+            exclude_namespace=None if same_namespace else row.namespace,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return SimilarResponse(
+        convention_id=conv_id,
+        items=[
+            SimilarConvention(
+                id=conv.id,
+                name=conv.name,
+                namespace=conv.namespace,
+                version=conv.version,
+                similarity=round(score, 4),
+            )
+            for conv, score in similar
+        ],
+    )
+
+
 # ────────────────────── Version Management (5.1.5) ──────────────────────
 
 
+@router.get("/conventions/ns/{namespace}/diff")
+async def diff_convention_versions(
+    namespace: str,
+    from_version: str = Query(..., alias="from"),
+    to_version: str = Query(..., alias="to"),
+    mode: Literal["structural", "simulated"] = Query("structural"),
+    n_deals: int = Query(20, ge=1, le=settings.diff_max_deals),
+    seed: int = Query(42, ge=-(2**63), lt=2**63),
+    locale: str = Query("en"),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Diff two versions of a convention (``?from=1.0.0&to=1.1.0``).
+
+    Both sides are resolved server-side.  The response carries an ETag
+    derived from the two contents and the diff parameters, plus a
+    public ``Cache-Control``, so browsers and shared caches can reuse it;
+    a matching ``If-None-Match`` is answered with 304 before anything is
+    loaded or compared.
+    """
+    source_a = await resolve_source(db, namespace=namespace, version=from_version)
+    source_b = await resolve_source(db, namespace=namespace, version=to_version)
+    missing = [v for v, s in ((from_version, source_a), (to_version, source_b)) if s is None]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Convention '{namespace}' version '{missing[0]}' not found",
+        )
+
+    key = [source_a.sha256, source_b.sha256, mode, BBDSL_VERSION, locale]
+    if mode == "simulated":
+        key += [n_deals, seed, settings.diff_shard_deals]
+    etag = '"' + hashlib.sha256(json.dumps(key).encode()).hexdigest()[:32] + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.diff_http_max_age}",
+    }
+    if if_none_match is not None and etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        if mode == "simulated":
+            report, _ = await compare_sources(source_a, source_b, n_deals, seed)
+        else:
+            report = await compare_structural(source_a, source_b, locale=locale)
+    except WorkerPoolError:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return Response(
+        content=json.dumps(report, ensure_ascii=False),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 @router.get(
     "/conventions/ns/{namespace}/{version}",
     response_model=ConventionResponse,
@@ -400,11 +923,13 @@ async def create_namespace(
 @router.get("/namespaces", response_model=NamespaceListResponse)
 async def list_namespaces(
     q: str | None = Query(None, description="Search by prefix or display name"),
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    count: Literal["auto", "exact", "none"] = Query("auto", description="Total to return"),
+    page: int = Query(1, ge=1, description="Offset paging; prefer cursor"),
     page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
-    """List / search namespaces."""
+    """List / search namespaces, by prefix (keyset-paginated like conventions)."""
     stmt = select(Namespace)
     if q:
         like_q = f"%{q}%"
@@ -412,19 +937,34 @@ async def list_namespaces(
             Namespace.prefix.ilike(like_q) | Namespace.display_name.ilike(like_q)
         )
 
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt = stmt.order_by(Namespace.prefix.asc())
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    total, estimated = await count_rows(db, stmt, count, cursor)
+
+    # Prefixes are unique, so the prefix alone is the key.
+    try:
+        stmt = keyset_page(
+            stmt,
+            [Namespace.prefix],
+            sort="prefix",
+            descending=False,
+            cursor=cursor,
+            limit=page_size,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if cursor is None and page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
     result = await db.execute(stmt)
-    items = result.scalars().all()
+    items, next_page = next_cursor(
+        list(result.scalars()), "prefix", lambda ns: (ns.prefix,), page_size
+    )
 
     return NamespaceListResponse(
         items=[_to_ns_response(ns) for ns in items],
         total=total,
+        total_estimated=estimated,
         page=page,
         page_size=page_size,
+        next_cursor=next_page,
     )
 
 
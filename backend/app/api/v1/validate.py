@@ -1,33 +1,168 @@
-"""Real-time YAML validation over WebSocket."""
+"""Real-time editor channels over WebSocket: validation and tree preview."""
 
 from __future__ import annotations
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import contextlib
+import json
+from collections.abc import Callable
 
-from app.services.bbdsl_service import validate_yaml
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+
+from app.services.auction_service import trie_for_content
+from app.services.incremental_validation import IncrementalValidator
+from app.services.tree_patch import TreePatcher, tree_nodes
+from app.services.validation_delta import DiagnosticsDelta, EditBuffer, OutOfSyncError
+from app.services.validation_service import validate_cached
+from app.services.validation_session import ValidationSession, parse_message
 
 router = APIRouter()
 
 
+async def _validate_uncached(yaml_text: str) -> dict:
+    report, _ = await validate_cached(yaml_text, store=False)
+    return report
+
+
+async def _preview_nodes(yaml_text: str) -> dict:
+    trie = await trie_for_content(yaml_text)
+    return await asyncio.to_thread(tree_nodes, trie)
+
+
+def _typed_sender(websocket: WebSocket, build: Callable[[int, dict], dict]):
+    """Translate session messages into typed messages; *build* makes the "ok" one."""
+
+    async def send(message: dict) -> None:
+        if "type" not in message:
+            status = message["status"]
+            if status == "ok":
+                message = build(message["seq"], message["report"])
+            else:
+                message = {
+                    "type": status,
+                    "version": message["seq"],
+                    **({"message": message["message"]} if "message" in message else {}),
+                }
+        await websocket.send_json(message)
+
+    return send
+
+
+async def _receive_plain(websocket: WebSocket, session: ValidationSession) -> None:
+    while True:
+        seq, yaml_text = parse_message(await websocket.receive_text())
+        await session.submit(seq, yaml_text)
+
+
+async def _receive_delta(
+    websocket: WebSocket,
+    session: ValidationSession,
+    reset: Callable[[], None],
+) -> None:
+    buffer = EditBuffer()
+    while True:
+        try:
+            message = json.loads(await websocket.receive_text())
+            kind = message["type"]
+            version = message["version"]
+            if not isinstance(version, int):
+                raise TypeError("version must be an integer")
+            if kind == "sync":
+                buffer.sync(version, message["text"])
+                reset()
+            elif kind == "edit":
+                buffer.apply(
+                    message["base"], version, message["changes"], message.get("length")
+                )
+            else:
+                raise ValueError(f"Unknown message type {kind!r}")
+        except OutOfSyncError as exc:
+            await session.send(
+                {"type": "resync", "version": buffer.version, "reason": str(exc)}
+            )
+            continue
+        except (ValueError, TypeError, KeyError) as exc:
+            await session.send({"type": "error", "message": f"Bad message: {exc}"})
+            continue
+        await session.submit(version, buffer.text)
+
+
 @router.websocket("/validate")
-async def ws_validate(websocket: WebSocket):
+async def ws_validate(
+    websocket: WebSocket,
+    mode: str = Query("full", description="full | incremental"),
+    protocol: int = Query(1, ge=1, le=2, description="1: whole documents, 2: edits"),
+):
     """WebSocket endpoint for real-time BBDSL YAML validation.
 
-    Client sends YAML text; server responds with a validation report JSON.
+    Client sends YAML text, either bare or as ``{"seq": n, "yaml": ...}``;
+    server responds with ``{"status": "ok", "seq": n, "report": ...}``
+    (or ``"error"`` with a ``message``).  Only the newest document is
+    validated: one replaced before its report is ready is answered with
+    ``{"status": "superseded", "seq": n}`` instead.  Without a client
+    ``seq``, documents are numbered from 1 per connection.
+
+    With ``?mode=incremental`` the server keeps the previous document of
+    this connection and re-runs only the rules whose input sections
+    changed; the report then carries an ``incremental`` summary.
     Target latency: < 500ms.
+
+    With ``?protocol=2`` the client sends edits against a buffer held
+    here and receives only added / removed diagnostics; see
+    :mod:`app.services.validation_delta`.
     """
     await websocket.accept()
+    delta = DiagnosticsDelta() if protocol == 2 else None
+    send = websocket.send_json if delta is None else _typed_sender(websocket, delta.message)
+    if mode == "incremental":
+        # Stateful: must see one document at a time.
+        session = ValidationSession(
+            IncrementalValidator(_validate_uncached).validate, send, max_inflight=1
+        )
+    else:
+        session = ValidationSession(_validate_uncached, send)
+    dispatcher = asyncio.create_task(session.run())
     try:
-        while True:
-            yaml_text = await websocket.receive_text()
-            try:
-                report = validate_yaml(yaml_text)
-                await websocket.send_json(
-                    {"status": "ok", "report": report}
-                )
-            except Exception as exc:
-                await websocket.send_json(
-                    {"status": "error", "message": str(exc)}
-                )
+        if delta is None:
+            await _receive_plain(websocket, session)
+        else:
+            await _receive_delta(websocket, session, delta.reset)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
+        dispatcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await dispatcher
+
+
+@router.websocket("/preview")
+async def ws_preview(
+    websocket: WebSocket,
+    protocol: int = Query(1, ge=1, le=2, description="1: whole documents, 2: edits"),
+):
+    """WebSocket endpoint for the live bidding-tree preview.
+
+    Client sends documents as on ``/validate`` (same ``protocol``); server
+    keeps the compiled tree of this connection and pushes only the
+    nodes added, removed or changed, as ``{"type": "patch", ...}`` JSON
+    Patch messages (see :mod:`app.services.tree_patch`).  A document that
+    does not compile is answered with ``{"type": "error", ...}`` and the
+    client keeps its tree.
+    """
+    await websocket.accept()
+    patcher = TreePatcher()
+    session = ValidationSession(_preview_nodes, _typed_sender(websocket, patcher.message))
+    dispatcher = asyncio.create_task(session.run())
+    try:
+        if protocol == 1:
+            await _receive_plain(websocket, session)
+        else:
+            await _receive_delta(websocket, session, patcher.reset)
     except WebSocketDisconnect:
         pass
+    finally:
+        session.close()
+        dispatcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await dispatcher
@@ -0,0 +1,127 @@
+"""Command-line maintenance tasks.
+
+Usage (from ``backend/``)::
+
+    python -m app.cli revalidate [--source conventions --source drafts]
+    python -m app.cli revalidate --resume [RUN_ID]
+    python -m app.cli reindex-search
+    python -m app.cli repair-ratings
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+
+from app.core.database import create_tables
+from app.models.revalidation import RevalidationRun
+from app.services.bbdsl_service import BBDSL_VERSION, pool
+from app.services.rating_service import repair_rating_aggregates
+from app.services.revalidation_service import (
+    SOURCES,
+    RevalidationError,
+    create_run,
+    latest_unfinished_run,
+    rows_per_second,
+    run_revalidation,
+)
+from app.services.search_service import reindex_all
+
+
+def _print_progress(run: RevalidationRun, source: str) -> None:
+    print(
+        f"run {run.id} {source}: up to id {run.cursor.get(source)}, "
+        f"{run.processed} rows, {run.invalid} invalid, "
+        f"{rows_per_second(run):.1f} rows/s",
+        file=sys.stderr,
+    )
+
+
+async def revalidate(args: argparse.Namespace) -> int:
+    await create_tables()
+    try:
+        if args.resume is not None:
+            if args.resume == 0:
+                run = await latest_unfinished_run()
+                if run is None:
+                    print("No unfinished revalidation run to resume.", file=sys.stderr)
+                    return 1
+                run_id = run.id
+            else:
+                run_id = args.resume
+        else:
+            run_id = (await create_run(args.source or ["conventions"])).id
+        print(f"Revalidating with bbdsl {BBDSL_VERSION} (run {run_id})", file=sys.stderr)
+        run = await run_revalidation(run_id, args.batch_size, on_progress=_print_progress)
+    except (LookupError, RevalidationError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        await pool.shutdown()
+    print(
+        f"run {run.id} completed: {run.processed} rows, {run.invalid} invalid, "
+        f"{rows_per_second(run):.1f} rows/s"
+    )
+    return 1 if run.invalid else 0
+
+
+async def reindex_search(args: argparse.Namespace) -> int:
+    await create_tables()
+    indexed = await reindex_all(args.batch_size)
+    print(f"Search index rebuilt: {indexed} conventions")
+    return 0
+
+
+async def repair_ratings(args: argparse.Namespace) -> int:
+    await create_tables()
+    repaired = await repair_rating_aggregates(args.batch_size)
+    print(f"Rating aggregates repaired: {repaired} conventions")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reval = commands.add_parser(
+        "revalidate", help="Revalidate stored YAML against the installed bbdsl"
+    )
+    reval.add_argument(
+        "--source",
+        action="append",
+        choices=sorted(SOURCES),
+        help="Table to revalidate (repeatable; default: conventions)",
+    )
+    reval.add_argument(
+        "--resume",
+        type=int,
+        nargs="?",
+        const=0,
+        metavar="RUN_ID",
+        help="Resume a run (default: the latest unfinished one)",
+    )
+    reval.add_argument("--batch-size", type=int, default=None)
+
+    reindex = commands.add_parser(
+        "reindex-search", help="Rebuild the registry's full-text search index"
+    )
+    reindex.add_argument("--batch-size", type=int, default=200)
+
+    repair = commands.add_parser(
+        "repair-ratings", help="Recompute the conventions' rating aggregates from ratings"
+    )
+    repair.add_argument("--batch-size", type=int, default=500)
+
+    args = parser.parse_args(argv)
+    if args.command == "revalidate":
+        return asyncio.run(revalidate(args))
+    if args.command == "reindex-search":
+        return asyncio.run(reindex_search(args))
+    if args.command == "repair-ratings":
+        return asyncio.run(repair_ratings(args))
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,12 +22,66 @@ class Settings(BaseSettings):
     google_client_id: str = ""
     google_client_secret: str = ""
 
+    # Users allowed to run admin jobs (ids from the users table)
+    admin_user_ids: list[int] = []
+
     # CORS
     cors_origins: list[str] = [
         "http://localhost:5173",
         "http://localhost:3000",
     ]
 
+    # Parsed-document cache (per process)
+    doc_cache_max_entries: int = 256
+    doc_cache_max_bytes: int = 64 * 1024 * 1024  # measured as YAML source size
+
+    # bbdsl worker pool (validate / export / diff run off the event loop)
+    worker_processes: int = 2  # 0 = run in a thread of the API process
+    worker_queue_depth: int = 32
+    worker_task_timeout: float = 30.0  # seconds
+    worker_max_tasks: int = 500  # recycle a worker after this many tasks
+    worker_start_method: str = "spawn"
+
+    # Validation WebSocket
+    ws_validate_max_inflight: int = 1  # validations running at once per connection
+    ws_validate_max_concurrent: int = 4  # ... and across all connections
+
+    # Locales rendered in the background when a convention is stored
+    artifact_locales: list[str] = ["en", "zh-TW"]
+
+    # Compiled auction tries (per process)
+    auction_cache_max_entries: int = 512
+    auction_cache_max_bytes: int = 32 * 1024 * 1024  # measured as serialized size
+
+    # Level-of-detail bidding-tree SVG tiles (per process)
+    tree_tile_cache_max_entries: int = 1024
+    tree_tile_cache_max_bytes: int = 32 * 1024 * 1024
+    tree_tile_max_depth: int = 4
+
+    # Similar-systems search: LSH candidates ranked per query
+    similar_max_candidates: int = 200
+
+    # Batch hand classification
+    classifier_cache_max_entries: int = 128
+    classifier_cache_max_bytes: int = 16 * 1024 * 1024
+    classify_max_hands: int = 1_000_000
+    classify_chunk_hands: int = 10_000  # hands per streamed chunk
+
+    # System diff simulation
+    diff_shard_deals: int = 100  # deals per worker task
+    diff_max_deals: int = 5000
+    diff_cache_max_entries: int = 128
+    diff_cache_max_bytes: int = 32 * 1024 * 1024  # measured as report JSON size
+    diff_http_max_age: int = 300  # seconds shared caches may reuse a version diff
+    diff_simulation_stale_seconds: int = 600  # a running simulation silent this long failed
+
+    # Tag index
+    tags_http_max_age: int = 60  # seconds shared caches may reuse GET /tags
+
+    # Bulk revalidation job
+    revalidation_batch_size: int = 200  # rows read and committed per batch
+    revalidation_stale_seconds: int = 300  # a "running" run silent this long can be taken over
+
     # General
     debug: bool = False
 
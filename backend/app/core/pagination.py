@@ -0,0 +1,135 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A page is fetched with ``WHERE (sort_key, id) > (last_sort_key, last_id)
+ORDER BY sort_key, id LIMIT n`` instead of ``OFFSET``, so a deep page
+costs the same index range scan as the first one.  The position is
+handed to clients as an opaque cursor (URL-safe base64 of the last
+row's key, tagged with the sort it belongs to).
+
+Totals are optional: ``count="auto"`` returns one only when no cursor is
+given (the first page, or legacy ``page=`` paging), estimated from the
+planner on PostgreSQL and counted elsewhere; ``"exact"`` always counts;
+``"none"`` never does.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNT_MODES = ("auto", "exact", "none")
+
+
+class InvalidCursorError(ValueError):
+    """A cursor is malformed or belongs to another sort order."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    payload = json.dumps({"s": sort, "k": [_encode_value(v) for v in key]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> tuple:
+    """Return the key of *cursor*.
+
+    Raises:
+        InvalidCursorError: If it does not decode to a key of *size*
+            values made for *sort*.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        key = tuple(_decode_value(v) for v in payload["k"])
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor") from None
+    if cursor_sort != sort or len(key) != size:
+        raise InvalidCursorError("Cursor belongs to another sort order")
+    return key
+
+
+def keyset_page(
+    stmt: Select,
+    columns: list,
+    *,
+    sort: str,
+    descending: bool,
+    cursor: str | None,
+    limit: int,
+) -> Select:
+    """Order *stmt* by *columns* (ending with a unique one) after *cursor*.
+
+    Fetches one extra row so :func:`next_cursor` can tell whether another
+    page exists.
+
+    Raises:
+        InvalidCursorError: See :func:`decode_cursor`.
+    """
+    if cursor is not None:
+        key = decode_cursor(cursor, sort, len(columns))
+        row_key = tuple_(*columns)
+        stmt = stmt.where(row_key < tuple_(*key) if descending else row_key > tuple_(*key))
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def next_cursor(
+    rows: list, sort: str, key: Callable[[Any], tuple], limit: int
+) -> tuple[list, str | None]:
+    """Trim the look-ahead row of a :func:`keyset_page` result.
+
+    *key* returns the values of the ordering columns of a row.
+
+    Returns:
+        ``(rows, cursor)`` with the cursor of the following page, or
+        None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort, key(rows[-1]))
+
+
+async def _estimate(db: AsyncSession, stmt: Select) -> int:
+    connection = await db.connection()
+    sql = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession, stmt: Select, mode: str, cursor: str | None
+) -> tuple[int | None, bool]:
+    """Total rows of the filtered, unordered *stmt* for a list response.
+
+    Returns:
+        ``(total, estimated)``; *total* is None when not requested.
+    """
+    if mode == "none" or (mode == "auto" and cursor is not None):
+        return None, False
+    if mode == "auto" and db.bind.dialect.name == "postgresql":
+        return await _estimate(db, stmt), True
+    total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar()
+    return total or 0, False
@@ -18,6 +18,8 @@ bearer_scheme = HTTPBearer(auto_error=False)
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
+    if "sub" in to_encode:
+        to_encode["sub"] = str(to_encode["sub"])  # JWT subjects must be strings
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.jwt_expire_minutes)
     )
@@ -40,10 +42,8 @@ async def get_current_user(
             settings.jwt_secret,
             algorithms=[settings.jwt_algorithm],
         )
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            return None
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         return None
 
     result = await db.execute(select(User).where(User.id == user_id))
@@ -60,3 +60,15 @@ async def require_user(
             detail="Authentication required",
         )
     return user
+
+
+async def require_admin(
+    user: User = Depends(require_user),
+) -> User:
+    """Dependency that requires a user listed in ``settings.admin_user_ids``."""
+    if user.id not in settings.admin_user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user
@@ -2,19 +2,40 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from app.api.v1 import auth, community, compare, drafts, export, registry, share, validate
+from app.api.v1 import (
+    admin,
+    auth,
+    classify,
+    community,
+    compare,
+    drafts,
+    export,
+    registry,
+    share,
+    validate,
+)
 from app.core.config import settings
 from app.core.database import create_tables
+from app.services.bbdsl_service import pool
+from app.services.cache import cache_stats
+from app.services.diff_service import purge_stale_diffs
+from app.services.validation_service import purge_stale_reports
+from app.services.worker_pool import PoolSaturatedError, TaskTimeoutError, WorkerPoolError
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan: create tables on startup."""
+    """Application lifespan: create tables and drop stale caches on startup,
+    stop workers on exit."""
     await create_tables()
+    await purge_stale_reports()
+    await purge_stale_diffs()
     yield
+    await pool.shutdown()
 
 
 app = FastAPI(
@@ -33,18 +54,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(WorkerPoolError)
+async def worker_pool_error_handler(request: Request, exc: WorkerPoolError):
+    """Map worker-pool failures to 503 (busy) / 504 (timeout) / 500."""
+    if isinstance(exc, PoolSaturatedError):
+        return JSONResponse(
+            status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+        )
+    if isinstance(exc, TaskTimeoutError):
+        return JSONResponse(status_code=504, content={"detail": str(exc)})
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+
 # Routers
 app.include_router(registry.router, prefix="/api/v1", tags=["registry"])
 app.include_router(validate.router, prefix="/api/v1", tags=["validate"])
 app.include_router(export.router, prefix="/api/v1", tags=["export"])
 app.include_router(compare.router, prefix="/api/v1", tags=["compare"])
+app.include_router(classify.router, prefix="/api/v1", tags=["classify"])
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(drafts.router, prefix="/api/v1", tags=["drafts"])
 app.include_router(share.router, prefix="/api/v1", tags=["share"])
 app.include_router(community.router, prefix="/api/v1", tags=["community"])
+app.include_router(admin.router, prefix="/api/v1", tags=["admin"])
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok", "version": "0.1.0"}
+
+
+@app.get("/health/caches")
+async def cache_health():
+    """Hit/miss/eviction counters for the in-process caches."""
+    return cache_stats()
+
+
+@app.get("/health/workers")
+async def worker_health():
+    """Counters for the bbdsl worker pool."""
+    return pool.stats()
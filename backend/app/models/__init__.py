@@ -1,10 +1,35 @@
 """ORM models — import all models so Alembic and create_tables can discover them."""
 
+from app.models.artifact import ExportArtifact  # noqa: F401
+from app.models.auction import AuctionIndex  # noqa: F401
 from app.models.convention import Convention  # noqa: F401
+from app.models.diff import DiffRecord  # noqa: F401
 from app.models.draft import Draft  # noqa: F401
+from app.models.fingerprint import LshBucket, SystemFingerprint  # noqa: F401
 from app.models.namespace import Namespace  # noqa: F401
 from app.models.rating import Comment, Rating  # noqa: F401
+from app.models.revalidation import RevalidationResult, RevalidationRun  # noqa: F401
 from app.models.share import Share  # noqa: F401
+from app.models.tag import ConventionTag, Tag  # noqa: F401
 from app.models.user import User  # noqa: F401
+from app.models.validation import ValidationRecord  # noqa: F401
 
-__all__ = ["Convention", "Comment", "Draft", "Namespace", "Rating", "Share", "User"]
\ No newline at end of file
+__all__ = [
+    "AuctionIndex",
+    "Convention",
+    "ConventionTag",
+    "Comment",
+    "DiffRecord",
+    "Draft",
+    "ExportArtifact",
+    "LshBucket",
+    "Namespace",
+    "Rating",
+    "RevalidationResult",
+    "RevalidationRun",
+    "Share",
+    "SystemFingerprint",
+    "Tag",
+    "User",
+    "ValidationRecord",
+]
@@ -0,0 +1,42 @@
+"""Export artifact ORM model — precomputed exports of stored YAML."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ExportArtifact(Base):
+    """One exported rendering (BML, SVG, ...) of an exact YAML content.
+
+    Artifacts are content-addressed: the key is the SHA-256 of the YAML
+    plus the format, locale and bbdsl version, so an artifact can never
+    go stale — changed YAML simply addresses a different row.
+    """
+
+    __tablename__ = "export_artifacts"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_sha256",
+            "fmt",
+            "locale",
+            "bbdsl_version",
+            name="uq_export_artifact_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), index=True)
+    fmt: Mapped[str] = mapped_column(String(16))
+    locale: Mapped[str] = mapped_column(String(16), default="en")
+    bbdsl_version: Mapped[str] = mapped_column(String(32))
+    etag: Mapped[str] = mapped_column(String(64))  # sha256 of body
+    media_type: Mapped[str] = mapped_column(String(64))
+    body: Mapped[str] = mapped_column(Text)
+    size: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -0,0 +1,35 @@
+"""Compiled auction index ORM model."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class AuctionIndex(Base):
+    """The compiled auction trie of one exact YAML content.
+
+    Content-addressed like export artifacts: every convention version
+    with the same YAML shares one row.  ``index_version`` changes when
+    the compiled layout does, so old blobs are simply never matched.
+    """
+
+    __tablename__ = "auction_indexes"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_sha256", "index_version", name="uq_auction_index_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), index=True)
+    index_version: Mapped[int] = mapped_column(Integer)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    node_count: Mapped[int] = mapped_column(Integer, default=0)
+    size: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -3,12 +3,16 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    DDL,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +25,11 @@ class Convention(Base):
     __tablename__ = "conventions"
     __table_args__ = (
         UniqueConstraint("namespace", "version", name="uq_namespace_version"),
+        # Keyset pagination: one index per listing sort (scanned either way)
+        Index("ix_conventions_created_at_id", "created_at", "id"),
+        Index("ix_conventions_downloads_id", "downloads", "id"),
+        Index("ix_conventions_name_id", "name", "id"),
+        Index("ix_conventions_rating_avg_id", "rating_avg", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -32,7 +41,20 @@ class Convention(Base):
         String(512), nullable=True
     )  # comma-separated
     yaml_content: Mapped[str] = mapped_column(Text)
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )  # sha256 of yaml_content; addresses cached artifacts
     downloads: Mapped[int] = mapped_column(Integer, default=0)
+    # Rating aggregates, maintained with each rating by
+    # app.services.rating_service (repair: ``python -m app.cli repair-ratings``)
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0)
+    rating_avg: Mapped[float] = mapped_column(Float, default=0.0)  # 0 when unrated
+    rating_1: Mapped[int] = mapped_column(Integer, default=0)  # histogram: ratings of 1 star…
+    rating_2: Mapped[int] = mapped_column(Integer, default=0)
+    rating_3: Mapped[int] = mapped_column(Integer, default=0)
+    rating_4: Mapped[int] = mapped_column(Integer, default=0)
+    rating_5: Mapped[int] = mapped_column(Integer, default=0)  # …of 5 stars
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -44,13 +66,39 @@ class Convention(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
-    # Relationships
+    # Relationships (ratings and comments load only via explicit options)
     author: Mapped["User"] = relationship(  # noqa: F821
         back_populates="conventions", lazy="selectin"
     )
     ratings: Mapped[list["Rating"]] = relationship(  # noqa: F821
-        back_populates="convention", lazy="selectin"
+        back_populates="convention", lazy="raise"
     )
     comments: Mapped[list["Comment"]] = relationship(  # noqa: F821
-        back_populates="convention", lazy="selectin"
+        back_populates="convention", lazy="raise"
     )
+
+
+# Full-text search structures the ORM does not map; maintained by
+# app.services.search_service (and created by migration 0010).
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS conventions_fts USING fts5("
+        "title, summary, body, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+    "postgresql": [
+        "ALTER TABLE conventions ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        "CREATE INDEX IF NOT EXISTS ix_conventions_search_vector "
+        "ON conventions USING gin (search_vector)",
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Convention.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect)
+        )
+event.listen(
+    Convention.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS conventions_fts").execute_if(dialect="sqlite"),
+)
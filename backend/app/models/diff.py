@@ -0,0 +1,51 @@
+"""System diff report cache ORM model."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class DiffRecord(Base):
+    """A stored comparison report for one pair of exact YAML contents.
+
+    The pair is stored in the order it was compared; B vs A is a
+    separate row, since the comparator need not be symmetric.  The
+    simulation parameters and bbdsl version are part of the key because
+    each of them changes the simulated deals.
+
+    The row is written when a simulation starts, so every process sees
+    its phase: ``running`` (``updated_at`` is the runner's heartbeat),
+    ``ready`` with the report, or ``failed`` with the error.
+    """
+
+    __tablename__ = "diff_reports"
+    __table_args__ = (
+        UniqueConstraint(
+            "sha_a",
+            "sha_b",
+            "n_deals",
+            "seed",
+            "shard_deals",
+            "bbdsl_version",
+            name="uq_diff_report_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    sha_a: Mapped[str] = mapped_column(String(64), index=True)
+    sha_b: Mapped[str] = mapped_column(String(64), index=True)
+    n_deals: Mapped[int] = mapped_column(Integer)
+    seed: Mapped[int] = mapped_column(BigInteger)
+    shard_deals: Mapped[int] = mapped_column(Integer)
+    bbdsl_version: Mapped[str] = mapped_column(String(32))
+    status: Mapped[str] = mapped_column(String(16), default="ready", server_default="ready")
+    report: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -12,6 +12,10 @@ class Draft(Base):
     """An unsaved BBDSL YAML draft associated with a user."""
 
     __tablename__ = "drafts"
+    __table_args__ = (
+        # Keyset pagination of a user's drafts, most recently updated first
+        Index("ix_drafts_user_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(256), default="Untitled")
@@ -0,0 +1,60 @@
+"""Structural fingerprint and LSH bucket ORM models."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class SystemFingerprint(Base):
+    """MinHash signature of one exact YAML content.
+
+    Keyed by content SHA-256 like the other derived tables, so identical
+    versions share a fingerprint and deleting a convention needs no cleanup.
+    """
+
+    __tablename__ = "system_fingerprints"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_sha256", "fingerprint_version", name="uq_system_fingerprint_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), index=True)
+    fingerprint_version: Mapped[int] = mapped_column(Integer)
+    signature: Mapped[bytes] = mapped_column(LargeBinary)  # little-endian uint32s
+    shingle_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class LshBucket(Base):
+    """One LSH band key of a fingerprint; systems sharing a key are candidates."""
+
+    __tablename__ = "lsh_buckets"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_sha256", "fingerprint_version", "band", name="uq_lsh_bucket_band"
+        ),
+        Index("ix_lsh_buckets_lookup", "fingerprint_version", "band", "bucket"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_sha256: Mapped[str] = mapped_column(String(64))
+    fingerprint_version: Mapped[int] = mapped_column(Integer)
+    band: Mapped[int] = mapped_column(SmallInteger)
+    bucket: Mapped[int] = mapped_column(BigInteger)
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -43,6 +44,10 @@ class Comment(Base):
     """User comment on a convention."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Keyset pagination of a convention's comments, newest first
+        Index("ix_comments_convention_created_at_id", "convention_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     convention_id: Mapped[int] = mapped_column(ForeignKey("conventions.id"))
@@ -0,0 +1,69 @@
+"""Bulk revalidation job ORM models."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RevalidationRun(Base):
+    """One pass revalidating stored YAML against the installed bbdsl.
+
+    ``cursor`` maps each source table to the last row id whose result is
+    committed, so an interrupted run resumes where it stopped.
+    ``heartbeat_at`` is the lease of the process executing a "running"
+    run: set when it claims the run and on every committed batch.
+    """
+
+    __tablename__ = "revalidation_runs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    bbdsl_version: Mapped[str] = mapped_column(String(32))
+    sources: Mapped[list] = mapped_column(JSON)  # table names, in processing order
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    cursor: Mapped[dict] = mapped_column(JSON, default=dict)
+    processed: Mapped[int] = mapped_column(Integer, default=0)
+    invalid: Mapped[int] = mapped_column(Integer, default=0)
+    elapsed_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class RevalidationResult(Base):
+    """Outcome of revalidating one stored row in a run."""
+
+    __tablename__ = "revalidation_results"
+    __table_args__ = (
+        UniqueConstraint("run_id", "source", "row_id", name="uq_revalidation_result_row"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("revalidation_runs.id"), index=True)
+    source: Mapped[str] = mapped_column(String(32))
+    row_id: Mapped[int] = mapped_column(Integer)
+    content_sha256: Mapped[str] = mapped_column(String(64))
+    valid: Mapped[bool] = mapped_column(Boolean)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    warning_count: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)  # validator crash
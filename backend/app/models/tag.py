@@ -0,0 +1,35 @@
+"""Normalized convention tag ORM models."""
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class Tag(Base):
+    """A distinct (normalized) tag with its cached convention count.
+
+    ``convention_count`` is adjusted in the same transaction as the
+    ``convention_tags`` rows, so ``GET /tags`` never has to aggregate.
+    """
+
+    __tablename__ = "tags"
+    __table_args__ = (Index("ix_tags_convention_count", "convention_count"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(64), unique=True)
+    convention_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ConventionTag(Base):
+    """Join row: *convention_id* is tagged *tag_id*.
+
+    The primary key serves lookups by tag; the second index the
+    per-convention reads and deletes.
+    """
+
+    __tablename__ = "convention_tags"
+    __table_args__ = (Index("ix_convention_tags_convention_id", "convention_id"),)
+
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), primary_key=True)
+    convention_id: Mapped[int] = mapped_column(ForeignKey("conventions.id"), primary_key=True)
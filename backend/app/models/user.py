@@ -28,16 +28,17 @@ class User(Base):
         default=lambda: datetime.now(timezone.utc),
     )
 
-    # Relationships
+    # Collections are never loaded implicitly: a user is fetched on every
+    # authenticated request.  Use selectinload() where one is needed.
     conventions: Mapped[list["Convention"]] = relationship(  # noqa: F821
-        back_populates="author", lazy="selectin"
+        back_populates="author", lazy="raise"
     )
     namespaces: Mapped[list["Namespace"]] = relationship(  # noqa: F821
-        back_populates="owner", lazy="selectin"
+        back_populates="owner", lazy="raise"
     )
     drafts: Mapped[list["Draft"]] = relationship(  # noqa: F821
-        back_populates="user", lazy="selectin"
+        back_populates="user", lazy="raise"
     )
     shares: Mapped[list["Share"]] = relationship(  # noqa: F821
-        back_populates="user", lazy="selectin"
+        back_populates="user", lazy="raise"
     )
@@ -0,0 +1,39 @@
+"""Validation report cache ORM model."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ValidationRecord(Base):
+    """A stored bbdsl validation report for one exact YAML content.
+
+    Rows are keyed by the content SHA-256 together with the bbdsl and
+    schema versions that produced the report, so upgrading bbdsl never
+    serves a report computed by an older validator.
+    """
+
+    __tablename__ = "validation_reports"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_sha256",
+            "bbdsl_version",
+            "schema_version",
+            name="uq_validation_report_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), index=True)
+    bbdsl_version: Mapped[str] = mapped_column(String(32))
+    schema_version: Mapped[str] = mapped_column(String(16))
+    report: Mapped[dict] = mapped_column(JSON)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    warning_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
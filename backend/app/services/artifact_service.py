@@ -0,0 +1,101 @@
+"""Precomputed, content-addressed export artifacts.
+
+When a convention version is stored, every export format is rendered in
+the background and saved in ``export_artifacts`` under the YAML's
+SHA-256.  Registry previews and downloads then serve the stored body
+with a strong ETag instead of re-parsing and re-exporting.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.artifact import ExportArtifact
+from app.services.bbdsl_service import BBDSL_VERSION, content_hash, export, run_in_pool
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES: dict[str, str] = {
+    "bml": "text/plain; charset=utf-8",
+    "bboalert": "text/plain; charset=utf-8",
+    "svg": "image/svg+xml",
+    "html": "text/html; charset=utf-8",
+    "pbn": "text/plain; charset=utf-8",
+    "lin": "text/plain; charset=utf-8",
+}
+
+ARTIFACT_FORMATS: tuple[str, ...] = tuple(MEDIA_TYPES)
+
+
+async def get_artifact(sha256: str, fmt: str, locale: str = "en") -> ExportArtifact | None:
+    """Return the stored artifact for a content hash, format and locale."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(ExportArtifact).where(
+                ExportArtifact.content_sha256 == sha256,
+                ExportArtifact.fmt == fmt,
+                ExportArtifact.locale == locale,
+                ExportArtifact.bbdsl_version == BBDSL_VERSION,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def build_artifact(content: str, fmt: str, locale: str = "en") -> ExportArtifact:
+    """Render *content* to *fmt* in the worker pool and store the result."""
+    body = await run_in_pool(export, content, fmt, locale=locale)
+    artifact = ExportArtifact(
+        content_sha256=content_hash(content),
+        fmt=fmt,
+        locale=locale,
+        bbdsl_version=BBDSL_VERSION,
+        etag=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        media_type=MEDIA_TYPES.get(fmt, "text/plain; charset=utf-8"),
+        body=body,
+        size=len(body.encode("utf-8")),
+    )
+    async with async_session() as db:
+        db.add(artifact)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Built concurrently by another request; serve the stored row.
+            await db.rollback()
+            existing = await get_artifact(artifact.content_sha256, fmt, locale)
+            if existing is not None:
+                return existing
+    return artifact
+
+
+async def get_or_build_artifact(content: str, fmt: str, locale: str = "en") -> ExportArtifact:
+    """Return the stored artifact, rendering it first if it is missing."""
+    artifact = await get_artifact(content_hash(content), fmt, locale)
+    if artifact is None:
+        artifact = await build_artifact(content, fmt, locale)
+    return artifact
+
+
+async def build_all_artifacts(content: str, locales: list[str] | None = None) -> None:
+    """Render every export format of *content* (background task on publish).
+
+    Formats are rendered one at a time, so a publish takes at most one
+    pool slot and never crowds out interactive requests or fills the
+    pool's queue.  Formats that already exist are skipped; a failing
+    exporter is logged and does not prevent the other formats from being
+    stored.
+    """
+    sha256 = content_hash(content)
+    for locale in locales or settings.artifact_locales:
+        for fmt in ARTIFACT_FORMATS:
+            if await get_artifact(sha256, fmt, locale) is not None:
+                continue
+            try:
+                await build_artifact(content, fmt, locale)
+            except Exception:
+                logger.exception("Export artifact %s/%s failed for %s", fmt, locale, sha256)
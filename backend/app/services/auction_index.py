@@ -0,0 +1,273 @@
+"""Compiled auction trie of a bidding system.
+
+Every auction a system defines (openings, their responses, and the
+auctions convention triggers apply to) is compiled into a trie.  The
+trie is stored as flat arrays in CSR layout: the children of node *i*
+are edges ``child_start[i]:child_start[i + 1]``, sorted by bid code, so
+looking up a sequence costs one binary search over at most 38 bids per
+level.  Node payloads (meaning, id, convention refs…) are kept in a
+parallel list.
+
+This module reads the YAML directly and does not depend on bbdsl.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import re
+import struct
+import sys
+from array import array
+from typing import Any
+
+import yaml
+
+# Bump when the compiled layout or the payload rules change.
+INDEX_VERSION = 1
+
+STRAINS = ("C", "D", "H", "S", "NT")
+PASS, DOUBLE, REDOUBLE = 35, 36, 37
+
+_SUIT_SYMBOLS = {"♣": "C", "♦": "D", "♥": "H", "♠": "S"}
+_CALLS = {"P": PASS, "PASS": PASS, "X": DOUBLE, "DBL": DOUBLE, "XX": REDOUBLE, "RDBL": REDOUBLE}
+_BID_RE = re.compile(r"^([1-7])(C|D|H|S|NT|N)$")
+_SEPARATORS = re.compile(r"[\s,\-–]+")
+_HEADER = struct.Struct("<4sIII")
+_MAGIC = b"BBAT"
+# libyaml's loader parses about ten times faster when it is available.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Entry keys describing the auction structure rather than the bid itself.
+_STRUCTURE_KEYS = frozenset({"bid", "responses", "bids"})
+
+
+def encode_bid(token: str) -> int:
+    """Return the code of one call (``"1NT"``, ``"2♣"``, ``"P"``, ``"X"`` …).
+
+    Raises:
+        ValueError: If *token* is not a call.
+    """
+    text = token.strip().upper()
+    for symbol, letter in _SUIT_SYMBOLS.items():
+        text = text.replace(symbol, letter)
+    if text in _CALLS:
+        return _CALLS[text]
+    match = _BID_RE.match(text)
+    if match is None:
+        raise ValueError(f"Not a bid: {token!r}")
+    strain = "NT" if match.group(2) in ("N", "NT") else match.group(2)
+    return (int(match.group(1)) - 1) * 5 + STRAINS.index(strain)
+
+
+def decode_bid(code: int) -> str:
+    """Canonical text of a call code (``"1NT"``, ``"P"``, ``"X"``, ``"XX"``)."""
+    if code == PASS:
+        return "P"
+    if code == DOUBLE:
+        return "X"
+    if code == REDOUBLE:
+        return "XX"
+    return f"{code // 5 + 1}{STRAINS[code % 5]}"
+
+
+def parse_sequence(sequence: str | list[str]) -> list[int]:
+    """Parse ``"1NT-2C"`` (or ``"1NT 2C"``, or a list of calls) into codes."""
+    tokens = sequence if isinstance(sequence, list) else _SEPARATORS.split(sequence.strip())
+    return [encode_bid(token) for token in tokens if token]
+
+
+class AuctionTrie:
+    """Immutable auction trie; build with :func:`compile_trie`."""
+
+    __slots__ = ("child_start", "child_bid", "child_node", "payloads")
+
+    def __init__(
+        self,
+        child_start: array,
+        child_bid: bytes,
+        child_node: array,
+        payloads: list[dict | None],
+    ) -> None:
+        self.child_start = child_start
+        self.child_bid = child_bid
+        self.child_node = child_node
+        self.payloads = payloads
+
+    @property
+    def node_count(self) -> int:
+        return len(self.payloads)
+
+    def find(self, codes: list[int]) -> int | None:
+        """Return the node reached by *codes* from the root, or None."""
+        node = 0
+        for code in codes:
+            lo, hi = self.child_start[node], self.child_start[node + 1]
+            i = bisect.bisect_left(self.child_bid, code, lo, hi)
+            if i == hi or self.child_bid[i] != code:
+                return None
+            node = self.child_node[i]
+        return node
+
+    def children(self, node: int) -> list[tuple[str, int]]:
+        """``(bid, child_node)`` pairs of *node*, in bidding order."""
+        lo, hi = self.child_start[node], self.child_start[node + 1]
+        return [(decode_bid(self.child_bid[i]), self.child_node[i]) for i in range(lo, hi)]
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact little-endian blob."""
+        start, nodes = array("i", self.child_start), array("i", self.child_node)
+        if sys.byteorder != "little":
+            start.byteswap()
+            nodes.byteswap()
+        payloads = json.dumps(self.payloads, ensure_ascii=False, separators=(",", ":"))
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, INDEX_VERSION, self.node_count, len(self.child_bid)),
+                start.tobytes(),
+                self.child_bid,
+                nodes.tobytes(),
+                payloads.encode("utf-8"),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> AuctionTrie:
+        magic, version, n_nodes, n_edges = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != INDEX_VERSION:
+            raise ValueError("Unsupported auction index blob")
+        offset = _HEADER.size
+        start = array("i")
+        start.frombytes(data[offset : offset + 4 * (n_nodes + 1)])
+        offset += 4 * (n_nodes + 1)
+        bids = bytes(data[offset : offset + n_edges])
+        offset += n_edges
+        nodes = array("i")
+        nodes.frombytes(data[offset : offset + 4 * n_edges])
+        offset += 4 * n_edges
+        if sys.byteorder != "little":
+            start.byteswap()
+            nodes.byteswap()
+        return cls(start, bids, nodes, json.loads(data[offset:].decode("utf-8")))
+
+
+class _Builder:
+    """Mutable dict-of-dicts trie used while walking the document."""
+
+    def __init__(self, conventions: dict[str, dict]) -> None:
+        self.children: list[dict[int, int]] = [{}]
+        self.payloads: list[dict | None] = [None]
+        self.conventions = conventions
+
+    def node(self, codes: list[int]) -> int:
+        current = 0
+        for code in codes:
+            nxt = self.children[current].get(code)
+            if nxt is None:
+                nxt = len(self.payloads)
+                self.children[current][code] = nxt
+                self.children.append({})
+                self.payloads.append(None)
+            current = nxt
+        return current
+
+    def annotate(self, node: int, payload: dict) -> None:
+        # Earlier (more specific) definitions win; later ones only fill gaps.
+        if self.payloads[node] is None:
+            self.payloads[node] = dict(payload)
+        else:
+            for key, value in payload.items():
+                self.payloads[node].setdefault(key, value)
+
+    def add_entries(self, prefix: list[int], entries: Any, refs: frozenset[str]) -> None:
+        if not isinstance(entries, list):
+            return
+        for entry in entries:
+            if not isinstance(entry, dict) or "bid" not in entry:
+                continue
+            try:
+                path = prefix + [encode_bid(str(entry["bid"]))]
+            except ValueError:
+                continue  # malformed bids are reported by the validator
+            node = self.node(path)
+            self.annotate(node, {k: v for k, v in entry.items() if k not in _STRUCTURE_KEYS})
+            self.add_entries(path, entry.get("responses"), refs)
+            ref = entry.get("ref")
+            if isinstance(ref, str) and ref in self.conventions and ref not in refs:
+                self.add_convention_continuations(path, ref, refs | {ref})
+
+    def add_convention_continuations(self, path: list[int], ref: str, refs: frozenset[str]) -> None:
+        # A bid referring to an asking convention inherits its responses;
+        # conventions without a trigger bid describe the referring bid itself.
+        spec = self.conventions[ref]
+        if (spec.get("trigger") or {}).get("bid"):
+            self.add_entries(path, spec.get("responses"), refs)
+            self.add_entries(path, spec.get("bids"), refs)
+
+    def add_convention(self, key: str, spec: dict) -> None:
+        trigger = spec.get("trigger") or {}
+        afters = trigger.get("after") or [""]
+        if isinstance(afters, str):
+            afters = [afters]
+        conv_id = str(spec.get("id") or key)
+        for after in afters:
+            try:
+                prefix = parse_sequence(str(after))
+                if trigger.get("bid"):
+                    prefix.append(encode_bid(str(trigger["bid"])))
+            except ValueError:
+                continue
+            if trigger.get("bid"):
+                payload = {"convention": conv_id}
+                if spec.get("description"):
+                    payload["meaning"] = {"description": spec["description"]}
+                self.annotate(self.node(prefix), payload)
+            refs = frozenset({conv_id})
+            self.add_entries(prefix, spec.get("responses"), refs)
+            self.add_entries(prefix, spec.get("bids"), refs)
+
+    def freeze(self) -> AuctionTrie:
+        # Renumber breadth-first so every node's children are contiguous.
+        order = [0]
+        for old in order:
+            order.extend(self.children[old][code] for code in sorted(self.children[old]))
+        new_index = {old: new for new, old in enumerate(order)}
+        child_start = array("i", [0])
+        child_bid = bytearray()
+        child_node = array("i")
+        for old in order:
+            for code in sorted(self.children[old]):
+                child_bid.append(code)
+                child_node.append(new_index[self.children[old][code]])
+            child_start.append(len(child_bid))
+        payloads = [self.payloads[old] for old in order]
+        return AuctionTrie(child_start, bytes(child_bid), child_node, payloads)
+
+
+def compile_trie(content: str) -> AuctionTrie:
+    """Compile the auctions defined by a BBDSL document.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping.
+    """
+    try:
+        doc = yaml.load(content, Loader=_YAML_LOADER)
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Invalid YAML: {exc}") from exc
+    if not isinstance(doc, dict):
+        raise ValueError("A BBDSL document must be a mapping")
+
+    conventions = doc.get("conventions") or {}
+    if not isinstance(conventions, dict):
+        conventions = {}
+    by_id = {
+        str(spec.get("id") or key): spec
+        for key, spec in conventions.items()
+        if isinstance(spec, dict)
+    }
+    builder = _Builder(by_id)
+    builder.add_entries([], doc.get("openings"), frozenset())
+    for key, spec in conventions.items():
+        if isinstance(spec, dict):
+            builder.add_convention(str(key), spec)
+    return builder.freeze()
@@ -0,0 +1,142 @@
+"""Stored and cached auction tries of registry conventions.
+
+Tries are compiled when a convention version is stored (background
+task) or on first lookup, persisted in ``auction_indexes`` under the
+YAML's SHA-256, and loaded lazily into a bounded per-process LRU.
+Rendered SVG tiles of the bidding tree are cached the same way, per
+(content hash, prefix, depth, locale).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.auction import AuctionIndex
+from app.services.auction_index import INDEX_VERSION, AuctionTrie, compile_trie
+from app.services.bbdsl_service import content_hash
+from app.services.cache import LRUCache
+from app.services.tree_tiles import render_tile
+
+logger = logging.getLogger(__name__)
+
+_tries: LRUCache[str, AuctionTrie] = LRUCache(
+    "auction_tries",
+    max_entries=settings.auction_cache_max_entries,
+    max_bytes=settings.auction_cache_max_bytes,
+)
+_tiles: LRUCache[tuple[str, int, tuple[int, ...], int, str], str] = LRUCache(
+    "tree_tiles",
+    max_entries=settings.tree_tile_cache_max_entries,
+    max_bytes=settings.tree_tile_cache_max_bytes,
+)
+
+
+async def _load_stored(sha256: str) -> bytes | None:
+    async with async_session() as db:
+        result = await db.execute(
+            select(AuctionIndex.data).where(
+                AuctionIndex.content_sha256 == sha256,
+                AuctionIndex.index_version == INDEX_VERSION,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def build_auction_index(content: str) -> tuple[AuctionTrie, int]:
+    """Compile *content* off the event loop and store the blob.
+
+    Returns:
+        ``(trie, size)`` where *size* is the serialized size in bytes.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping.
+    """
+    trie = await asyncio.to_thread(compile_trie, content)
+    data = trie.to_bytes()
+    async with async_session() as db:
+        db.add(
+            AuctionIndex(
+                content_sha256=content_hash(content),
+                index_version=INDEX_VERSION,
+                data=data,
+                node_count=trie.node_count,
+                size=len(data),
+            )
+        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()  # stored concurrently
+    return trie, len(data)
+
+
+async def ensure_auction_index(content: str) -> None:
+    """Compile and store the index of *content* unless it exists (publish task)."""
+    if await _load_stored(content_hash(content)) is not None:
+        return
+    try:
+        await build_auction_index(content)
+    except Exception:
+        logger.exception("Auction index build failed for %s", content_hash(content))
+
+
+async def get_trie(sha256: str, load_content: Callable[[], Awaitable[str]]) -> AuctionTrie:
+    """Return the trie for a content hash: LRU, then table, then compile.
+
+    Args:
+        sha256: SHA-256 of the convention's YAML.
+        load_content: Returns the YAML; only awaited if no index is stored.
+    """
+    trie = _tries.get(sha256)
+    if trie is not None:
+        return trie
+    data = await _load_stored(sha256)
+    if data is not None:
+        trie, size = AuctionTrie.from_bytes(data), len(data)
+    else:
+        trie, size = await build_auction_index(await load_content())
+    _tries.put(sha256, trie, size=size)
+    return trie
+
+
+async def get_tree_tile(
+    sha256: str,
+    load_content: Callable[[], Awaitable[str]],
+    prefix: list[int],
+    depth: int,
+    locale: str = "en",
+) -> str:
+    """Return the SVG tile of the subtree below *prefix*, *depth* calls deep.
+
+    Raises:
+        KeyError: If *prefix* is not an auction of the convention.
+        ValueError: If the convention's auctions cannot be compiled.
+    """
+    key = (sha256, INDEX_VERSION, tuple(prefix), depth, locale)
+    svg = _tiles.get(key)
+    if svg is None:
+        trie = await get_trie(sha256, load_content)
+        svg = await asyncio.to_thread(render_tile, trie, prefix, depth, locale)
+        _tiles.put(key, svg, size=len(svg))
+    return svg
+
+
+async def trie_for_content(content: str) -> AuctionTrie:
+    """Return the trie of arbitrary YAML (editor, diff), cached in the LRU only.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping.
+    """
+    sha256 = content_hash(content)
+    trie = _tries.get(sha256)
+    if trie is None:
+        trie = await asyncio.to_thread(compile_trie, content)
+        _tries.put(sha256, trie, size=len(trie.to_bytes()))
+    return trie
@@ -6,6 +6,10 @@ does not import bbdsl directly.
 
 from __future__ import annotations
 
+import hashlib
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as _package_version
+
 from bbdsl.core.loader import load_document_from_string
 from bbdsl.core.validator import Validator
 from bbdsl.core.comparator import compare_systems as _compare_systems
@@ -20,6 +24,88 @@ try:
 except ImportError:
     export_lin = None  # LIN exporter may not be available in older bbdsl versions
 
+from app.core.config import settings
+from app.services.cache import LRUCache
+from app.services.deal_engine import pbn_boards
+from app.services.pbn import (
+    PBN_HEADER,
+    pbn_board_to_lin,
+    pbn_to_lin,
+    renumber_board,
+    renumber_lin_board,
+    split_pbn,
+)
+from app.services.worker_pool import WorkerPool, WorkerPoolError  # noqa: F401
+
+try:
+    BBDSL_VERSION = _package_version("bbdsl")
+except PackageNotFoundError:  # running from a source checkout
+    BBDSL_VERSION = "unknown"
+
+# Loaded documents keyed by (content sha256, bbdsl version).  Documents
+# are treated as read-only by the validator, exporters and comparator,
+# so one instance can safely be shared between callers.
+_doc_cache: LRUCache[tuple[str, str], object] = LRUCache(
+    "documents",
+    max_entries=settings.doc_cache_max_entries,
+    max_bytes=settings.doc_cache_max_bytes,
+)
+
+
+# CPU-bound calls from async endpoints go through this pool; each worker
+# process keeps its own document cache.
+pool = WorkerPool(
+    processes=settings.worker_processes,
+    max_queue=settings.worker_queue_depth,
+    timeout=settings.worker_task_timeout,
+    max_tasks_per_worker=settings.worker_max_tasks,
+    start_method=settings.worker_start_method,
+)
+
+
+async def run_in_pool(fn, *args, timeout: float | None = None, **kwargs):
+    """Await ``fn(*args, **kwargs)`` executed in the bbdsl worker pool.
+
+    Args:
+        fn: A module-level function of this module (e.g. ``validate_yaml``).
+        timeout: Per-call timeout in seconds; defaults to the pool setting.
+
+    Raises:
+        WorkerPoolError: If the pool is saturated, the call timed out or
+            the worker crashed.  Exceptions raised by *fn* propagate as is.
+    """
+    return await pool.run(fn, *args, timeout=timeout, **kwargs)
+
+
+def content_hash(content: str) -> str:
+    """Return the hex SHA-256 digest of YAML *content*."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def load_document(content: str):
+    """Parse BBDSL YAML, reusing a cached document for identical content.
+
+    Args:
+        content: YAML text of a BBDSL document.
+
+    Returns:
+        The loaded ``BBDSLDocument``.
+    """
+    key = (content_hash(content), BBDSL_VERSION)
+    doc = _doc_cache.get(key)
+    if doc is None:
+        doc = load_document_from_string(content)
+        _doc_cache.put(key, doc, size=len(content.encode("utf-8")))
+    return doc
+
+
+def parse_check(content: str) -> None:
+    """Parse *content* into this process's document cache.
+
+    Raises the loader's exception if the YAML is not a valid document.
+    """
+    load_document(content)
+
 
 def validate_yaml(content: str) -> dict:
     """Parse and validate BBDSL YAML content.
@@ -30,7 +116,7 @@ def validate_yaml(content: str) -> dict:
     Returns:
         JSON-serializable validation report dict.
     """
-    doc = load_document_from_string(content)
+    doc = load_document(content)
     validator = Validator(doc)
     report = validator.validate_all()
     return report.to_dict()
@@ -47,7 +133,7 @@ def export(content: str, fmt: str, **kwargs) -> str:
     Returns:
         Exported content as a string.
     """
-    doc = load_document_from_string(content)
+    doc = load_document(content)
     exporters = {
         "bml": export_bml,
         "bboalert": _export_bboalert_str,
@@ -97,8 +183,8 @@ def diff(
     Returns:
         JSON-serializable comparison report dict.
     """
-    doc_a = load_document_from_string(content_a)
-    doc_b = load_document_from_string(content_b)
+    doc_a = load_document(content_a)
+    doc_b = load_document(content_b)
     report = _compare_systems(doc_a, doc_b, n_deals=n_deals, seed=seed)
     return report.to_dict()
 
@@ -113,78 +199,51 @@ def _export_lin_str(doc, **kwargs) -> str:
     if export_lin is not None:
         return export_lin(doc, **kwargs)
 
-    # Fallback: generate PBN and convert to basic LIN
+    # Fallback: generate PBN and convert to basic LIN, one line per board
     pbn_output = export_pbn(doc, **kwargs)
-    return _pbn_to_lin(pbn_output)
-
-
-def _pbn_to_lin(pbn_text: str) -> str:
-    """Convert PBN text to a basic LIN format.
-
-    This is a simplified conversion for HandViewer embedding.
-    """
-    lines: list[str] = []
-    board_num = ""
-    dealer = ""
-    vul = ""
-    deal = ""
-    event = ""
-
-    for raw_line in pbn_text.split("\n"):
-        line = raw_line.strip()
-        if line.startswith("[Board"):
-            board_num = line.split('"')[1] if '"' in line else ""
-        elif line.startswith("[Dealer"):
-            dealer = line.split('"')[1] if '"' in line else ""
-        elif line.startswith("[Vulnerable") or line.startswith("[Vul"):
-            vul = line.split('"')[1] if '"' in line else ""
-        elif line.startswith("[Deal"):
-            deal = line.split('"')[1] if '"' in line else ""
-        elif line.startswith("[Event"):
-            event = line.split('"')[1] if '"' in line else ""
-
-    # Map PBN vulnerability to LIN format
-    vul_map = {
-        "None": "o", "NS": "n", "EW": "e", "All": "b",
-        "Love": "o", "Both": "b",
-    }
-    lin_vul = vul_map.get(vul, "o")
+    return pbn_to_lin(pbn_output)
 
-    # Build LIN line
-    lin_parts = [
-        f"pn|{event or 'N,E,S,W'}",
-        f"st||",
-        f"md|{_pbn_deal_to_lin_md(deal, dealer)}",
-        f"sv|{lin_vul}",
-        f"mb|",  # no bidding sequence in static export
-    ]
-    lines.append("|".join(lin_parts) + "|")
 
-    return "\n".join(lines)
+def export_board_chunk(
+    content: str,
+    fmt: str,
+    n_deals: int,
+    seed: int,
+    first_board: int = 1,
+    locale: str = "en",
+    deals_only: bool = False,
+) -> tuple[str, list[str]]:
+    """Export one chunk of PBN or LIN boards (a unit of streaming export).
 
+    Args:
+        content: YAML text.
+        fmt: 'pbn' or 'lin'.
+        n_deals: Number of boards in this chunk.
+        seed: Random seed of this chunk.
+        first_board: Board number assigned to the first board.
+        locale: Locale forwarded to the exporter.
+        deals_only: Emit plain random deals from the vectorized deal
+            engine instead of the bbdsl exporter (no document needed).
 
-def _pbn_deal_to_lin_md(deal_str: str, dealer: str = "N") -> str:
-    """Convert PBN deal string to LIN md (make deal) format.
-
-    PBN deal: 'N:AK.QJ.T98.7654 ...'
-    LIN md: dealer_num + hands
+    Returns:
+        ``(header, records)``: the PBN ``%`` header ('' for LIN) and one
+        string per board, numbered from *first_board* with the dealer and
+        vulnerability of its number.
     """
-    dealer_map = {"N": "1", "E": "2", "S": "3", "W": "4"}
-    dealer_num = dealer_map.get(dealer, "1")
-
-    if not deal_str:
-        return dealer_num
-
-    # Remove initial dealer indicator if present
-    if ":" in deal_str:
-        deal_str = deal_str.split(":", 1)[1]
-
-    hands = deal_str.strip().split()
-    # Convert PBN hand format (S.H.D.C with dots) to LIN (SHDC no separator)
-    lin_hands = []
-    for hand in hands:
-        suits = hand.split(".")
-        # LIN uses SHDC order, PBN already uses SHDC order
-        lin_hands.append("".join(suits))
-
-    return dealer_num + ",".join(lin_hands)
+    if deals_only:
+        boards = pbn_boards(n_deals, seed, first_board)
+        if fmt == "lin":
+            return "", [pbn_board_to_lin(b) for b in boards]
+        return PBN_HEADER, boards
+
+    doc = load_document(content)
+    if fmt == "lin" and export_lin is not None:
+        text = export_lin(doc, n_deals=n_deals, seed=seed, locale=locale)
+        lines = [line for line in text.splitlines() if line.strip()]
+        return "", [renumber_lin_board(line, first_board + i) for i, line in enumerate(lines)]
+
+    header, boards = split_pbn(export_pbn(doc, n_deals=n_deals, seed=seed, locale=locale))
+    boards = [renumber_board(b, first_board + i) for i, b in enumerate(boards)]
+    if fmt == "lin":
+        return "", [pbn_board_to_lin(b) for b in boards]
+    return header, boards
@@ -0,0 +1,97 @@
+"""Bounded in-process caches shared by the service layer.
+
+Every cache registers itself under a name so the counters can be
+inspected from ``GET /health/caches`` when sizing deployments.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_registry: dict[str, "LRUCache[Any, Any]"] = {}
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe LRU cache bounded by entry count and total size.
+
+    Entries are evicted least-recently-used first whenever either
+    ``max_entries`` or ``max_bytes`` would be exceeded.  The size of an
+    entry is supplied by the caller on :meth:`put`; an entry larger
+    than ``max_bytes`` on its own is not cached at all.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for *key*, or None on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V, size: int = 1) -> None:
+        """Insert *value* under *key*, evicting old entries as needed."""
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict:
+        """Return a JSON-serializable snapshot of the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def cache_stats() -> dict[str, dict]:
+    """Return counters for every registered cache, keyed by name."""
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
@@ -0,0 +1,54 @@
+"""Batch opening classification for registry conventions.
+
+Compiled classifiers are cached per content hash in a bounded LRU, so
+repeated batches against the same system skip YAML parsing.  Results
+are streamed as NDJSON, one chunk of hands classified (off the event
+loop) at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.cache import LRUCache
+from app.services.hand_classifier import HandClassifier, compile_classifier
+
+_classifiers: LRUCache[str, HandClassifier] = LRUCache(
+    "classifiers",
+    max_entries=settings.classifier_cache_max_entries,
+    max_bytes=settings.classifier_cache_max_bytes,
+)
+
+
+async def get_classifier(
+    sha256: str, load_content: Callable[[], Awaitable[str]]
+) -> HandClassifier:
+    """Return the cached classifier for a content hash, compiling it if needed.
+
+    Raises:
+        ValueError: If the document's openings cannot be compiled.
+    """
+    classifier = _classifiers.get(sha256)
+    if classifier is None:
+        classifier = await asyncio.to_thread(compile_classifier, await load_content())
+        _classifiers.put(sha256, classifier, size=classifier.nbytes)
+    return classifier
+
+
+async def classify_stream(
+    classifier: HandClassifier,
+    hands: np.ndarray,
+    chunk_size: int | None = None,
+) -> AsyncIterator[str]:
+    """Yield NDJSON lines ``{"hand": i, "bid": "1NT"}``, one chunk at a time."""
+    chunk_size = chunk_size or settings.classify_chunk_hands
+    for start in range(0, len(hands), chunk_size):
+        bids = await asyncio.to_thread(classifier.classify, hands[start : start + chunk_size])
+        yield "".join(
+            f'{{"hand":{start + i},"bid":{json.dumps(bid)}}}\n' for i, bid in enumerate(bids)
+        )
@@ -0,0 +1,236 @@
+"""Vectorized deal generator and hand evaluator.
+
+Deals are held as NumPy arrays of shape ``(n, 4, 13)``: hands in seat
+order N, E, S, W, each a row of card codes.  A card code is
+``suit * 13 + rank`` with suits ordered S, H, D, C and ranks A..2, so a
+sorted hand is in PBN display order and honour points can be looked up
+by code.  Hands are left unsorted; evaluation does not need the order
+and :func:`pbn_deals` sorts what it formats.
+
+Everything here works on whole batches: one call shuffles, evaluates or
+formats millions of deals without a per-hand Python loop.
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+import sys
+from collections.abc import Iterator, Mapping
+from typing import NamedTuple
+
+import numpy as np
+
+from app.services.pbn import format_board
+
+SEATS = "NESW"
+SUITS = "SHDC"
+RANKS = "AKQJT98765432"
+
+_NO_CARD = 52  # pads hands to an even length for pairwise lookups
+_RANK_CHARS = np.frombuffer(RANKS.encode("ascii") * 4, dtype="S1")
+_LABELS = np.arange(52, dtype=np.uint32)
+_LABEL_MASK = np.uint32(0xFF)
+_LOW_BYTE = 0 if sys.byteorder == "little" else 3
+
+
+def _card_values() -> np.ndarray:
+    # One count in the card's suit nibble (S in bits 12-15 ... C in bits
+    # 0-3) plus its honour points (A=4, K=3, Q=2, J=1) from bit 16.
+    cards = np.arange(52)
+    suit, rank = divmod(cards, 13)
+    values = np.zeros(_NO_CARD + 1, dtype=np.uint32)
+    values[:52] = (1 << (4 * (3 - suit))) | (np.maximum(4 - rank, 0) << 16)
+    return values
+
+
+_CARD_VALUES = _card_values()
+
+
+def _pair_values() -> np.ndarray:
+    # Summed values of two adjacent cards, indexed by the pair read as one
+    # little-endian uint16.  Only indexes below 256 * 53 can occur, which
+    # keeps the table cache-resident.  Sums stay below 2**24, so float32
+    # (for a BLAS reduction) is exact.
+    index = np.arange(256 * (_NO_CARD + 1))
+    first, second = index & 0xFF, index >> 8
+    valid = first <= _NO_CARD
+    values = np.zeros(len(index), dtype=np.float32)
+    values[valid] = _CARD_VALUES[first[valid]] + _CARD_VALUES[second[valid]]
+    return values
+
+
+_PAIR_VALUES = _pair_values()
+_PAIR_ONES = np.ones(7, dtype=np.float32)
+
+# PBN deal string: 13 cards + 3 suit separators per hand, hands separated
+# by spaces.
+_HAND_WIDTH = 17
+_DEAL_WIDTH = 4 * _HAND_WIDTH - 1
+
+DEFAULT_BATCH = 50_000
+
+_MASK_TYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+class HandPatterns(NamedTuple):
+    """Hand patterns compiled to a lookup table by :func:`compile_patterns`."""
+
+    names: tuple[str, ...]
+    masks: np.ndarray  # bit i set for shape codes matching names[i]
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.Generator(np.random.SFC64(seed & 0xFFFFFFFFFFFFFFFF))
+
+
+def deal(n: int, seed: int) -> np.ndarray:
+    """Deal *n* random boards reproducibly from *seed*.
+
+    Returns:
+        ``uint8`` array of shape ``(n, 4, 13)``.
+    """
+    return _deal_padded(n, seed)[..., :13]
+
+
+def _deal_padded(n: int, seed: int) -> np.ndarray:
+    # Sorting random 32-bit keys whose low byte is replaced by the card
+    # code shuffles every row at once.  Equal keys (about one deal in
+    # 12,000) are ordered by card code, which does not measurably bias
+    # a deal.
+    keys = _rng(seed).bit_generator.random_raw(n * 26).view(np.uint32).reshape(n, 52)
+    np.bitwise_and(keys, ~_LABEL_MASK, out=keys)
+    keys |= _LABELS
+    keys.sort(axis=1)
+    hands = np.full((n, 4, 14), _NO_CARD, dtype=np.uint8)
+    # The label is the least significant byte of each key.
+    hands[..., :13] = keys.view(np.uint8).reshape(n, 4, 13, 4)[..., _LOW_BYTE]
+    return hands
+
+
+def iter_deals(n: int, seed: int, batch: int = DEFAULT_BATCH) -> Iterator[np.ndarray]:
+    """Yield *n* deals in batches of at most *batch*, for bounded memory.
+
+    Batch *i* uses its own seed, so the sequence depends on *batch*.
+    """
+    rng = _rng(seed)
+    for start in range(0, n, batch):
+        yield deal(min(batch, n - start), int(rng.integers(2**63)))
+
+
+def summarize(deals: np.ndarray) -> np.ndarray:
+    """Evaluate every hand in one pass.
+
+    Returns:
+        ``uint32`` array of shape ``(n, 4)``: suit lengths as hex digits
+        S, H, D, C in bits 0-15 (a 4-4-1-4 hand is ``0x4414``) and HCP
+        from bit 16.  See :func:`hcp`, :func:`suit_lengths` and
+        :func:`shape_classes`.
+    """
+    padded = _padded(deals)
+    pairs = np.take(_PAIR_VALUES, padded.view("<u2"))
+    return (pairs.reshape(-1, 7) @ _PAIR_ONES).astype(np.uint32).reshape(deals.shape[:-1])
+
+
+def _padded(deals: np.ndarray) -> np.ndarray:
+    # Deals from deal() are views of a padded buffer; reuse it if intact.
+    base = deals.base
+    if (
+        isinstance(base, np.ndarray)
+        and base.dtype == np.uint8
+        and base.shape == deals.shape[:-1] + (14,)
+        and base.strides == deals.strides
+        and base.ctypes.data == deals.ctypes.data
+    ):
+        return base
+    padded = np.full(deals.shape[:-1] + (14,), _NO_CARD, dtype=np.uint8)
+    padded[..., :13] = deals
+    return padded
+
+
+def hcp(summary: np.ndarray) -> np.ndarray:
+    """High card points per hand from :func:`summarize` output."""
+    return (summary >> 16).astype(np.int8)
+
+
+def suit_lengths(summary: np.ndarray) -> np.ndarray:
+    """Suit lengths in S, H, D, C order, shape ``(n, 4, 4)``."""
+    shifts = np.array([12, 8, 4, 0], dtype=np.uint32)
+    return ((summary[..., None] >> shifts) & 0xF).astype(np.int8)
+
+
+def _parse_shape(shape: str) -> tuple[tuple[int, ...], bool]:
+    exact = "=" in shape
+    parts = tuple(int(p) for p in re.split(r"[-=]", shape.strip()))
+    if len(parts) != 4 or sum(parts) != 13:
+        raise ValueError(f"Invalid hand pattern: {shape!r}")
+    return (parts if exact else tuple(sorted(parts, reverse=True))), exact
+
+
+def compile_patterns(patterns: Mapping[str, Mapping]) -> HandPatterns:
+    """Compile ``definitions.patterns`` into a shape lookup table.
+
+    Each pattern may list ``shapes`` (any suit order, ``"5-3-3-2"``)
+    and/or ``shapes_exact`` (S=H=D=C, ``"4=4=1=4"``).
+
+    Raises:
+        ValueError: On a malformed shape or more than 64 patterns.
+    """
+    if len(patterns) > 64:
+        raise ValueError("At most 64 hand patterns can be classified at once")
+    loose: list[set[tuple[int, ...]]] = []
+    exact: list[set[tuple[int, ...]]] = []
+    for spec in patterns.values():
+        loose.append(set())
+        exact.append(set())
+        for shape in list(spec.get("shapes") or []) + list(spec.get("shapes_exact") or []):
+            parts, is_exact = _parse_shape(str(shape))
+            (exact[-1] if is_exact else loose[-1]).add(parts)
+
+    # The narrowest mask type keeps the 64K-entry table cache-friendly.
+    dtype = next(t for t in _MASK_TYPES if len(loose) <= 8 * np.dtype(t).itemsize)
+    masks = np.zeros(1 << 16, dtype=dtype)
+    for lengths in itertools.product(range(14), repeat=3):
+        clubs = 13 - sum(lengths)
+        if clubs < 0:
+            continue
+        shape = (*lengths, clubs)
+        ordered = tuple(sorted(shape, reverse=True))
+        code = (shape[0] << 12) | (shape[1] << 8) | (shape[2] << 4) | clubs
+        for bit, (any_order, exact_only) in enumerate(zip(loose, exact)):
+            if ordered in any_order or shape in exact_only:
+                masks[code] |= dtype(1 << bit)
+    return HandPatterns(tuple(patterns), masks)
+
+
+def shape_classes(summary: np.ndarray, patterns: HandPatterns) -> dict[str, np.ndarray]:
+    """Classify every hand against compiled patterns.
+
+    Returns:
+        ``{name: bool array}`` shaped like *summary*.
+    """
+    masks = patterns.masks[summary & 0xFFFF]
+    one = patterns.masks.dtype.type(1)
+    return {
+        name: (masks & (one << bit)).astype(bool)
+        for bit, name in enumerate(patterns.names)
+    }
+
+
+def pbn_deals(deals: np.ndarray) -> list[str]:
+    """Format deals as PBN ``Deal`` tag values (``"N:AK.QJ.T98.7654 ..."``)."""
+    n = len(deals)
+    deals = np.sort(deals, axis=-1)
+    suits = (deals // 13).astype(np.intp)
+    # Card j of a hand sits after the separators of the suits before it.
+    positions = np.arange(13, dtype=np.intp) + suits + np.arange(4)[:, None] * _HAND_WIDTH
+    out = np.full((n, _DEAL_WIDTH), b".", dtype="S1")
+    out[:, _HAND_WIDTH - 1 :: _HAND_WIDTH] = b" "
+    np.put_along_axis(out, positions.reshape(n, 52), _RANK_CHARS[deals].reshape(n, 52), axis=1)
+    return ["N:" + row.decode("ascii") for row in out.view(f"S{_DEAL_WIDTH}").ravel()]
+
+
+def pbn_boards(n: int, seed: int, first_board: int = 1) -> list[str]:
+    """Deal *n* boards and format them as PBN records, numbered from *first_board*."""
+    deals = pbn_deals(deal(n, seed))
+    return [format_board(first_board + i, d) for i, d in enumerate(deals)]
@@ -1,10 +1,416 @@
-"""Diff service — structural comparison of two bidding systems."""
+"""Diff service — structural comparison of two bidding systems.
+
+Reports are cached at two levels keyed by (content hash A, content hash
+B, n_deals, seed, shard size, bbdsl version): an in-process LRU in front
+of the ``diff_reports`` table.  A vs B and B vs A are distinct entries:
+bbdsl's comparator is not guaranteed to be symmetric, so a reversed
+report is never derived by mirroring.
+
+Comparisons are tiered: :func:`compare_structural` walks the two
+auction tries bid by bid and answers in milliseconds, while the deal
+simulation is a second phase that can run in the background
+(:func:`start_simulation`) and be collected later
+(:func:`get_simulation`).  Concurrent requests for the same simulation
+share one run, across processes too: the run claims its
+``diff_reports`` row, whose status any process can read, and a failed
+or abandoned run is started again by the next request for it.
+"""
 
 from __future__ import annotations
 
-from app.services.bbdsl_service import diff
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.diff import DiffRecord
+from app.services.auction_service import get_trie, trie_for_content
+from app.services.bbdsl_service import BBDSL_VERSION, content_hash, diff, pool, run_in_pool
+from app.services.cache import LRUCache
+from app.services.diff_shards import merge_reports, plan_shards
+from app.services.structural_diff import structural_diff
+
+logger = logging.getLogger(__name__)
+
+# (sha_a, sha_b, n_deals, seed, shard_deals, bbdsl_version) -> report,
+# in the direction requested.
+DiffKey = tuple[str, str, int, int, int, str]
+
+_diff_cache: LRUCache[DiffKey, dict] = LRUCache(
+    "diffs",
+    max_entries=settings.diff_cache_max_entries,
+    max_bytes=settings.diff_cache_max_bytes,
+)
+
+# Simulations this process runs or waits on.  A run is shielded from the
+# request that started it, so it completes (and is stored) even if that
+# client leaves.
+_running: dict[DiffKey, asyncio.Task] = {}
+
+# How often a process waiting on another one's simulation re-reads its row.
+_POLL_SECONDS = 0.5
+
+
+class SimulationFailed(RuntimeError):
+    """The simulation recorded an error (possibly in another process)."""
 
 
 def compare_yaml(yaml_a: str, yaml_b: str, **kwargs) -> dict:
     """Thin wrapper calling bbdsl_service.diff."""
     return diff(yaml_a, yaml_b, **kwargs)
+
+
+def compare_serial(
+    yaml_a: str,
+    yaml_b: str,
+    n_deals: int,
+    seed: int,
+    shard_size: int | None = None,
+) -> dict:
+    """Run the sharded comparison in this process, one shard after another.
+
+    Produces exactly the same report as :func:`compare_parallel` for the
+    same arguments; useful as a reference and for CLI use.
+    """
+    shards = plan_shards(n_deals, seed, shard_size or settings.diff_shard_deals)
+    return _finish(
+        [(n, diff(yaml_a, yaml_b, n_deals=n, seed=s)) for n, s in shards],
+        n_deals,
+        seed,
+    )
+
+
+async def compare_parallel(
+    yaml_a: str,
+    yaml_b: str,
+    n_deals: int,
+    seed: int,
+    shard_size: int | None = None,
+) -> dict:
+    """Simulate the deal shards concurrently in the worker pool and merge.
+
+    Each shard uses its own seed derived from *seed*, so the merged
+    report does not depend on scheduling or the number of workers.
+    """
+    shards = plan_shards(n_deals, seed, shard_size or settings.diff_shard_deals)
+    # One shard per worker at a time, so large diffs queue here instead
+    # of saturating the pool for other requests.
+    limit = asyncio.Semaphore(max(pool.processes, 1))
+
+    async def run_shard(n: int, shard_seed: int) -> dict:
+        async with limit:
+            return await run_in_pool(diff, yaml_a, yaml_b, n_deals=n, seed=shard_seed)
+
+    reports = await asyncio.gather(*(run_shard(n, s) for n, s in shards))
+    return _finish(list(zip((n for n, _ in shards), reports)), n_deals, seed)
+
+
+def _finish(shard_reports: list[tuple[int, dict]], n_deals: int, seed: int) -> dict:
+    report = merge_reports(shard_reports)
+    if len(shard_reports) > 1:
+        # Request parameters, not per-shard quantities.
+        if "seed" in report:
+            report["seed"] = seed
+        if "n_deals" in report:
+            report["n_deals"] = n_deals
+    return report
+
+
+def _diff_key(sha_a: str, sha_b: str, n_deals: int, seed: int) -> DiffKey:
+    return (sha_a, sha_b, n_deals, seed, settings.diff_shard_deals, BBDSL_VERSION)
+
+
+async def _lookup(key: DiffKey) -> dict | None:
+    report = _diff_cache.get(key)
+    if report is None:
+        report = await _get_stored_diff(key)
+        if report is not None:
+            _diff_cache.put(key, report, size=len(json.dumps(report)))
+    return report
+
+
+class SystemSource(NamedTuple):
+    """One side of a comparison: content hash plus a loader for the YAML.
+
+    The YAML is only loaded when a report or trie has to be computed.
+    """
+
+    sha256: str
+    load: Callable[[], Awaitable[str]]
+    stored: bool = False  # a registry convention; its auction index is persisted
+
+
+def inline_source(content: str) -> SystemSource:
+    """Source for YAML sent with the request."""
+
+    async def load() -> str:
+        return content
+
+    return SystemSource(content_hash(content), load)
+
+
+async def _keep_alive(key: DiffKey) -> None:
+    while True:
+        await asyncio.sleep(settings.diff_simulation_stale_seconds / 3)
+        await _set_phase(key, "running")
+
+
+async def _simulate_and_store(key: DiffKey, a: SystemSource, b: SystemSource) -> dict:
+    while not await _claim(key):
+        # Another process is running it; wait for its outcome.
+        record = await _get_phase(key)
+        if record is not None and record.status == "ready":
+            return record.report
+        if record is not None and record.status == "failed":
+            raise SimulationFailed(record.error)
+        await asyncio.sleep(_POLL_SECONDS)
+
+    heartbeat = asyncio.create_task(_keep_alive(key))
+    try:
+        n_deals, seed, shard_deals = key[2:5]
+        yaml_a, yaml_b = await asyncio.gather(a.load(), b.load())
+        report = await compare_parallel(yaml_a, yaml_b, n_deals, seed, shard_deals)
+    except BaseException as exc:
+        await _set_phase(key, "failed", error=f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        heartbeat.cancel()
+    await _set_phase(key, "ready", report=report)
+    _diff_cache.put(key, report, size=len(json.dumps(report)))
+    return report
+
+
+def _finished(key: DiffKey, task: asyncio.Task) -> None:
+    _running.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Diff simulation %s..%s failed: %s", key[0], key[1], task.exception())
+
+
+def _simulation_task(key: DiffKey, a: SystemSource, b: SystemSource) -> asyncio.Task:
+    # Loaders outlive the request, so they must not use its database
+    # session.
+    task = _running.get(key)
+    if task is None:
+        task = asyncio.create_task(_simulate_and_store(key, a, b))
+        _running[key] = task
+        task.add_done_callback(lambda t: _finished(key, t))
+    return task
+
+
+async def compare_sources(
+    a: SystemSource, b: SystemSource, n_deals: int, seed: int
+) -> tuple[dict, bool]:
+    """Compare two systems, reusing a cached report when possible.
+
+    Returns:
+        ``(report, cached)``.  The report may be shared with the cache
+        and must be treated as read-only.
+    """
+    key = _diff_key(a.sha256, b.sha256, n_deals, seed)
+    report = await _lookup(key)
+    cached = report is not None
+    if report is None:
+        report = await asyncio.shield(_simulation_task(key, a, b))
+    return report, cached
+
+
+async def compare_cached(
+    yaml_a: str, yaml_b: str, n_deals: int, seed: int
+) -> tuple[dict, bool]:
+    """:func:`compare_sources` for inline YAML."""
+    return await compare_sources(inline_source(yaml_a), inline_source(yaml_b), n_deals, seed)
+
+
+async def _trie(source: SystemSource):
+    if source.stored:
+        return await get_trie(source.sha256, source.load)
+    return await trie_for_content(await source.load())
+
+
+async def compare_structural(a: SystemSource, b: SystemSource, locale: str = "en") -> dict:
+    """Compare two systems bid by bid, without simulation.
+
+    Raises:
+        ValueError: If either document is not a YAML mapping.
+    """
+    trie_a, trie_b = await asyncio.gather(_trie(a), _trie(b))
+    return structural_diff(trie_a, trie_b, locale=locale)
+
+
+async def start_simulation(a: SystemSource, b: SystemSource, n_deals: int, seed: int) -> str:
+    """Make sure the simulated report exists or is being computed.
+
+    A simulation that failed, or whose runner died, is started again.
+
+    Returns:
+        ``"ready"`` if the report is cached, else ``"running"``.
+    """
+    key = _diff_key(a.sha256, b.sha256, n_deals, seed)
+    if await _lookup(key) is not None:
+        return "ready"
+    _simulation_task(key, a, b)
+    return "running"
+
+
+async def get_simulation(
+    sha_a: str, sha_b: str, n_deals: int, seed: int, wait: float = 0.0
+) -> tuple[str, dict | None]:
+    """Collect a simulated report started by :func:`start_simulation`.
+
+    Args:
+        wait: Seconds to wait for a running simulation to finish.
+
+    Returns:
+        ``("ready", report)``, ``("running", None)``, ``("failed",
+        {"error": message})`` when the run failed or its process died
+        without finishing, or ``("not_started", None)``.  Failed and
+        unstarted simulations are (re)started by :func:`start_simulation`
+        or :func:`compare_sources`.
+    """
+    key = _diff_key(sha_a, sha_b, n_deals, seed)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        report = await _lookup(key)
+        if report is not None:
+            return "ready", report
+        remaining = deadline - loop.time()
+        task = _running.get(key)
+        if task is not None and not task.done():
+            if remaining <= 0:
+                return "running", None
+            # Its outcome is read back from the table on the next pass.
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.shield(task), remaining)
+            continue
+        record = await _get_phase(key)
+        if record is None:
+            return "not_started", None
+        if record.status == "failed":
+            return "failed", {"error": record.error}
+        if record.status == "running" and _is_stale(record.updated_at):
+            return "failed", {"error": "The simulation stopped without finishing"}
+        if remaining <= 0:
+            return "running", None
+        await asyncio.sleep(min(_POLL_SECONDS, remaining))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stale_before() -> datetime:
+    return _now() - timedelta(seconds=settings.diff_simulation_stale_seconds)
+
+
+def _is_stale(updated_at: datetime | None) -> bool:
+    if updated_at is None:
+        return True
+    if updated_at.tzinfo is None:  # SQLite returns naive UTC
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at < _stale_before()
+
+
+def _key_filter(key: DiffKey):
+    sha_a, sha_b, n_deals, seed, shard_deals, version = key
+    return and_(
+        DiffRecord.sha_a == sha_a,
+        DiffRecord.sha_b == sha_b,
+        DiffRecord.n_deals == n_deals,
+        DiffRecord.seed == seed,
+        DiffRecord.shard_deals == shard_deals,
+        DiffRecord.bbdsl_version == version,
+    )
+
+
+async def _get_stored_diff(key: DiffKey) -> dict | None:
+    async with async_session() as db:
+        result = await db.execute(
+            select(DiffRecord.report).where(_key_filter(key), DiffRecord.status == "ready")
+        )
+        return result.scalar_one_or_none()
+
+
+async def _get_phase(key: DiffKey) -> DiffRecord | None:
+    async with async_session() as db:
+        result = await db.execute(select(DiffRecord).where(_key_filter(key)))
+        return result.scalar_one_or_none()
+
+
+async def _claim(key: DiffKey) -> bool:
+    """Mark the simulation of *key* running in this process.
+
+    Fails (returns False) while it is ready, or running with a recent
+    heartbeat; a failed or abandoned run is taken over.
+    """
+    sha_a, sha_b, n_deals, seed, shard_deals, version = key
+    async with async_session() as db:
+        db.add(
+            DiffRecord(
+                sha_a=sha_a,
+                sha_b=sha_b,
+                n_deals=n_deals,
+                seed=seed,
+                shard_deals=shard_deals,
+                bbdsl_version=version,
+                status="running",
+                updated_at=_now(),
+            )
+        )
+        try:
+            await db.commit()
+            return True
+        except IntegrityError:
+            await db.rollback()
+        result = await db.execute(
+            update(DiffRecord)
+            .where(
+                _key_filter(key),
+                or_(
+                    DiffRecord.status == "failed",
+                    and_(
+                        DiffRecord.status == "running",
+                        or_(
+                            DiffRecord.updated_at.is_(None),
+                            DiffRecord.updated_at < _stale_before(),
+                        ),
+                    ),
+                ),
+            )
+            .values(status="running", error=None, updated_at=_now())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+async def _set_phase(
+    key: DiffKey, status: str, report: dict | None = None, error: str | None = None
+) -> None:
+    """Record the outcome (or heartbeat) of the run this process claimed."""
+    async with async_session() as db:
+        await db.execute(
+            update(DiffRecord)
+            .where(_key_filter(key), DiffRecord.status == "running")
+            .values(status=status, report=report, error=error, updated_at=_now())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def purge_stale_diffs() -> int:
+    """Delete diff reports produced by a bbdsl version other than the installed one."""
+    async with async_session() as db:
+        result = await db.execute(
+            delete(DiffRecord).where(DiffRecord.bbdsl_version != BBDSL_VERSION)
+        )
+        await db.commit()
+        return result.rowcount or 0
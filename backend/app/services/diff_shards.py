@@ -0,0 +1,141 @@
+"""Deal-range sharding, merging and mirroring of system diff reports.
+
+A diff over *n* deals is split into fixed-size shards.  Shard *i*
+simulates its deals with ``derive_seed(seed, i)``, so the shard plan
+depends only on ``(n_deals, seed, shard_size)`` — never on how many
+workers run it.  Merging the shard reports in shard order therefore
+gives the same result whether shards run serially or in parallel.
+
+:func:`mirror_report` turns an A-vs-B report into the B-vs-A one for
+reports that are symmetric by construction, such as the structural
+diff.  Simulated reports are not mirrored: bbdsl's comparator is not
+guaranteed to treat its two systems alike, so each direction is
+simulated and cached on its own.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from app.services.pbn import derive_seed
+
+logger = logging.getLogger(__name__)
+
+
+def plan_shards(n_deals: int, seed: int, shard_size: int) -> list[tuple[int, int]]:
+    """Return ``(deal_count, shard_seed)`` for each shard, in order.
+
+    A single shard keeps *seed* itself, so small diffs are identical to
+    an unsharded comparison.
+    """
+    shards = []
+    for index, start in enumerate(range(0, n_deals, shard_size)):
+        shards.append((min(shard_size, n_deals - start), derive_seed(seed, index)))
+    return shards
+
+
+# How fields of a comparison report combine across shards, by key name
+# (at any depth).  Any other field must be equal in every shard; see
+# :func:`merge_reports`.
+DEAL_COUNTERS = frozenset({"n_deals", "deals_compared", "deals_same", "deals_different"})
+DEAL_RATES = frozenset({"agreement", "agreement_rate"})  # per-deal averages
+CASE_LISTS = {"diff_cases": "bid"}  # bid-level cases, unique by this key
+REQUEST_PARAMS = frozenset({"seed"})  # differ per shard; the caller sets them
+
+
+def merge_reports(shards: list[tuple[int, dict]]) -> dict:
+    """Merge per-shard comparison reports into one report.
+
+    Args:
+        shards: ``(deal_count, report)`` pairs in shard order.
+
+    :data:`DEAL_COUNTERS` are summed and :data:`DEAL_RATES` averaged
+    weighted by deal count.  :data:`CASE_LISTS` describe the bids, not
+    the deals, so each bid appears once: in first-seen order, and with a
+    non-``same`` status if any shard saw it differ.  Nested dicts merge
+    key by key, and :data:`REQUEST_PARAMS` are taken from the first
+    shard for the caller to overwrite.
+
+    Any other field is kept only if every shard agrees on it.  A field
+    the shards disagree on cannot be combined without knowing what it
+    counts, so it is dropped and its dotted path listed under
+    ``unmerged_fields``, with ``partial`` set on the report.
+    """
+    if len(shards) == 1:
+        return shards[0][1]
+    unmerged: list[str] = []
+    merged = _merge_dicts([report for _, report in shards], [n for n, _ in shards], "", unmerged)
+    if unmerged:
+        logger.warning("Diff shards disagree on unmergeable fields: %s", ", ".join(unmerged))
+        merged["partial"] = True
+        merged["unmerged_fields"] = unmerged
+    return merged
+
+
+def _merge_dicts(values: list[dict], weights: list[int], path: str, unmerged: list[str]) -> dict:
+    merged: dict = {}
+    for key in dict.fromkeys(k for v in values for k in v):
+        present = [(v[key], w) for v, w in zip(values, weights) if key in v]
+        items = [p[0] for p in present]
+        if key in CASE_LISTS and all(isinstance(i, list) for i in items):
+            merged[key] = _merge_cases(items, CASE_LISTS[key])
+        elif key in DEAL_COUNTERS and all(type(i) is int for i in items):
+            merged[key] = sum(items)
+        elif key in DEAL_RATES and all(isinstance(i, (int, float)) for i in items):
+            total = sum(p[1] for p in present)
+            merged[key] = sum(i * w for i, w in present) / total if total else items[0]
+        elif key in REQUEST_PARAMS:
+            merged[key] = items[0]
+        elif all(isinstance(i, dict) for i in items):
+            merged[key] = _merge_dicts(items, [p[1] for p in present], f"{path}{key}.", unmerged)
+        elif len(items) == len(values) and all(i == items[0] for i in items):
+            merged[key] = items[0]
+        else:
+            unmerged.append(f"{path}{key}")
+    return merged
+
+
+def _merge_cases(lists: list[list], key: str) -> list:
+    cases: dict = {}
+    unkeyed = []
+    for case in (c for cases_ in lists for c in cases_):
+        if not isinstance(case, dict) or key not in case:
+            unkeyed.append(case)
+            continue
+        seen = cases.get(case[key])
+        if seen is None or (seen.get("status") == "same" and case.get("status") != "same"):
+            cases[case[key]] = case
+    return list(cases.values()) + unkeyed
+
+
+_SIDES = {"a": "b", "b": "a"}
+
+
+def mirror_report(report: Any) -> Any:
+    """Return the report of the reversed comparison (B vs A).
+
+    Keys naming a side (``system_a``, ``only_b``, ``a`` …) are swapped
+    along with their values, and ``status`` values ``only_a``/``only_b``
+    are exchanged.  The input is not modified.
+    """
+    if isinstance(report, list):
+        return [mirror_report(item) for item in report]
+    if not isinstance(report, dict):
+        return report
+    mirrored: dict = {}
+    for key, value in report.items():
+        other = _swap_side(key)
+        if other != key and other in report:
+            mirrored[key] = mirror_report(report[other])
+        elif key == "status" and isinstance(value, str):
+            mirrored[key] = _swap_side(value)
+        else:
+            mirrored[other] = mirror_report(value)
+    return mirrored
+
+
+def _swap_side(name: Any) -> Any:
+    if not isinstance(name, str):
+        return name
+    return "_".join(_SIDES.get(part, part) for part in name.split("_"))
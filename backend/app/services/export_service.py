@@ -0,0 +1,181 @@
+"""Streaming exports built on the bbdsl worker pool.
+
+Large PBN/LIN practice sets are exported in fixed-size chunks.  Each
+chunk is rendered by a pool worker with its own seed derived from the
+request seed, so memory stays constant in the number of boards and the
+output is reproducible for a given seed.
+
+Bundles of several formats/locales are rendered concurrently and
+streamed as a zip archive, one entry as soon as each export finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import zipfile
+from collections.abc import AsyncIterator
+
+from app.services.bbdsl_service import (
+    WorkerPoolError,
+    export,
+    export_board_chunk,
+    parse_check,
+    pool,
+    run_in_pool,
+)
+from app.services.pbn import derive_seed
+
+BOARD_CHUNK_SIZE = 250
+# Deals-only chunks come from the vectorized engine and are far cheaper.
+DEALS_ONLY_CHUNK_SIZE = 5000
+
+
+async def open_board_stream(
+    content: str,
+    fmt: str,
+    n_deals: int,
+    seed: int,
+    locale: str = "en",
+    chunk_size: int | None = None,
+    deals_only: bool = False,
+) -> AsyncIterator[str]:
+    """Start a board-by-board PBN or LIN export.
+
+    The first chunk is rendered before this coroutine returns, so export
+    errors surface to the caller before any response has been sent.
+    While one chunk is being streamed the next one is already rendering.
+
+    Args:
+        deals_only: Stream plain random deals from the deal engine
+            instead of bbdsl-annotated boards.
+
+    Returns:
+        An async iterator of text fragments (header, then one per board).
+    """
+    if chunk_size is None:
+        chunk_size = DEALS_ONLY_CHUNK_SIZE if deals_only else BOARD_CHUNK_SIZE
+    n_chunks = (n_deals + chunk_size - 1) // chunk_size
+
+    def fetch(index: int) -> asyncio.Future:
+        start = index * chunk_size
+        return asyncio.ensure_future(
+            run_in_pool(
+                export_board_chunk,
+                content,
+                fmt,
+                min(chunk_size, n_deals - start),
+                derive_seed(seed, index),
+                first_board=start + 1,
+                locale=locale,
+                deals_only=deals_only,
+            )
+        )
+
+    first = await fetch(0)
+    separator = "\n\n" if fmt == "pbn" else "\n"
+
+    async def stream() -> AsyncIterator[str]:
+        pending: asyncio.Future | None = None
+        try:
+            header, records = first
+            if header:
+                yield header + "\n"
+            for index in range(n_chunks):
+                if index > 0:
+                    _, records = await pending
+                pending = fetch(index + 1) if index + 1 < n_chunks else None
+                for record in records:
+                    yield record + separator
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    return stream()
+
+
+BUNDLE_EXTENSIONS: dict[str, str] = {
+    "bml": "bml",
+    "bboalert": "bboalert.txt",
+    "svg": "svg",
+    "html": "html",
+    "pbn": "pbn",
+    "lin": "lin",
+}
+
+
+class _ZipSink:
+    """Write-only file object collecting zip output between drains.
+
+    It has no ``tell``/``seek``, so :mod:`zipfile` writes each entry with
+    a trailing data descriptor and never rewinds: bytes can be sent as
+    soon as an entry is written.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def open_bundle_stream(
+    content: str,
+    formats: list[str],
+    locales: list[str],
+    n_deals: int,
+    seed: int,
+) -> AsyncIterator[bytes]:
+    """Start a zip export of every (format, locale) combination.
+
+    The document is parsed once up front so invalid YAML raises here,
+    before any response is sent.  Exports then run concurrently in the
+    worker pool (at most one per worker at a time) and each is added to
+    the archive as it completes.  An exporter failure becomes an
+    ``errors/<format>-<locale>.txt`` entry instead of aborting the bundle.
+
+    Returns:
+        An async iterator of zip archive bytes.
+    """
+    await run_in_pool(parse_check, content)
+    jobs = [(fmt, locale) for locale in locales for fmt in formats]
+
+    async def stream() -> AsyncIterator[bytes]:
+        limit = asyncio.Semaphore(max(pool.processes, 1))
+
+        async def render(fmt: str, locale: str) -> tuple[str, str]:
+            kwargs: dict = {"locale": locale}
+            if fmt in ("pbn", "lin"):
+                kwargs.update(n_deals=n_deals, seed=seed)
+            async with limit:
+                try:
+                    body = await run_in_pool(export, content, fmt, **kwargs)
+                except WorkerPoolError:
+                    raise
+                except Exception as exc:
+                    return f"errors/{fmt}-{locale}.txt", f"{type(exc).__name__}: {exc}\n"
+            return f"{locale}/system.{BUNDLE_EXTENSIONS.get(fmt, fmt)}", body
+
+        tasks = [asyncio.ensure_future(render(fmt, locale)) for fmt, locale in jobs]
+        sink = _ZipSink()
+        archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                name, body = await next_done
+                await asyncio.to_thread(archive.writestr, name, body)
+                yield sink.drain()
+            archive.close()
+            yield sink.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return stream()
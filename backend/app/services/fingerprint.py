@@ -0,0 +1,129 @@
+"""Structural fingerprints of bidding systems (MinHash + LSH).
+
+A system is reduced to a set of shingles taken from its compiled auction
+trie: every auction it defines (``"1NT-2C"``) and, when the auction has
+one, the auction together with its structural meaning (hand constraints,
+forcing status, convention…; descriptions are left out so translations
+and rewordings do not count as differences).  The MinHash signature of
+that set estimates Jaccard similarity between two systems, and its LSH
+band keys let similar systems be found by bucket lookup instead of a
+comparison against every system in the registry.
+
+With 32 bands of 4 rows, systems about 45% similar share a bucket half
+of the time and 70% similar ones almost always do.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import numpy as np
+
+from app.services.auction_index import AuctionTrie, compile_trie
+
+# Bump when the shingles, hash family or banding change; stored
+# fingerprints of another version are ignored.
+FINGERPRINT_VERSION = 1
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+# Meaning keys that are prose rather than structure.
+_TEXT_KEYS = frozenset({"description", "notes", "note", "name", "comment", "example"})
+_CHUNK = 4096  # shingles hashed per step, bounds the (NUM_PERM, chunk) matrix
+
+# Fixed seed: signatures must be comparable across processes and restarts.
+_rng = np.random.default_rng(0x5EED_F1A6)
+_MULT = _rng.integers(1, 2**64, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_ADD = _rng.integers(0, 2**64, size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+
+
+def _structure(payload: dict | None) -> str | None:
+    if not payload:
+        return None
+    meaning = payload.get("meaning")
+    parts = {}
+    if isinstance(meaning, dict):
+        parts = {k: v for k, v in meaning.items() if k not in _TEXT_KEYS}
+    if payload.get("convention"):
+        parts["convention"] = payload["convention"]
+    if not parts:
+        return None
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def auction_shingles(trie: AuctionTrie) -> set[str]:
+    """Shingles of every auction in *trie* and of its structural meaning."""
+    shingles: set[str] = set()
+    stack: list[tuple[int, str]] = [(0, "")]
+    while stack:
+        node, auction = stack.pop()
+        for bid, child in trie.children(node):
+            path = f"{auction}-{bid}" if auction else bid
+            shingles.add(path)
+            structure = _structure(trie.payloads[child])
+            if structure is not None:
+                shingles.add(f"{path}={structure}")
+            stack.append((child, path))
+    return shingles
+
+
+def _hash64(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def minhash(shingles: set[str]) -> np.ndarray:
+    """MinHash signature of *shingles*: ``NUM_PERM`` ``uint32`` values.
+
+    Each permutation is a multiply-add hash ``(a * x + b) mod 2**64``
+    of the shingle's 64-bit digest, keeping the high 32 bits.
+    """
+    if not shingles:
+        return _EMPTY.copy()
+    digests = np.fromiter((_hash64(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(digests), _CHUNK):
+        chunk = digests[None, start : start + _CHUNK]
+        hashed = chunk * _MULT[:, None] + _ADD[:, None]  # wraps mod 2**64
+        np.minimum(signature, hashed.min(axis=1), out=signature)
+    return (signature >> np.uint64(32)).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[int]:
+    """LSH bucket key of each band, as signed 64-bit integers."""
+    rows = np.ascontiguousarray(signature, dtype="<u4").reshape(BANDS, ROWS)
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.tobytes(), digest_size=8, person=b"bbdsl-lsh").digest(),
+            "little",
+            signed=True,
+        )
+        for band in rows
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def fingerprint_content(content: str) -> tuple[np.ndarray, int]:
+    """Compile *content* and return ``(signature, shingle_count)``.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping.
+    """
+    shingles = auction_shingles(compile_trie(content))
+    return minhash(shingles), len(shingles)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return np.ascontiguousarray(signature, dtype="<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
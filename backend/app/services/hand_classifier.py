@@ -0,0 +1,211 @@
+"""Vectorized opening-bid classification of hands.
+
+A system's openings are compiled into per-opening constraints on HCP,
+suit lengths and shape patterns (``meaning.hand``), which are evaluated
+for a whole batch of hands at once on the summaries computed by
+:mod:`app.services.deal_engine`.
+
+When several openings accept a hand, the one with the highest
+``priority`` wins (the spec's static selection; an opening without one
+has priority 0), and openings of equal priority keep document order.
+Constraint keys other than ``hcp``, the four suits and ``shape.ref``
+are not evaluated and are listed in ``ignored``, as is a top-level
+``selection_rules`` block.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+import numpy as np
+import yaml
+
+from app.services import deal_engine
+from app.services.auction_index import decode_bid, encode_bid
+
+SUIT_KEYS = ("spades", "hearts", "diamonds", "clubs")
+PASS = "P"
+
+_RANK_INDEX = np.full(256, 255, dtype=np.uint8)
+for _i, _rank in enumerate(deal_engine.RANKS):
+    _RANK_INDEX[ord(_rank)] = _i
+    _RANK_INDEX[ord(_rank.lower())] = _i
+_DOT = ord(".")
+_HAND_CHARS = 16  # 13 cards + 3 suit separators
+
+
+class OpeningRule(NamedTuple):
+    """Constraints of one opening bid."""
+
+    bid: str
+    priority: int  # higher wins when several openings apply
+    hcp: tuple[int, int]
+    lengths: tuple[tuple[int, int], ...]  # (min, max) in S, H, D, C order
+    shape: str | None  # pattern name from definitions.patterns
+
+
+class HandClassifier:
+    """Compiled opening constraints of one system; build with :func:`compile_classifier`."""
+
+    def __init__(
+        self,
+        rules: list[OpeningRule],
+        patterns: deal_engine.HandPatterns,
+        ignored: set[str],
+    ) -> None:
+        self.patterns = patterns
+        self.ignored = sorted(ignored)
+        self._pattern_bit = {name: bit for bit, name in enumerate(patterns.names)}
+        # sorted() is stable: equal priorities keep document order.
+        self.rules = sorted(rules, key=lambda rule: -rule.priority)
+        self.bids = np.array([rule.bid for rule in self.rules] + [PASS], dtype=object)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.patterns.masks.nbytes) + 256 * len(self.rules)
+
+    def match(self, summary: np.ndarray) -> np.ndarray:
+        """Boolean matrix ``(n, len(rules))``: which openings accept each hand."""
+        hcp = deal_engine.hcp(summary)
+        lengths = deal_engine.suit_lengths(summary)
+        masks = self.patterns.masks[summary & 0xFFFF]
+        one = self.patterns.masks.dtype.type(1)
+        matches = np.empty((len(summary), len(self.rules)), dtype=bool)
+        for j, rule in enumerate(self.rules):
+            ok = (hcp >= rule.hcp[0]) & (hcp <= rule.hcp[1])
+            for suit, (lo, hi) in enumerate(rule.lengths):
+                if lo > 0:
+                    ok &= lengths[:, suit] >= lo
+                if hi < 13:
+                    ok &= lengths[:, suit] <= hi
+            if rule.shape is not None:
+                ok &= (masks & (one << self._pattern_bit[rule.shape])) != 0
+            matches[:, j] = ok
+        return matches
+
+    def classify(self, hands: np.ndarray) -> np.ndarray:
+        """Opening bid of each hand (``"P"`` if none applies).
+
+        Args:
+            hands: ``(n, 13)`` card codes, e.g. from :func:`parse_pbn_hands`.
+        """
+        if not self.rules:
+            return np.full(len(hands), PASS, dtype=object)
+        matches = self.match(deal_engine.summarize(hands))
+        first = matches.argmax(axis=1)
+        first[~matches.any(axis=1)] = len(self.rules)
+        return self.bids[first]
+
+
+def _bounds(spec: Any, upper: int) -> tuple[int, int]:
+    if isinstance(spec, Mapping):
+        return int(spec.get("min", 0)), int(spec.get("max", upper))
+    return int(spec), int(spec)
+
+
+def compile_classifier(content: str) -> HandClassifier:
+    """Compile the opening constraints of a BBDSL document.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping or has invalid
+            constraints or patterns.
+    """
+    try:
+        doc = yaml.safe_load(content)
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Invalid YAML: {exc}") from exc
+    if not isinstance(doc, dict):
+        raise ValueError("A BBDSL document must be a mapping")
+
+    definitions = doc.get("definitions") or {}
+    patterns = deal_engine.compile_patterns(definitions.get("patterns") or {})
+    rules: list[OpeningRule] = []
+    ignored: set[str] = set()
+    for opening in doc.get("openings") or []:
+        if not isinstance(opening, dict) or "bid" not in opening:
+            continue
+        try:
+            bid = decode_bid(encode_bid(str(opening["bid"])))
+        except ValueError:
+            continue
+        hand = (opening.get("meaning") or {}).get("hand") or {}
+        try:
+            shape = (hand.get("shape") or {}).get("ref")
+            if shape is not None and shape not in patterns.names:
+                raise ValueError(f"Unknown shape pattern {shape!r}")
+            rules.append(
+                OpeningRule(
+                    bid=bid,
+                    priority=int(opening.get("priority", 0)),
+                    hcp=_bounds(hand.get("hcp", {}), 37),
+                    lengths=tuple(_bounds(hand.get(suit, {}), 13) for suit in SUIT_KEYS),
+                    shape=shape,
+                )
+            )
+        except (TypeError, ValueError, AttributeError) as exc:
+            raise ValueError(f"Opening {bid}: {exc}") from exc
+        ignored.update(k for k in hand if k not in SUIT_KEYS and k not in ("hcp", "shape"))
+    if doc.get("selection_rules"):
+        ignored.add("selection_rules")
+    return HandClassifier(rules, patterns, ignored)
+
+
+def parse_pbn_hands(hands: list[str]) -> np.ndarray:
+    """Parse PBN hand strings (``"AKQ2.K32.Q5.J432"``, S.H.D.C) in one pass.
+
+    Returns:
+        ``(n, 13)`` ``uint8`` card codes.
+
+    Raises:
+        ValueError: Naming the first malformed hand.
+    """
+    n = len(hands)
+    if n == 0:
+        return np.empty((0, 13), dtype=np.uint8)
+    bad = next((i for i, hand in enumerate(hands) if len(hand) != _HAND_CHARS), None)
+    if bad is not None:
+        raise ValueError(f"Hand {bad}: expected 13 cards in 4 suits, got {hands[bad]!r}")
+    try:
+        chars = np.frombuffer("".join(hands).encode("ascii"), dtype=np.uint8)
+    except UnicodeEncodeError as exc:
+        raise ValueError("Hands must be ASCII PBN strings") from exc
+    chars = chars.reshape(n, _HAND_CHARS)
+    dots = chars == _DOT
+    suits = np.cumsum(dots, axis=1, dtype=np.uint8)
+    ranks = _RANK_INDEX[chars]
+    valid = (dots.sum(axis=1) == 3) & ((ranks != 255) | dots).all(axis=1)
+
+    if valid.all():
+        cards = (suits * 13 + ranks)[~dots].reshape(n, 13)
+        valid &= (np.diff(np.sort(cards, axis=1), axis=1) != 0).all(axis=1)  # no duplicates
+    if not valid.all():
+        bad = int(np.argmin(valid))
+        raise ValueError(f"Hand {bad}: not a valid PBN hand: {hands[bad]!r}")
+    return cards
+
+
+def unpack_hands(data: bytes) -> np.ndarray:
+    """Decode packed hands: one little-endian uint64 per hand.
+
+    Bit *c* is set when the hand holds card code *c* (``suit * 13 +
+    rank``, suits S, H, D, C and ranks A..2); exactly 13 bits per hand.
+
+    Raises:
+        ValueError: On a truncated buffer or a hand without 13 cards.
+    """
+    if len(data) % 8:
+        raise ValueError("Packed hands must be a multiple of 8 bytes")
+    words = np.frombuffer(data, dtype="<u8")
+    bits = np.unpackbits(words.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    counts = bits[:, :52].sum(axis=1)
+    if (bits[:, 52:].any(axis=1) | (counts != 13)).any():
+        bad = int(np.argmax(bits[:, 52:].any(axis=1) | (counts != 13)))
+        raise ValueError(f"Hand {bad}: packed hand must hold exactly 13 cards")
+    return np.nonzero(bits[:, :52])[1].astype(np.uint8).reshape(-1, 13)
+
+
+def pack_hand(cards: list[int]) -> bytes:
+    """Pack one hand's card codes in the :func:`unpack_hands` format."""
+    return struct.pack("<Q", sum(1 << int(card) for card in cards))
@@ -0,0 +1,242 @@
+"""Incremental, section-level validation for the editor WebSocket.
+
+The editor sends the whole document on every change, but users mostly
+edit one block.  :class:`IncrementalValidator` keeps, per connection,
+the sections of the last document and the validator results grouped by
+rule.  On each new document it:
+
+1. splits the YAML text into top-level sections (``system``,
+   ``definitions``, each entry under ``conventions``, ``openings``, ...)
+   and hashes each one;
+2. computes, for every rule, a fingerprint over the sections the rule
+   reads (:data:`RULE_INPUTS`);
+3. reuses cached results for rules whose fingerprint is unchanged and
+   re-runs only the stale ones, on a projected document made of just
+   the sections those rules read.
+
+bbdsl's ``Validator`` only exposes ``validate_all()``, so the stale rules
+share one validation run of the projected document.  If the projection
+cannot be validated (or the report contains rules this module does not
+know the inputs of), the full document is validated instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+# Sections every projected document keeps (``validation`` carries the
+# user's severity overrides), and every rule depends on.
+HEADER_KINDS = frozenset({"_preamble", "bbdsl", "bbdsl_version", "system", "validation"})
+_GLOBAL_INPUTS = frozenset({"bbdsl", "bbdsl_version", "validation"})
+
+_REFERRING = frozenset({"openings", "conventions", "defensive", "defense_to", "contexts"})
+
+# Top-level section kinds read by each validation rule (BBDSL v0.3 spec,
+# "驗證規則" + supplement).  ``conventions`` covers every entry under it.
+RULE_INPUTS: dict[str, frozenset[str]] = {
+    "val-001": frozenset({"definitions", "openings"}),
+    "val-002": frozenset({"definitions"}) | _REFERRING,
+    "val-003": frozenset({"openings", "conventions"}),
+    "val-004": _REFERRING,
+    "val-005": frozenset({"conventions", "openings", "contexts"}),
+    "val-006": frozenset({"definitions"}) | _REFERRING,
+    "val-007": _REFERRING,
+    "val-008": _REFERRING,
+    "val-009": frozenset({"contexts", "openings", "conventions"}),
+    "val-010": frozenset({"definitions"}) | _REFERRING,
+    "val-011": frozenset({"conventions"}),
+    "val-012": frozenset({"definitions"}),
+    "val-013": frozenset({"openings", "conventions", "selection_rules"}),
+    "val-014": frozenset({"openings", "conventions", "selection_rules"}),
+}
+
+_TOP_KEY_RE = re.compile(r"^([A-Za-z_][\w\-]*)\s*:")
+_ENTRY_KEY_RE = re.compile(r"^( +)([^\s#:][^:]*?)\s*:")
+_RULE_KEY_RE = re.compile(r"^(val-\d{3})")
+
+
+@dataclass(frozen=True)
+class Section:
+    """A contiguous slice of the YAML text."""
+
+    name: str
+    text: str
+    digest: str
+
+    @property
+    def kind(self) -> str:
+        return self.name.split("/", 1)[0]
+
+
+def _digest(text: str) -> str:
+    """Hash *text* ignoring comment-only lines, blank lines and trailing spaces."""
+    h = hashlib.sha256()
+    for line in text.splitlines():
+        stripped = line.rstrip()
+        if stripped and not stripped.lstrip().startswith("#"):
+            h.update(stripped.encode("utf-8"))
+            h.update(b"\n")
+    return h.hexdigest()
+
+
+def split_sections(content: str) -> list[Section]:
+    """Split YAML text into top-level sections, with one section per
+    ``conventions`` entry (named ``conventions/<key>``)."""
+    chunks: list[tuple[str, list[str]]] = [("_preamble", [])]
+    for line in content.splitlines(keepends=True):
+        match = _TOP_KEY_RE.match(line)
+        if match:
+            chunks.append((match.group(1), []))
+        chunks[-1][1].append(line)
+
+    sections: list[Section] = []
+    seen: dict[str, int] = {}
+    for name, lines in chunks:
+        parts = _split_entries(lines) if name == "conventions" else [(name, lines)]
+        for part_name, part_lines in parts:
+            if not part_lines:
+                continue
+            # Duplicate keys keep distinct names so both stay in projections.
+            count = seen.get(part_name, 0)
+            seen[part_name] = count + 1
+            unique = part_name if count == 0 else f"{part_name}#{count}"
+            text = "".join(part_lines)
+            sections.append(Section(unique, text, _digest(text)))
+    return sections
+
+
+def _split_entries(lines: list[str]) -> list[tuple[str, list[str]]]:
+    """Split a block-style ``conventions:`` section into its entries."""
+    parts: list[tuple[str, list[str]]] = [("conventions", lines[:1])]
+    indent: str | None = None
+    for line in lines[1:]:
+        match = _ENTRY_KEY_RE.match(line)
+        if match and (indent is None or match.group(1) == indent):
+            indent = match.group(1)
+            parts.append((f"conventions/{match.group(2)}", []))
+        parts[-1][1].append(line)
+    return parts
+
+
+def rule_key(result: dict) -> str | None:
+    """Return the ``val-NNN`` key of a validator result, or None if unknown."""
+    match = _RULE_KEY_RE.match(str(result.get("rule_id", "")))
+    if match and match.group(1) in RULE_INPUTS:
+        return match.group(1)
+    return None
+
+
+class IncrementalValidator:
+    """Per-connection incremental validation state.
+
+    Args:
+        validate: Coroutine function validating a YAML string and
+            returning a report dict with ``results``.
+    """
+
+    def __init__(self, validate: Callable[[str], Awaitable[dict]]) -> None:
+        self._validate = validate
+        self._fingerprints: dict[str, str] = {}
+        self._digests: dict[str, str] = {}
+        self._results: dict[str, list[dict]] = {}
+        self._base: dict | None = None
+        self._exact = True  # False when the last report had unknown rules
+
+    async def validate(self, content: str) -> dict:
+        """Validate *content*, re-running only rules whose inputs changed.
+
+        Returns the merged report with an extra ``incremental`` entry
+        describing what was re-validated.
+        """
+        sections = split_sections(content)
+        digests = {s.name: s.digest for s in sections}
+        changed = sorted(
+            name
+            for name in digests.keys() | self._digests.keys()
+            if digests.get(name) != self._digests.get(name)
+        )
+        fingerprints = {rule: _fingerprint(rule, sections) for rule in RULE_INPUTS}
+        stale = [r for r in RULE_INPUTS if fingerprints[r] != self._fingerprints.get(r)]
+
+        try:
+            if self._base is None or not self._exact or len(stale) == len(RULE_INPUTS):
+                mode = "full"
+                await self._run_full(content)
+            elif not stale:
+                mode = "reused"
+            else:
+                mode = "partial"
+                if not await self._run_partial(sections, stale):
+                    mode = "full"
+                    await self._run_full(content)
+        except Exception:
+            self.reset()
+            raise
+
+        self._fingerprints = fingerprints
+        self._digests = digests
+        report = self._merged()
+        report["incremental"] = {
+            "mode": mode,
+            "changed_sections": changed,
+            "rerun_rules": list(RULE_INPUTS) if mode == "full" else stale,
+        }
+        return report
+
+    def reset(self) -> None:
+        """Forget the cached document so the next call validates in full."""
+        self._fingerprints.clear()
+        self._digests.clear()
+        self._results.clear()
+        self._base = None
+        self._exact = True
+
+    async def _run_full(self, content: str) -> None:
+        report = await self._validate(content)
+        self._results = {rule: [] for rule in RULE_INPUTS}
+        unknown: list[dict] = []
+        for result in report.get("results", []):
+            key = rule_key(result)
+            if key is None:
+                unknown.append(result)
+            else:
+                self._results[key].append(result)
+        self._results["_other"] = unknown
+        self._exact = not unknown
+        self._base = {k: v for k, v in report.items() if k != "results"}
+
+    async def _run_partial(self, sections: list[Section], stale: list[str]) -> bool:
+        kinds = set(HEADER_KINDS).union(*(RULE_INPUTS[r] for r in stale))
+        projected = "".join(s.text for s in sections if s.kind in kinds)
+        try:
+            report = await self._validate(projected)
+        except Exception:
+            return False
+        fresh: dict[str, list[dict]] = {rule: [] for rule in stale}
+        for result in report.get("results", []):
+            key = rule_key(result)
+            if key in fresh:
+                fresh[key].append(result)
+        self._results.update(fresh)
+        return True
+
+    def _merged(self) -> dict:
+        results = [r for rule in (*RULE_INPUTS, "_other") for r in self._results.get(rule, [])]
+        report = dict(self._base or {})
+        report["results"] = results
+        report["error_count"] = sum(1 for r in results if r.get("severity") == "error")
+        report["warning_count"] = sum(1 for r in results if r.get("severity") == "warning")
+        return report
+
+
+def _fingerprint(rule: str, sections: list[Section]) -> str:
+    kinds = RULE_INPUTS[rule] | _GLOBAL_INPUTS
+    h = hashlib.sha256()
+    for section in sections:
+        if section.kind in kinds:
+            h.update(section.name.encode("utf-8"))
+            h.update(section.digest.encode("ascii"))
+    return h.hexdigest()
@@ -0,0 +1,180 @@
+"""PBN text helpers: board splitting, renumbering and LIN conversion.
+
+Pure text processing, independent of bbdsl, shared by the streaming
+PBN/LIN export and the non-streaming LIN fallback.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+_BOARD_TAG_RE = re.compile(r'^\[Board\s+"[^"]*"\]', re.MULTILINE)
+_DEALER_TAG_RE = re.compile(r'^\[Dealer\s+"[^"]*"\]', re.MULTILINE)
+_VUL_TAG_RE = re.compile(r'^\[(?:Vulnerable|Vul)\s+"[^"]*"\]', re.MULTILINE)
+_LIN_BOARD_RE = re.compile(r"(?<![^|])ah\|Board [^|]*\|")
+_LIN_ROOM_RE = re.compile(r"(?<![^|])qx\|([oc])[^|,]*")
+_LIN_DEALER_RE = re.compile(r"(?<![^|])md\|\d")
+_LIN_VUL_RE = re.compile(r"(?<![^|])sv\|[^|]*\|")
+_TAG_RE = re.compile(r'^\[(\w+)\s+"([^"]*)"\]')
+
+# PBN vulnerability -> LIN ``sv`` code
+_LIN_VUL = {
+    "None": "o", "NS": "n", "EW": "e", "All": "b",
+    "Love": "o", "Both": "b",
+}
+_LIN_DEALER = {"N": "1", "E": "2", "S": "3", "W": "4"}
+
+# Standard duplicate rotation, indexed by (board - 1) % 16
+_VUL_CYCLE = (
+    "None", "NS", "EW", "All", "NS", "EW", "All", "None",
+    "EW", "All", "None", "NS", "All", "None", "NS", "EW",
+)
+
+PBN_HEADER = "% PBN 2.1\n% EXPORT\n"
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """Return the RNG seed of chunk/shard *index* derived from *seed*.
+
+    Index 0 keeps *seed* itself, so a single-chunk run reproduces the
+    plain exporter output; other indexes get independent 31-bit seeds.
+    """
+    if index == 0:
+        return seed
+    digest = hashlib.sha256(f"{seed}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:4], "big") & 0x7FFFFFFF
+
+
+def split_pbn(pbn_text: str) -> tuple[str, list[str]]:
+    """Split PBN text into its leading ``%`` header and board records.
+
+    Returns:
+        ``(header, boards)``: the header block (possibly empty, with a
+        trailing newline) and one string per board, without separators.
+    """
+    header_lines: list[str] = []
+    boards: list[str] = []
+    current: list[str] = []
+    for raw_line in pbn_text.splitlines():
+        line = raw_line.rstrip()
+        if not line:
+            if current:
+                boards.append("\n".join(current))
+                current = []
+            continue
+        if line.startswith("%") and not current and not boards:
+            header_lines.append(line)
+            continue
+        current.append(line)
+    if current:
+        boards.append("\n".join(current))
+    header = "\n".join(header_lines) + "\n" if header_lines else ""
+    return header, boards
+
+
+def board_dealer(board: int) -> str:
+    """Dealer of *board* under the standard N, E, S, W rotation."""
+    return "NESW"[(board - 1) % 4]
+
+
+def board_vulnerability(board: int) -> str:
+    """PBN vulnerability of *board* under the standard 16-board cycle."""
+    return _VUL_CYCLE[(board - 1) % 16]
+
+
+def format_board(board: int, deal: str, event: str = "BBDSL Practice") -> str:
+    """Build a PBN record for *board* from a ``Deal`` tag value."""
+    return "\n".join(
+        (
+            f'[Event "{event}"]',
+            f'[Board "{board}"]',
+            f'[Dealer "{board_dealer(board)}"]',
+            f'[Vulnerable "{board_vulnerability(board)}"]',
+            f'[Deal "{deal}"]',
+        )
+    )
+
+
+def _set_tag(record: str, pattern: re.Pattern, tag: str) -> str:
+    if pattern.search(record):
+        return pattern.sub(lambda _: tag, record, count=1)
+    return f"{tag}\n{record}"
+
+
+def renumber_board(record: str, board: int) -> str:
+    """Make a PBN record board *board*: its Board, Dealer and Vulnerable tags."""
+    record = _set_tag(record, _VUL_TAG_RE, f'[Vulnerable "{board_vulnerability(board)}"]')
+    record = _set_tag(record, _DEALER_TAG_RE, f'[Dealer "{board_dealer(board)}"]')
+    return _set_tag(record, _BOARD_TAG_RE, f'[Board "{board}"]')
+
+
+def renumber_lin_board(line: str, board: int) -> str:
+    """Make a LIN board line board *board*: its number, dealer and vulnerability.
+
+    Rewrites the ``ah|Board n|`` and ``qx|`` board labels, the dealer
+    digit of ``md|`` and the ``sv|`` code, adding ``ah`` and ``sv`` when
+    the line has none.
+    """
+    dealer = _LIN_DEALER[board_dealer(board)]
+    vul = f"sv|{_LIN_VUL[board_vulnerability(board)]}|"
+    line = _LIN_DEALER_RE.sub(lambda _: f"md|{dealer}", line, count=1)
+    line = _LIN_ROOM_RE.sub(lambda m: f"qx|{m.group(1)}{board}", line, count=1)
+    if _LIN_VUL_RE.search(line):
+        line = _LIN_VUL_RE.sub(lambda _: vul, line, count=1)
+    else:
+        line = line + vul if line.endswith("|") or not line else f"{line}|{vul}"
+    if _LIN_BOARD_RE.search(line):
+        return _LIN_BOARD_RE.sub(lambda _: f"ah|Board {board}|", line, count=1)
+    return f"{line}ah|Board {board}|"
+
+
+def pbn_board_to_lin(record: str) -> str:
+    """Convert one PBN board record to a basic LIN line.
+
+    This is a simplified conversion for HandViewer embedding.
+    """
+    tags: dict[str, str] = {}
+    for line in record.splitlines():
+        match = _TAG_RE.match(line.strip())
+        if match:
+            tags.setdefault(match.group(1), match.group(2))
+
+    vul = tags.get("Vulnerable", tags.get("Vul", ""))
+    lin_parts = [
+        f"pn|{tags.get('Event') or 'N,E,S,W'}",
+        "st||",
+        f"md|{pbn_deal_to_lin_md(tags.get('Deal', ''), tags.get('Dealer', ''))}",
+        f"sv|{_LIN_VUL.get(vul, 'o')}",
+    ]
+    if tags.get("Board"):
+        lin_parts.append(f"ah|Board {tags['Board']}")
+    lin_parts.append("mb|")  # no bidding sequence in static export
+    return "|".join(lin_parts) + "|"
+
+
+def pbn_to_lin(pbn_text: str) -> str:
+    """Convert PBN text to LIN, one line per board."""
+    _, boards = split_pbn(pbn_text)
+    return "\n".join(pbn_board_to_lin(record) for record in boards)
+
+
+def pbn_deal_to_lin_md(deal_str: str, dealer: str = "N") -> str:
+    """Convert PBN deal string to LIN md (make deal) format.
+
+    PBN deal: 'N:AK.QJ.T98.7654 ...'
+    LIN md: dealer_num + hands
+    """
+    dealer_num = _LIN_DEALER.get(dealer, "1")
+
+    if not deal_str:
+        return dealer_num
+
+    # Remove initial dealer indicator if present
+    if ":" in deal_str:
+        deal_str = deal_str.split(":", 1)[1]
+
+    # PBN hands are S.H.D.C with dots; LIN uses the same SHDC order
+    # without separators.
+    lin_hands = ["".join(hand.split(".")) for hand in deal_str.strip().split()]
+    return dealer_num + ",".join(lin_hands)
@@ -0,0 +1,152 @@
+"""Rating aggregates stored on the convention.
+
+Each convention carries ``rating_sum``, ``rating_count``, ``rating_avg``
+and a histogram (``rating_1`` … ``rating_5``), so rating statistics are
+a single-row read and listings can sort by rating through an index.
+:func:`record_rating` applies one rating change as a relative
+``UPDATE`` in the transaction that writes the rating row, so concurrent
+raters never overwrite each other's counts.  :func:`repair_rating_aggregates`
+recomputes them from the ``ratings`` rows.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Float, case, cast, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.convention import Convention
+from app.models.rating import Rating
+
+logger = logging.getLogger(__name__)
+
+SCORES = range(1, 6)
+HISTOGRAM = {score: getattr(Convention, f"rating_{score}") for score in SCORES}
+
+
+def _average(total, count):
+    return case((count > 0, cast(total, Float) / count), else_=0.0)
+
+
+async def record_rating(
+    db: AsyncSession, convention_id: int, old_score: int | None, new_score: int
+) -> None:
+    """Fold a new rating (*old_score* None) or a re-rating into the aggregates."""
+    if old_score == new_score:
+        return
+    delta_sum = new_score - (old_score or 0)
+    delta_count = 0 if old_score is not None else 1
+    values = {
+        Convention.rating_sum: Convention.rating_sum + delta_sum,
+        Convention.rating_count: Convention.rating_count + delta_count,
+        # SET expressions see the old row, so the average is taken of the new totals.
+        Convention.rating_avg: _average(
+            Convention.rating_sum + delta_sum, Convention.rating_count + delta_count
+        ),
+        HISTOGRAM[new_score]: HISTOGRAM[new_score] + 1,
+    }
+    if old_score is not None:
+        values[HISTOGRAM[old_score]] = HISTOGRAM[old_score] - 1
+    await db.execute(
+        update(Convention)
+        .where(Convention.id == convention_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def histogram(row) -> list[int]:
+    """Counts of 1…5-star ratings from a row holding the histogram columns."""
+    return [getattr(row, f"rating_{score}") for score in SCORES]
+
+
+def _recomputed_values() -> dict:
+    """SET clause recomputing a convention's aggregates from its ratings."""
+
+    def of_ratings(expr):
+        return (
+            select(func.coalesce(expr, 0))
+            .where(Rating.convention_id == Convention.id)
+            .scalar_subquery()
+        )
+
+    total, count = of_ratings(func.sum(Rating.score)), of_ratings(func.count())
+    values = {
+        Convention.rating_sum: total,
+        Convention.rating_count: count,
+        Convention.rating_avg: _average(total, count),
+    }
+    for score, column in HISTOGRAM.items():
+        values[column] = of_ratings(func.sum(case((Rating.score == score, 1), else_=0)))
+    return values
+
+
+async def repair_rating_aggregates(batch_size: int = 500) -> int:
+    """Recompute the aggregates that disagree with the ``ratings`` rows.
+
+    Conventions are checked in id batches; wrong ones are rewritten by an
+    ``UPDATE`` that recounts their ratings itself.  Returns how many were
+    repaired.
+    """
+    stored = [Convention.rating_sum, Convention.rating_count, *HISTOGRAM.values()]
+    repaired, after = 0, 0
+    while True:
+        async with async_session() as db:
+            ids = list(
+                (
+                    await db.execute(
+                        select(Convention.id)
+                        .where(Convention.id > after)
+                        .order_by(Convention.id)
+                        .limit(batch_size)
+                    )
+                ).scalars()
+            )
+            if not ids:
+                return repaired
+            actual = (
+                select(
+                    Rating.convention_id,
+                    func.sum(Rating.score).label("total"),
+                    func.count().label("count"),
+                    *(
+                        func.sum(case((Rating.score == s, 1), else_=0)).label(f"rating_{s}")
+                        for s in SCORES
+                    ),
+                )
+                .where(Rating.convention_id.in_(ids))
+                .group_by(Rating.convention_id)
+                .subquery()
+            )
+            expected = [actual.c.total, actual.c.count]
+            expected += [actual.c[f"rating_{s}"] for s in SCORES]
+            mismatch = or_(
+                *(column != func.coalesce(value, 0) for column, value in zip(stored, expected)),
+                func.abs(
+                    Convention.rating_avg
+                    - _average(Convention.rating_sum, Convention.rating_count)
+                )
+                > 1e-9,
+            )
+            wrong = list(
+                (
+                    await db.execute(
+                        select(Convention.id)
+                        .outerjoin(actual, actual.c.convention_id == Convention.id)
+                        .where(Convention.id.in_(ids), mismatch)
+                    )
+                ).scalars()
+            )
+            if wrong:
+                await db.execute(
+                    update(Convention)
+                    .where(Convention.id.in_(wrong))
+                    .values(_recomputed_values())
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        repaired += len(wrong)
+        after = ids[-1]
+        logger.info("Rating aggregates: checked up to id %d, %d repaired", after, repaired)
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Awaitable, Callable
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import async_session
 from app.models.convention import Convention
 from app.models.namespace import Namespace
+from app.services.diff_service import SystemSource, inline_source
 
 # Simple SemVer pattern  (major.minor.patch with optional pre-release)
 SEMVER_RE = re.compile(
@@ -77,3 +80,65 @@ async def user_owns_namespace(
         )
     )
     return result.scalar_one_or_none() is not None
+
+
+def yaml_loader(db: AsyncSession, conv_id: int) -> Callable[[], Awaitable[str]]:
+    """Loader of a convention's YAML for the content-addressed caches.
+
+    The caches call it only on a miss.  It reads through the request's
+    session, so unlike the loader of :func:`resolve_source` it must not
+    outlive the request.
+    """
+
+    async def load() -> str:
+        result = await db.execute(
+            select(Convention.yaml_content).where(Convention.id == conv_id)
+        )
+        return result.scalar_one()
+
+    return load
+
+
+async def resolve_source(
+    db: AsyncSession,
+    conv_id: int | None = None,
+    namespace: str | None = None,
+    version: str | None = None,
+) -> SystemSource | None:
+    """Resolve a convention reference (id, or namespace + version) for diffing.
+
+    Only the content hash is read here; the YAML is loaded later, in its
+    own session, and only if no cached result covers it.  Returns None
+    if the convention does not exist.
+    """
+    stmt = select(Convention.id, Convention.content_sha256)
+    if conv_id is not None:
+        stmt = stmt.where(Convention.id == conv_id)
+    else:
+        stmt = stmt.where(Convention.namespace == namespace, Convention.version == version)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None
+    if row.content_sha256 is None:  # stored before hashes were recorded
+        result = await db.execute(
+            select(Convention.yaml_content).where(Convention.id == row.id)
+        )
+        return inline_source(result.scalar_one())
+
+    found_id, sha256 = row.id, row.content_sha256
+
+    async def load() -> str:
+        async with async_session() as session:
+            # Pinned to the hash: an edit in the meantime fails the load
+            # instead of computing a report under the old hash.
+            result = await session.execute(
+                select(Convention.yaml_content).where(
+                    Convention.id == found_id, Convention.content_sha256 == sha256
+                )
+            )
+            content = result.scalar_one_or_none()
+        if content is None:
+            raise ValueError(f"Convention {found_id} changed while being compared")
+        return content
+
+    return SystemSource(sha256, load, stored=True)
@@ -0,0 +1,328 @@
+"""Registry-wide bulk revalidation against the installed bbdsl.
+
+A run walks every row of its source tables (``conventions`` and
+optionally ``drafts`` / ``shares``) in id order, validates the YAML in
+the worker pool and records one ``revalidation_results`` row per stored
+row.  Results, counters and the per-table cursor are committed together
+after each batch, so a run interrupted at any point resumes after the
+last committed row.
+
+A run is claimed in the database by a conditional ``UPDATE`` of its
+status, so at most one process (API worker or CLI) executes it.  The
+owner refreshes ``heartbeat_at`` with every batch and only commits while
+the heartbeat is still the one it wrote; a "running" run whose heartbeat
+is older than ``revalidation_stale_seconds`` was abandoned by a dead
+process and can be claimed again.
+
+Rows are streamed: on PostgreSQL through a server-side cursor on a
+dedicated connection, on SQLite (where an open reader would block the
+batch commits) as keyset-paginated batches.  Either way only one batch
+of YAML is held in memory.  Reports go through :func:`validate_cached`,
+so identical YAML is validated once and later uploads reuse the report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+
+from app.core.config import settings
+from app.core.database import async_session, engine
+from app.models.convention import Convention
+from app.models.draft import Draft
+from app.models.revalidation import RevalidationResult, RevalidationRun
+from app.models.share import Share
+from app.services.bbdsl_service import BBDSL_VERSION, content_hash, pool
+from app.services.validation_service import validate_cached
+from app.services.worker_pool import PoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+SOURCES = {"conventions": Convention, "drafts": Draft, "shares": Share}
+
+
+class RevalidationError(RuntimeError):
+    """A run cannot be started or resumed in its current state."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stale_before() -> datetime:
+    return _now() - timedelta(seconds=settings.revalidation_stale_seconds)
+
+
+def is_active(run: RevalidationRun) -> bool:
+    """Whether a live process currently holds *run*."""
+    if run.status != "running" or run.heartbeat_at is None:
+        return False
+    heartbeat = run.heartbeat_at
+    if heartbeat.tzinfo is None:  # SQLite returns naive UTC
+        heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+    return heartbeat >= _stale_before()
+
+
+def rows_per_second(run: RevalidationRun) -> float:
+    """Throughput of *run* over the time it has actually been running."""
+    return run.processed / run.elapsed_seconds if run.elapsed_seconds else 0.0
+
+
+async def create_run(sources: list[str]) -> RevalidationRun:
+    """Record a new pending run over *sources*.
+
+    Raises:
+        ValueError: On an unknown source table.
+    """
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(unknown)}")
+    async with async_session() as db:
+        run = RevalidationRun(
+            bbdsl_version=BBDSL_VERSION,
+            sources=list(dict.fromkeys(sources)),
+            cursor={},
+        )
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+        return run
+
+
+async def get_run(run_id: int) -> RevalidationRun | None:
+    async with async_session() as db:
+        return await db.get(RevalidationRun, run_id)
+
+
+async def latest_unfinished_run() -> RevalidationRun | None:
+    """The most recent run that has not completed, if any."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(RevalidationRun)
+            .where(RevalidationRun.status != "completed")
+            .order_by(RevalidationRun.id.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+
+async def check_resumable(run_id: int) -> RevalidationRun:
+    """Return run *run_id* if it can be (re)started now.
+
+    Raises:
+        LookupError: If the run does not exist.
+        RevalidationError: If it is running, completed, or was started
+            under another bbdsl version.
+    """
+    run = await get_run(run_id)
+    if run is None:
+        raise LookupError(f"Revalidation run {run_id} not found")
+    if is_active(run):
+        raise RevalidationError(f"Run {run_id} is already running")
+    if run.status == "completed":
+        raise RevalidationError(f"Run {run_id} has already completed")
+    if run.bbdsl_version != BBDSL_VERSION:
+        raise RevalidationError(
+            f"Run {run_id} was started with bbdsl {run.bbdsl_version}; "
+            f"start a new run for {BBDSL_VERSION}"
+        )
+    return run
+
+
+async def _claim(run_id: int) -> datetime:
+    """Take run *run_id* for this process; returns the heartbeat written.
+
+    Raises:
+        LookupError, RevalidationError: If another process won the claim
+            or the run cannot be resumed (see :func:`check_resumable`).
+    """
+    heartbeat = _now()
+    RR = RevalidationRun
+    async with async_session() as db:
+        result = await db.execute(
+            update(RR)
+            .where(
+                RR.id == run_id,
+                RR.bbdsl_version == BBDSL_VERSION,
+                RR.status != "completed",
+                or_(
+                    RR.status != "running",
+                    RR.heartbeat_at.is_(None),
+                    RR.heartbeat_at < _stale_before(),
+                ),
+            )
+            .values(status="running", error=None, heartbeat_at=heartbeat)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    if result.rowcount != 1:
+        await check_resumable(run_id)  # raises the reason
+        raise RevalidationError(f"Run {run_id} is already running")
+    return heartbeat
+
+
+def _held(run_id: int, heartbeat: datetime):
+    return and_(RevalidationRun.id == run_id, RevalidationRun.heartbeat_at == heartbeat)
+
+
+async def _iter_batches(source: str, after: int, size: int) -> AsyncIterator[list]:
+    model = SOURCES[source]
+    stmt = select(model.id, model.yaml_content).order_by(model.id)
+    if engine.dialect.name == "sqlite":
+        while True:
+            async with async_session() as db:
+                rows = (await db.execute(stmt.where(model.id > after).limit(size))).all()
+            if not rows:
+                return
+            yield rows
+            after = rows[-1].id
+    else:
+        async with engine.connect() as conn:
+            result = await conn.stream(
+                stmt.where(model.id > after).execution_options(yield_per=size)
+            )
+            async for rows in result.partitions(size):
+                yield rows
+
+
+async def _validate(content: str) -> tuple[dict | None, str | None]:
+    while True:
+        try:
+            report, _ = await validate_cached(content)
+            return report, None
+        except PoolSaturatedError:
+            await asyncio.sleep(0.5)  # shared with live requests; wait for room
+        except Exception as exc:
+            return None, f"{type(exc).__name__}: {exc}"
+
+
+async def _process_batch(run_id: int, source: str, rows: list) -> list[RevalidationResult]:
+    # One row per worker at a time, like sharded diffs.
+    limit = asyncio.Semaphore(max(pool.processes, 1))
+
+    async def check(content: str) -> tuple[dict | None, str | None]:
+        async with limit:
+            return await _validate(content)
+
+    outcomes = await asyncio.gather(*(check(row.yaml_content) for row in rows))
+    results = []
+    for row, (report, error) in zip(rows, outcomes):
+        errors = report.get("error_count", 0) if report else 0
+        results.append(
+            RevalidationResult(
+                run_id=run_id,
+                source=source,
+                row_id=row.id,
+                content_sha256=content_hash(row.yaml_content),
+                valid=error is None and errors == 0,
+                error_count=errors,
+                warning_count=report.get("warning_count", 0) if report else 0,
+                error=error,
+            )
+        )
+    return results
+
+
+async def run_revalidation(
+    run_id: int,
+    batch_size: int | None = None,
+    on_progress: Callable[[RevalidationRun, str], None] | None = None,
+) -> RevalidationRun:
+    """Execute (or resume) run *run_id* to completion.
+
+    Args:
+        run_id: A run from :func:`create_run`.
+        batch_size: Rows read and committed at a time.
+        on_progress: Called with the updated run and the current source
+            table after every committed batch.
+
+    Raises:
+        LookupError, RevalidationError: See :func:`check_resumable`;
+            also if another process claims or takes over the run.
+    """
+    heartbeat = await _claim(run_id)
+    run = await get_run(run_id)
+    batch_size = batch_size or settings.revalidation_batch_size
+    try:
+        for source in run.sources:
+            after = int(run.cursor.get(source, 0))
+            async for rows in _iter_batches(source, after, batch_size):
+                started = time.perf_counter()
+                results = await _process_batch(run_id, source, rows)
+                async with async_session() as db:
+                    run = await db.get(RevalidationRun, run_id)
+                    db.add_all(results)
+                    previous, heartbeat = heartbeat, _now()
+                    written = await db.execute(
+                        update(RevalidationRun)
+                        .where(_held(run_id, previous))
+                        .values(
+                            cursor={**run.cursor, source: rows[-1].id},
+                            processed=RevalidationRun.processed + len(results),
+                            invalid=RevalidationRun.invalid
+                            + sum(not result.valid for result in results),
+                            elapsed_seconds=RevalidationRun.elapsed_seconds
+                            + (time.perf_counter() - started),
+                            heartbeat_at=heartbeat,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    if written.rowcount != 1:
+                        raise RevalidationError(f"Run {run_id} was taken over by another process")
+                    await db.commit()
+                run = await get_run(run_id)
+                if on_progress is not None:
+                    on_progress(run, source)
+        async with async_session() as db:
+            await db.execute(
+                update(RevalidationRun)
+                .where(_held(run_id, heartbeat))
+                .values(status="completed", finished_at=_now(), heartbeat_at=None)
+            )
+            await db.commit()
+        run = await get_run(run_id)
+        logger.info(
+            "Revalidation run %d: %d rows, %d invalid, %.1f rows/s",
+            run_id, run.processed, run.invalid, rows_per_second(run),
+        )
+        return run
+    except BaseException as exc:
+        # Cancellation and Ctrl-C leave a resumable "interrupted" run.
+        status = "failed" if isinstance(exc, Exception) else "interrupted"
+        async with async_session() as db:
+            # Only the holder records the outcome; a run taken over stays as is.
+            await db.execute(
+                update(RevalidationRun)
+                .where(_held(run_id, heartbeat))
+                .values(
+                    status=status, error=f"{type(exc).__name__}: {exc}", heartbeat_at=None
+                )
+            )
+            await db.commit()
+        if isinstance(exc, Exception):
+            logger.exception("Revalidation run %d failed", run_id)
+        raise
+
+
+async def list_invalid(
+    run_id: int,
+    source: str | None = None,
+    after: int = 0,
+    limit: int = 100,
+) -> list[RevalidationResult]:
+    """Invalid results of *run_id* in (source, row id) order, after result id *after*."""
+    stmt = select(RevalidationResult).where(
+        RevalidationResult.run_id == run_id,
+        RevalidationResult.valid.is_(False),
+        RevalidationResult.id > after,
+    )
+    if source is not None:
+        stmt = stmt.where(RevalidationResult.source == source)
+    async with async_session() as db:
+        result = await db.execute(stmt.order_by(RevalidationResult.id).limit(limit))
+        return list(result.scalars())
@@ -0,0 +1,208 @@
+"""Full-text search over the registry.
+
+Every convention is indexed as three weighted fields:
+
+* ``title`` — name and namespace (highest weight),
+* ``summary`` — description and tags,
+* ``body`` — prose extracted from the YAML: system names and
+  descriptions in every locale, bid meanings, notes, convention ids.
+
+PostgreSQL keeps them in the ``conventions.search_vector`` tsvector
+(GIN-indexed, weights A/B/C, ranked with ``ts_rank_cd``); SQLite in the
+FTS5 table ``conventions_fts`` (ranked with ``bm25``).  Both use a
+language-neutral tokenizer, and CJK text is indexed one character per
+token (queries become phrases of consecutive characters) so that
+zh-TW words match without a segmenter.
+
+The index is written in the same transaction as the convention, by
+:func:`index_convention` / :func:`unindex_convention`.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+import yaml
+from sqlalchemy import Float, Subquery, bindparam, column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.convention import Convention
+
+logger = logging.getLogger(__name__)
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# YAML keys whose string values (in any locale) are searchable prose.
+_TEXT_KEYS = frozenset(
+    {"name", "title", "description", "summary", "notes", "note", "comment", "example", "id"}
+)
+_MAX_BODY_CHARS = 32_000
+_CJK = "぀-ヿ㐀-䶿一-鿿豈-﫿가-힯"
+_CJK_CHAR_RE = re.compile(f"([{_CJK}])")
+# CJK runs, and words without CJK in them: "stayman斯台曼" is split the
+# way _segment splits it for the index.
+_TERM_RE = re.compile(f"[{_CJK}]+|[^\\W_{_CJK}]+")
+_MAX_TERMS = 16
+
+# Relevance weights of (title, summary, body) for SQLite's bm25().
+_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+# The hidden column named after an FTS5 table matches against all its columns.
+_fts = table("conventions_fts", column("rowid"), column("conventions_fts"))
+_conventions = table("conventions", column("id"), column("search_vector"))
+
+
+def _segment(text_: str) -> str:
+    """Space out CJK characters so each is a token."""
+    return _CJK_CHAR_RE.sub(r" \1 ", text_)
+
+
+def _collect(node, under_text_key: bool, out: list[str]) -> None:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            _collect(value, under_text_key or key in _TEXT_KEYS, out)
+    elif isinstance(node, list):
+        for item in node:
+            _collect(item, under_text_key, out)
+    elif under_text_key and isinstance(node, str):
+        out.append(node)
+
+
+def yaml_search_text(content: str) -> str:
+    """Searchable prose of a BBDSL document ("" if it does not parse)."""
+    try:
+        doc = yaml.load(content, Loader=_YAML_LOADER)
+    except yaml.YAMLError:
+        return ""
+    parts: list[str] = []
+    _collect(doc, False, parts)
+    return " ".join(dict.fromkeys(parts))[:_MAX_BODY_CHARS]
+
+
+def search_fields(conv: Convention) -> tuple[str, str, str]:
+    """``(title, summary, body)`` texts indexed for *conv*."""
+    title = f"{conv.name} {conv.namespace.replace('/', ' ')}"
+    summary = " ".join(filter(None, [conv.description, (conv.tags or "").replace(",", " ")]))
+    body = yaml_search_text(conv.yaml_content)
+    return _segment(title), _segment(summary), _segment(body)
+
+
+def query_terms(q: str) -> list[str]:
+    """Search terms of *q*: words, and CJK runs (matched as phrases)."""
+    return _TERM_RE.findall(q.lower())[:_MAX_TERMS]
+
+
+def _fts5_query(terms: list[str]) -> str:
+    parts = []
+    for i, term in enumerate(terms):
+        if _CJK_CHAR_RE.match(term):
+            parts.append('"' + " ".join(term) + '"')
+        elif i == len(terms) - 1:
+            parts.append(f'"{term}"*')  # the word being typed
+        else:
+            parts.append(f'"{term}"')
+    return " ".join(parts)
+
+
+def _tsquery(terms: list[str]) -> str:
+    parts = []
+    for i, term in enumerate(terms):
+        if _CJK_CHAR_RE.match(term):
+            parts.append("(" + " <-> ".join(term) + ")")
+        elif i == len(terms) - 1:
+            parts.append(f"{term}:*")
+        else:
+            parts.append(term)
+    return " & ".join(parts)
+
+
+def supports_search(db: AsyncSession) -> bool:
+    return db.bind.dialect.name in ("sqlite", "postgresql")
+
+
+async def index_convention(db: AsyncSession, conv: Convention) -> None:
+    """(Re)index *conv* in the session's transaction; call after a flush."""
+    dialect = db.bind.dialect.name
+    title, summary, body = search_fields(conv)
+    if dialect == "sqlite":
+        await db.execute(text("DELETE FROM conventions_fts WHERE rowid = :id"), {"id": conv.id})
+        await db.execute(
+            text(
+                "INSERT INTO conventions_fts (rowid, title, summary, body) "
+                "VALUES (:id, :title, :summary, :body)"
+            ),
+            {"id": conv.id, "title": title, "summary": summary, "body": body},
+        )
+    elif dialect == "postgresql":
+        await db.execute(
+            text(
+                "UPDATE conventions SET search_vector = "
+                "setweight(to_tsvector('simple', :title), 'A') || "
+                "setweight(to_tsvector('simple', :summary), 'B') || "
+                "setweight(to_tsvector('simple', :body), 'C') "
+                "WHERE id = :id"
+            ),
+            {"id": conv.id, "title": title, "summary": summary, "body": body},
+        )
+
+
+async def unindex_convention(db: AsyncSession, conv_id: int) -> None:
+    """Drop a deleted convention from the index (PostgreSQL: with its row)."""
+    if db.bind.dialect.name == "sqlite":
+        await db.execute(text("DELETE FROM conventions_fts WHERE rowid = :id"), {"id": conv_id})
+
+
+def ranked_matches(db: AsyncSession, q: str) -> Subquery | None:
+    """Conventions matching *q* as a subquery of ``(id, rank)``.
+
+    Higher ranks are better.  Returns None when *q* has no terms or the
+    backend has no search index (callers fall back to substring search).
+    """
+    terms = query_terms(q)
+    if not terms or not supports_search(db):
+        return None
+    if db.bind.dialect.name == "sqlite":
+        bm25 = func.bm25(text("conventions_fts"), *_BM25_WEIGHTS, type_=Float)
+        return (
+            select(_fts.c.rowid.label("id"), (-bm25).label("rank"))
+            .where(_fts.c.conventions_fts.op("MATCH")(bindparam("fts_q", _fts5_query(terms))))
+            .subquery("search_matches")
+        )
+    query = func.to_tsquery(text("'simple'"), bindparam("ts_q", _tsquery(terms)))
+    return (
+        select(
+            _conventions.c.id,
+            func.ts_rank_cd(_conventions.c.search_vector, query, type_=Float).label("rank"),
+        )
+        .where(_conventions.c.search_vector.op("@@")(query))
+        .subquery("search_matches")
+    )
+
+
+async def reindex_all(batch_size: int = 200) -> int:
+    """Rebuild the index of every convention; returns the number indexed."""
+    indexed, after = 0, 0
+    while True:
+        async with async_session() as db:
+            if not supports_search(db):
+                return 0
+            batch = list(
+                (
+                    await db.execute(
+                        select(Convention)
+                        .where(Convention.id > after)
+                        .order_by(Convention.id)
+                        .limit(batch_size)
+                    )
+                ).scalars()
+            )
+            if not batch:
+                return indexed
+            for conv in batch:
+                await index_convention(db, conv)
+            await db.commit()
+        indexed += len(batch)
+        after = batch[-1].id
+        logger.info("Search index: %d conventions indexed", indexed)
@@ -0,0 +1,158 @@
+"""Similar-systems search over stored structural fingerprints.
+
+Fingerprints are computed when a convention version is published
+(background task) or on first lookup, and stored with their LSH band
+keys.  Publishing a version only inserts its own rows, so the index
+grows incrementally.  A query reads the buckets its own keys fall into,
+ranks the systems sharing the most bands (at most
+``similar_max_candidates``) by estimated similarity, and never touches
+the rest of the registry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.convention import Convention
+from app.models.fingerprint import LshBucket, SystemFingerprint
+from app.services.bbdsl_service import content_hash
+from app.services.fingerprint import (
+    FINGERPRINT_VERSION,
+    band_keys,
+    fingerprint_content,
+    signature_from_bytes,
+    signature_to_bytes,
+    similarity,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_signature(sha256: str) -> np.ndarray | None:
+    async with async_session() as db:
+        result = await db.execute(
+            select(SystemFingerprint.signature).where(
+                SystemFingerprint.content_sha256 == sha256,
+                SystemFingerprint.fingerprint_version == FINGERPRINT_VERSION,
+            )
+        )
+        data = result.scalar_one_or_none()
+    return None if data is None else signature_from_bytes(data)
+
+
+async def build_fingerprint(content: str) -> np.ndarray:
+    """Fingerprint *content* off the event loop and store it with its buckets.
+
+    Raises:
+        ValueError: If *content* is not a YAML mapping.
+    """
+    signature, shingle_count = await asyncio.to_thread(fingerprint_content, content)
+    sha256 = content_hash(content)
+    async with async_session() as db:
+        db.add(
+            SystemFingerprint(
+                content_sha256=sha256,
+                fingerprint_version=FINGERPRINT_VERSION,
+                signature=signature_to_bytes(signature),
+                shingle_count=shingle_count,
+            )
+        )
+        db.add_all(
+            LshBucket(
+                content_sha256=sha256,
+                fingerprint_version=FINGERPRINT_VERSION,
+                band=band,
+                bucket=key,
+            )
+            for band, key in enumerate(band_keys(signature))
+        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()  # stored concurrently
+    return signature
+
+
+async def ensure_fingerprint(content: str) -> None:
+    """Fingerprint and index *content* unless already done (publish task)."""
+    if await _load_signature(content_hash(content)) is not None:
+        return
+    try:
+        await build_fingerprint(content)
+    except Exception:
+        logger.exception("Fingerprint build failed for %s", content_hash(content))
+
+
+async def find_similar(
+    conv_id: int,
+    sha256: str,
+    load_content: Callable[[], Awaitable[str]],
+    limit: int = 10,
+    exclude_namespace: str | None = None,
+) -> list[tuple[object, float]]:
+    """Return ``(convention row, similarity)`` pairs nearest to a convention.
+
+    Rows carry ``id``, ``name``, ``namespace``, ``version`` and
+    ``downloads``.  The convention itself, and conventions in
+    *exclude_namespace*, are left out.
+
+    Raises:
+        ValueError: If the convention's YAML cannot be fingerprinted.
+    """
+    signature = await _load_signature(sha256)
+    if signature is None:
+        signature = await build_fingerprint(await load_content())
+    keys = band_keys(signature)
+    hits = func.count().label("hits")
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(LshBucket.content_sha256, hits)
+            .where(
+                LshBucket.fingerprint_version == FINGERPRINT_VERSION,
+                or_(*(
+                    and_(LshBucket.band == band, LshBucket.bucket == key)
+                    for band, key in enumerate(keys)
+                )),
+            )
+            .group_by(LshBucket.content_sha256)
+            .order_by(hits.desc())
+            .limit(settings.similar_max_candidates)
+        )
+        candidates = [row.content_sha256 for row in result]
+        if not candidates:
+            return []
+
+        result = await db.execute(
+            select(SystemFingerprint.content_sha256, SystemFingerprint.signature).where(
+                SystemFingerprint.content_sha256.in_(candidates),
+                SystemFingerprint.fingerprint_version == FINGERPRINT_VERSION,
+            )
+        )
+        scores = {
+            row.content_sha256: similarity(signature, signature_from_bytes(row.signature))
+            for row in result
+        }
+
+        stmt = select(
+            Convention.id,
+            Convention.name,
+            Convention.namespace,
+            Convention.version,
+            Convention.downloads,
+            Convention.content_sha256,
+        ).where(Convention.content_sha256.in_(candidates), Convention.id != conv_id)
+        if exclude_namespace is not None:
+            stmt = stmt.where(Convention.namespace != exclude_namespace)
+        rows = (await db.execute(stmt)).all()
+
+    ranked = sorted(rows, key=lambda r: (-scores.get(r.content_sha256, 0.0), -r.downloads, r.id))
+    return [(row, scores.get(row.content_sha256, 0.0)) for row in ranked[:limit]]
@@ -0,0 +1,87 @@
+"""Structural (bid-by-bid) comparison of two bidding systems.
+
+Walks the compiled auction tries of both systems in parallel and
+classifies every auction either defines as ``same`` / ``different``
+(defined by both, with equal or differing meanings) or ``only_a`` /
+``only_b``.  No hands are dealt, so a comparison costs a trie walk; the
+simulated comparison (:mod:`app.services.diff_service`) is a separate,
+optional phase.
+
+Cases use the same shape as simulated reports (``bid``, ``system_a``,
+``system_b``, ``status``), with ``bid`` holding the whole auction.
+"""
+
+from __future__ import annotations
+
+import json
+
+from app.services.auction_index import AuctionTrie, encode_bid
+
+STATUSES = ("same", "different", "only_a", "only_b")
+
+
+def _meaning(payload: dict | None) -> dict:
+    payload = payload or {}
+    return {k: payload[k] for k in ("meaning", "convention") if payload.get(k) is not None}
+
+
+def _text(payload: dict | None, locale: str) -> str:
+    meaning = (payload or {}).get("meaning")
+    if isinstance(meaning, dict):
+        text = meaning.get("description")
+        if isinstance(text, dict):
+            text = text.get(locale) or text.get("en") or next(iter(text.values()), None)
+        if text:
+            return str(text)
+        rest = {k: v for k, v in meaning.items() if k != "description"}
+        if rest:
+            return json.dumps(rest, ensure_ascii=False, sort_keys=True, default=str)
+    if payload and payload.get("convention"):
+        return str(payload["convention"])
+    return ""
+
+
+def structural_diff(trie_a: AuctionTrie, trie_b: AuctionTrie, locale: str = "en") -> dict:
+    """Compare every auction of two systems without simulation.
+
+    Returns:
+        ``{"mode": "structural", "summary": {status: count, "total": n},
+        "diff_cases": [...]}`` with cases in auction order (depth first,
+        calls in bidding order).
+    """
+    cases: list[dict] = []
+    summary = dict.fromkeys(STATUSES, 0)
+    # (auction, node in A or None, node in B or None), reversed for pop().
+    stack: list[tuple[str, int | None, int | None]] = [("", 0, 0)]
+    while stack:
+        auction, node_a, node_b = stack.pop()
+        children_a = dict(trie_a.children(node_a)) if node_a is not None else {}
+        children_b = dict(trie_b.children(node_b)) if node_b is not None else {}
+        bids = sorted(children_a.keys() | children_b.keys(), key=encode_bid)
+        for bid in reversed(bids):
+            stack.append(
+                (f"{auction}-{bid}" if auction else bid, children_a.get(bid), children_b.get(bid))
+            )
+        if not auction:
+            continue
+        payload_a = trie_a.payloads[node_a] if node_a is not None else None
+        payload_b = trie_b.payloads[node_b] if node_b is not None else None
+        if node_b is None:
+            status = "only_a"
+        elif node_a is None:
+            status = "only_b"
+        elif _meaning(payload_a) == _meaning(payload_b):
+            status = "same"
+        else:
+            status = "different"
+        summary[status] += 1
+        cases.append(
+            {
+                "bid": auction,
+                "system_a": _text(payload_a, locale) if node_a is not None else None,
+                "system_b": _text(payload_b, locale) if node_b is not None else None,
+                "status": status,
+            }
+        )
+    summary["total"] = len(cases)
+    return {"mode": "structural", "summary": summary, "diff_cases": cases}
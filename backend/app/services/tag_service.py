@@ -0,0 +1,124 @@
+"""Normalized convention tags.
+
+``Convention.tags`` keeps the comma-separated string the author typed
+(it is what listings display); the ``tags`` / ``convention_tags``
+tables hold its normalized form for exact, indexed filtering and for
+the per-tag counts of ``GET /tags``.  :func:`set_convention_tags` keeps
+both in step and must run in the transaction that changes the string.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Select, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tag import ConventionTag, Tag
+
+MAX_TAG_LENGTH = 64
+
+
+def normalize_tag(tag: str) -> str:
+    """Canonical form of a tag: trimmed, lower-case, single-spaced."""
+    return " ".join(tag.split()).lower()
+
+
+def parse_tags(tags: str | None) -> list[str]:
+    """Distinct normalized tags of a comma-separated string, in order.
+
+    Raises:
+        ValueError: If a tag is longer than :data:`MAX_TAG_LENGTH`.
+    """
+    if not tags:
+        return []
+    names = list(dict.fromkeys(t for t in map(normalize_tag, tags.split(",")) if t))
+    for name in names:
+        if len(name) > MAX_TAG_LENGTH:
+            raise ValueError(f"Tags are limited to {MAX_TAG_LENGTH} characters: {name!r}")
+    return names
+
+
+def _insert_ignore(db: AsyncSession):
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(Tag).on_conflict_do_nothing(index_elements=["name"])
+    if dialect == "sqlite":
+        return sqlite.insert(Tag).on_conflict_do_nothing(index_elements=["name"])
+    return insert(Tag)
+
+
+async def _tag_ids(db: AsyncSession, names: list[str]) -> dict[str, int]:
+    rows = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+    return dict(rows.all())
+
+
+async def set_convention_tags(db: AsyncSession, convention_id: int, tags: str | None) -> None:
+    """Make the normalized tags of *convention_id* those of *tags*."""
+    wanted = parse_tags(tags)
+    current = dict(
+        (
+            await db.execute(
+                select(Tag.name, Tag.id)
+                .join(ConventionTag, ConventionTag.tag_id == Tag.id)
+                .where(ConventionTag.convention_id == convention_id)
+            )
+        ).all()
+    )
+    removed = [tag_id for name, tag_id in current.items() if name not in wanted]
+    added = [name for name in wanted if name not in current]
+
+    if removed:
+        await db.execute(
+            delete(ConventionTag).where(
+                ConventionTag.convention_id == convention_id,
+                ConventionTag.tag_id.in_(removed),
+            )
+        )
+        await db.execute(
+            update(Tag)
+            .where(Tag.id.in_(removed))
+            .values(convention_count=Tag.convention_count - 1)
+        )
+    if added:
+        await db.execute(
+            _insert_ignore(db), [{"name": name, "convention_count": 0} for name in added]
+        )
+        ids = list((await _tag_ids(db, added)).values())
+        await db.execute(
+            insert(ConventionTag),
+            [{"tag_id": tag_id, "convention_id": convention_id} for tag_id in ids],
+        )
+        await db.execute(
+            update(Tag).where(Tag.id.in_(ids)).values(convention_count=Tag.convention_count + 1)
+        )
+
+
+async def clear_convention_tags(db: AsyncSession, convention_id: int) -> None:
+    """Untag a convention that is about to be deleted."""
+    await set_convention_tags(db, convention_id, None)
+
+
+async def tagged_ids(db: AsyncSession, tags: list[str], match_all: bool) -> Select | None:
+    """Select of the ids of conventions carrying all (or any) of *tags*.
+
+    Returns None when no convention can match (an unknown tag under
+    ``match_all``, or no known tag at all).
+    """
+    names = list(dict.fromkeys(t for t in map(normalize_tag, tags) if t))
+    ids = list((await _tag_ids(db, names)).values())
+    if not ids or (match_all and len(ids) < len(names)):
+        return None
+    stmt = select(ConventionTag.convention_id).where(ConventionTag.tag_id.in_(ids))
+    if match_all and len(ids) > 1:
+        return stmt.group_by(ConventionTag.convention_id).having(func.count() == len(ids))
+    return stmt.distinct() if len(ids) > 1 else stmt
+
+
+async def tag_counts(db: AsyncSession, prefix: str | None, limit: int) -> list[tuple[str, int]]:
+    """``(name, convention_count)`` of the most used tags, optionally by prefix."""
+    stmt = select(Tag.name, Tag.convention_count).where(Tag.convention_count > 0)
+    if prefix:
+        escaped = normalize_tag(prefix).replace("\\", "\\\\").replace("%", r"\%")
+        stmt = stmt.where(Tag.name.like(escaped.replace("_", r"\_") + "%", escape="\\"))
+    stmt = stmt.order_by(Tag.convention_count.desc(), Tag.name).limit(limit)
+    return [(name, count) for name, count in (await db.execute(stmt)).all()]
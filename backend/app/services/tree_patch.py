@@ -0,0 +1,78 @@
+"""Bidding-tree patches for the editor's live preview.
+
+The preview channel keeps, per connection, the tree it last sent: a
+mapping of every auction the document defines (``"1NT-2C"``) to its
+node ``{"bid": "2C", "payload": {...}}``, where the payload is what the
+auction trie holds (meaning, convention, id…).  After each edit only the
+difference is pushed, as an RFC 6902 JSON Patch against the document
+``{"nodes": {...}}``::
+
+    {"type": "patch", "version": 3, "node_count": 412, "ops": [
+        {"op": "remove", "path": "/nodes/1NT-2D"},
+        {"op": "add", "path": "/nodes/1NT-2H", "value": {...}},
+        {"op": "replace", "path": "/nodes/1NT-2C", "value": {...}}]}
+
+The first patch (and the one after a resync) replaces ``/nodes``
+whole.  A node's parent is the auction without its last call; nodes are
+added in tree order, so parents always precede their children.
+"""
+
+from __future__ import annotations
+
+import json
+
+from app.services.auction_index import AuctionTrie
+
+
+def tree_nodes(trie: AuctionTrie) -> dict[str, dict]:
+    """Every auction of *trie*, in depth-first bidding order, with its node."""
+    nodes: dict[str, dict] = {}
+    stack: list[tuple[int, str]] = [(0, "")]
+    while stack:
+        node, auction = stack.pop()
+        if auction:
+            payload = trie.payloads[node] or {}
+            nodes[auction] = {
+                "bid": auction.rsplit("-", 1)[-1],
+                # YAML scalars (dates…) become strings, as in the JSON sent.
+                "payload": json.loads(json.dumps(payload, default=str)),
+            }
+        for bid, child in reversed(trie.children(node)):
+            stack.append((child, f"{auction}-{bid}" if auction else bid))
+    return nodes
+
+
+def _pointer(auction: str) -> str:
+    return "/nodes/" + auction.replace("~", "~0").replace("/", "~1")
+
+
+class TreePatcher:
+    """Turns successive trees into patches against what the client holds."""
+
+    def __init__(self) -> None:
+        self._sent: dict[str, dict] = {}
+        self._reset = True
+
+    def reset(self) -> None:
+        """Make the next patch replace the whole tree."""
+        self._reset = True
+
+    def message(self, version: int, nodes: dict[str, dict]) -> dict:
+        if self._reset:
+            ops = [{"op": "replace", "path": "/nodes", "value": nodes}]
+        else:
+            previous = self._sent
+            ops = [
+                {"op": "remove", "path": _pointer(auction)}
+                for auction in previous
+                if auction not in nodes
+            ]
+            for auction, node in nodes.items():
+                old = previous.get(auction)
+                if old is None:
+                    ops.append({"op": "add", "path": _pointer(auction), "value": node})
+                elif old != node:
+                    ops.append({"op": "replace", "path": _pointer(auction), "value": node})
+        self._sent = nodes
+        self._reset = False
+        return {"type": "patch", "version": version, "node_count": len(nodes), "ops": ops}
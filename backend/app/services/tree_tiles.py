@@ -0,0 +1,133 @@
+"""Level-of-detail SVG tiles of a bidding tree.
+
+A tile is the subtree below one auction prefix, cut off after a given
+number of calls.  Nodes whose children fall outside the tile are drawn
+as collapsed placeholders carrying the auction to request next
+(``data-auction``) and how many continuations are hidden
+(``data-children``), so a viewer can expand the tree on demand instead
+of loading a full system's multi-megabyte SVG.
+
+Tiles are rendered from the compiled auction trie
+(:mod:`app.services.auction_index`) and do not depend on bbdsl.
+"""
+
+from __future__ import annotations
+
+from xml.sax.saxutils import escape, quoteattr
+
+from app.services.auction_index import AuctionTrie, decode_bid, encode_bid
+
+NODE_WIDTH = 200
+NODE_HEIGHT = 28
+COLUMN_GAP = 40
+ROW_GAP = 8
+MARGIN = 10
+_LABEL_CHARS = 28
+
+
+def _description(payload: dict | None, locale: str) -> str:
+    meaning = (payload or {}).get("meaning")
+    if not isinstance(meaning, dict):
+        return ""
+    text = meaning.get("description", "")
+    if isinstance(text, dict):
+        text = text.get(locale) or text.get("en") or next(iter(text.values()), "")
+    text = str(text)
+    return text if len(text) <= _LABEL_CHARS else text[: _LABEL_CHARS - 1] + "…"
+
+
+def render_tile(
+    trie: AuctionTrie,
+    prefix: list[int],
+    depth: int,
+    locale: str = "en",
+) -> str:
+    """Render the subtree below *prefix*, *depth* calls deep, as SVG.
+
+    The root box shows the prefix itself (``"Openings"`` when empty).
+
+    Raises:
+        KeyError: If *prefix* is not an auction of the trie.
+    """
+    root = trie.find(prefix)
+    if root is None:
+        raise KeyError("-".join(decode_bid(code) for code in prefix))
+
+    # Lay out depth-first: leaves take consecutive rows, parents centre
+    # on their first and last child.
+    boxes: list[tuple[int, float, int, list[int]]] = []  # (node, row, level, path)
+    edges: list[tuple[int, int]] = []
+    next_row = 0
+
+    def place(node: int, level: int, path: list[int]) -> float:
+        nonlocal next_row
+        index = len(boxes)
+        boxes.append((node, 0.0, level, path))
+        children = trie.children(node) if level < depth else []
+        if not children:
+            row = float(next_row)
+            next_row += 1
+        else:
+            rows = []
+            for bid, child in children:
+                edges.append((index, len(boxes)))
+                rows.append(place(child, level + 1, path + [encode_bid(bid)]))
+            row = (rows[0] + rows[-1]) / 2
+        boxes[index] = (node, row, level, path)
+        return row
+
+    place(root, 0, list(prefix))
+
+    def position(row: float, level: int) -> tuple[float, float]:
+        return (
+            MARGIN + level * (NODE_WIDTH + COLUMN_GAP),
+            MARGIN + row * (NODE_HEIGHT + ROW_GAP),
+        )
+
+    levels = max(level for _, _, level, _ in boxes) + 1
+    width = 2 * MARGIN + levels * NODE_WIDTH + (levels - 1) * COLUMN_GAP
+    height = 2 * MARGIN + next_row * NODE_HEIGHT + (next_row - 1) * ROW_GAP
+    auction = "-".join(decode_bid(code) for code in prefix)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" class="bbdsl-tree-tile" '
+        f"data-prefix={quoteattr(auction)} data-depth=\"{depth}\">",
+        "<style>.bbdsl-node rect{fill:#fff;stroke:#4b5563}"
+        ".bbdsl-collapsed rect{fill:#f3f4f6;stroke-dasharray:4 2;cursor:pointer}"
+        "text{font:12px sans-serif;dominant-baseline:middle}"
+        "path{fill:none;stroke:#9ca3af}</style>",
+    ]
+    for parent, child in edges:
+        _, prow, plevel, _ = boxes[parent]
+        _, crow, clevel, _ = boxes[child]
+        px, py = position(prow, plevel)
+        cx, cy = position(crow, clevel)
+        px, py, cy = px + NODE_WIDTH, py + NODE_HEIGHT / 2, cy + NODE_HEIGHT / 2
+        mid = (px + cx) / 2
+        parts.append(f'<path d="M{px:g},{py:g} C{mid:g},{py:g} {mid:g},{cy:g} {cx:g},{cy:g}"/>')
+
+    for node, row, level, path in boxes:
+        x, y = position(row, level)
+        hidden = len(trie.children(node)) if level == depth else 0
+        label = "-".join(decode_bid(code) for code in path)
+        css = "bbdsl-node bbdsl-collapsed" if hidden else "bbdsl-node"
+        attrs = f"class={quoteattr(css)} data-auction={quoteattr(label)}"
+        if hidden:
+            attrs += f' data-children="{hidden}"'
+        bid = decode_bid(path[-1]) if path else "Openings"
+        text = _description(trie.payloads[node], locale) if path else ""
+        parts.append(
+            f'<g {attrs} transform="translate({x:g},{y:g})">'
+            f'<rect width="{NODE_WIDTH}" height="{NODE_HEIGHT}" rx="4"/>'
+            f'<text x="8" y="{NODE_HEIGHT / 2:g}" font-weight="bold">{escape(bid)}</text>'
+            f'<text x="48" y="{NODE_HEIGHT / 2:g}">{escape(text)}</text>'
+            + (
+                f'<text x="{NODE_WIDTH - 8}" y="{NODE_HEIGHT / 2:g}" '
+                f'text-anchor="end">+{hidden}</text>'
+                if hidden
+                else ""
+            )
+            + "</g>"
+        )
+    parts.append("</svg>")
+    return "".join(parts)
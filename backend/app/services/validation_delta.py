@@ -0,0 +1,158 @@
+"""Delta protocol (``?protocol=2``) of the validation WebSocket.
+
+Instead of the whole document on every keystroke, the client sends text
+edits against a buffer the server keeps per connection, and the server
+answers with only the diagnostics that appeared or disappeared since its
+previous answer.
+
+Client → server::
+
+    {"type": "sync", "version": 1, "text": "<whole document>"}
+    {"type": "edit", "base": 1, "version": 2, "length": 1234,
+     "changes": [{"offset": 10, "length": 3, "text": "xyz"}, ...]}
+
+``offset`` and ``length`` count UTF-16 code units, as editors in the
+browser do; changes are applied in order, each to the result of the
+previous one.  ``length`` (optional) is the document length after the
+edit and guards against drift.  An edit whose ``base`` is not the
+server's version, or that does not apply cleanly, is answered with
+``{"type": "resync", "version": <server version>}``; the client then
+sends a ``sync``.
+
+Server → client::
+
+    {"type": "diagnostics", "version": 2, "reset": false,
+     "added": [{"id": "...", "rule_id": ..., ...}], "removed": ["..."],
+     "summary": {"error_count": ..., "warning_count": ..., ...}}
+
+``reset`` answers a ``sync``: the client drops every diagnostic it holds
+before applying ``added``.  Also ``{"type": "error"|"superseded",
+"version": n}`` as in the plain protocol.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+
+
+class OutOfSyncError(ValueError):
+    """An edit does not apply to the server's buffer; a sync is needed."""
+
+
+def _is_bmp(text: str) -> bool:
+    return text.isascii() or max(text) <= "\uffff"
+
+
+def _utf16_index(text: str, offset: int) -> int:
+    """Index into *text* of the UTF-16 code unit *offset*."""
+    if _is_bmp(text):
+        if offset > len(text):
+            raise OutOfSyncError(f"Offset {offset} is outside the document")
+        return offset
+    units = 0
+    for index, char in enumerate(text):
+        if units >= offset:
+            break
+        units += 2 if char > "\uffff" else 1
+    else:
+        index = len(text)
+    if units < offset:
+        raise OutOfSyncError(f"Offset {offset} is outside the document")
+    if units > offset:
+        raise OutOfSyncError(f"Offset {offset} splits a surrogate pair")
+    return index
+
+
+def _utf16_length(text: str) -> int:
+    if _is_bmp(text):
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+class EditBuffer:
+    """The client's document as last synchronised, with its version."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.version: int | None = None
+
+    def sync(self, version: int, text: str) -> None:
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        self.text = text
+        self.version = version
+
+    def apply(self, base: int, version: int, changes: list[dict], length: int | None = None) -> str:
+        """Apply the edits *changes* made to version *base*.
+
+        Returns:
+            The new text, now at *version*.
+
+        Raises:
+            OutOfSyncError: If *base* is not the buffer's version or a
+                change does not fit the text; the buffer is unchanged.
+        """
+        if self.version is None or base != self.version:
+            raise OutOfSyncError(f"Edit is based on version {base}, buffer is at {self.version}")
+        text = self.text
+        for change in changes:
+            try:
+                offset, removed, inserted = change["offset"], change["length"], change["text"]
+            except (KeyError, TypeError):
+                raise OutOfSyncError("Malformed change") from None
+            if not isinstance(inserted, str) or not all(
+                isinstance(n, int) and n >= 0 for n in (offset, removed)
+            ):
+                raise OutOfSyncError("Malformed change")
+            start = _utf16_index(text, offset)
+            end = _utf16_index(text, offset + removed)
+            text = text[:start] + inserted + text[end:]
+        if length is not None and _utf16_length(text) != length:
+            raise OutOfSyncError("Document length differs after the edit")
+        self.text, self.version = text, version
+        return text
+
+
+def _diagnostic_ids(results: list[dict]) -> dict[str, dict]:
+    """Key every result by its content (plus an occurrence count for duplicates)."""
+    seen: Counter[str] = Counter()
+    keyed = {}
+    for item in results:
+        digest = hashlib.sha1(
+            json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()[:16]
+        keyed[f"{digest}.{seen[digest]}"] = item
+        seen[digest] += 1
+    return keyed
+
+
+class DiagnosticsDelta:
+    """Turns full reports into delta messages against what the client holds.
+
+    Call :meth:`reset` when the client resynchronises; the next
+    diagnostics message then carries every result with ``reset: true``.
+    """
+
+    def __init__(self) -> None:
+        self._sent: dict[str, dict] = {}
+        self._reset = True
+
+    def reset(self) -> None:
+        self._reset = True
+
+    def message(self, version: int, report: dict) -> dict:
+        current = _diagnostic_ids(report.get("results") or [])
+        previous = {} if self._reset else self._sent
+        message = {
+            "type": "diagnostics",
+            "version": version,
+            "reset": self._reset,
+            "added": [{"id": key, **item} for key, item in current.items() if key not in previous],
+            "removed": [key for key in previous if key not in current],
+            "summary": {k: v for k, v in report.items() if k != "results"},
+        }
+        self._sent = current
+        self._reset = False
+        return message
@@ -0,0 +1,100 @@
+"""Validation with a persisted report cache.
+
+Reports are stored in ``validation_reports`` keyed by (content SHA-256,
+bbdsl version, schema version).  Re-uploading identical YAML, or editing
+only a convention's metadata, reuses the stored report instead of
+re-running the validator.  Rows written by another bbdsl version never
+match the lookup key and are purged on startup.
+"""
+
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import async_session
+from app.models.validation import ValidationRecord
+from app.services.bbdsl_service import (
+    BBDSL_VERSION,
+    content_hash,
+    run_in_pool,
+    validate_yaml,
+)
+
+# Top-level ``bbdsl: "0.3"`` (or legacy ``bbdsl_version:``) declaration.
+_SCHEMA_VERSION_RE = re.compile(
+    r"""^bbdsl(?:_version)?\s*:\s*["']?([0-9A-Za-z.\-]+)""", re.MULTILINE
+)
+
+
+def schema_version(content: str) -> str:
+    """Return the BBDSL schema version declared by *content* ('' if none)."""
+    match = _SCHEMA_VERSION_RE.search(content)
+    return match.group(1)[:16] if match else ""
+
+
+async def get_stored_report(content: str) -> dict | None:
+    """Return the stored report for *content* under the current bbdsl, if any."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(ValidationRecord.report).where(
+                ValidationRecord.content_sha256 == content_hash(content),
+                ValidationRecord.bbdsl_version == BBDSL_VERSION,
+                ValidationRecord.schema_version == schema_version(content),
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def store_report(content: str, report: dict) -> None:
+    """Persist *report* for *content*; a concurrent identical insert is fine."""
+    async with async_session() as db:
+        db.add(
+            ValidationRecord(
+                content_sha256=content_hash(content),
+                bbdsl_version=BBDSL_VERSION,
+                schema_version=schema_version(content),
+                report=report,
+                error_count=report.get("error_count", 0),
+                warning_count=report.get("warning_count", 0),
+            )
+        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+
+
+async def validate_cached(content: str, store: bool = True) -> tuple[dict, bool]:
+    """Validate *content*, reading the persisted report cache first.
+
+    Args:
+        content: YAML text of a BBDSL document.
+        store: Persist a freshly computed report.  The editor WebSocket
+            passes False so intermediate keystrokes are not stored.
+
+    Returns:
+        ``(report, cached)`` where *cached* tells whether the report
+        came from the table.
+    """
+    report = await get_stored_report(content)
+    if report is not None:
+        return report, True
+    report = await run_in_pool(validate_yaml, content)
+    if store:
+        await store_report(content, report)
+    return report, False
+
+
+async def purge_stale_reports() -> int:
+    """Delete reports produced by a bbdsl version other than the installed one."""
+    async with async_session() as db:
+        result = await db.execute(
+            delete(ValidationRecord).where(
+                ValidationRecord.bbdsl_version != BBDSL_VERSION
+            )
+        )
+        await db.commit()
+        return result.rowcount or 0
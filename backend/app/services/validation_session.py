@@ -0,0 +1,164 @@
+"""Per-connection scheduling for the validation WebSocket.
+
+The editor sends the whole document on every change.  When documents
+arrive faster than they validate (a client whose debounce misfires, a
+burst after reconnecting), only the newest one matters.
+:class:`ValidationSession` therefore keeps at most one pending document
+per connection:
+
+* a document replaced while it waits for a slot is dropped before it
+  starts;
+* a validation superseded while it runs is left to finish (cancelling it
+  would kill the worker process running it) but its report is
+  discarded.
+
+Either way the client is told with a ``superseded`` message carrying the
+dropped document's sequence number.  Validations are limited per
+connection (``ws_validate_max_inflight``) and across every connection of
+the process (``ws_validate_max_concurrent``), so one tab cannot occupy
+all workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import weakref
+from collections.abc import Awaitable, Callable
+
+from app.core.config import settings
+
+# One global limiter per event loop (tests run several loops).
+_global_slots: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+
+
+def _global_limiter() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limiter = _global_slots.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(max(settings.ws_validate_max_concurrent, 1))
+        _global_slots[loop] = limiter
+    return limiter
+
+
+def parse_message(text: str) -> tuple[int | None, str]:
+    """Split a client message into ``(seq, yaml_text)``.
+
+    Clients either send the bare YAML text or a JSON envelope
+    ``{"seq": 12, "yaml": "..."}``; *seq* is None for bare text.
+    """
+    if text.lstrip().startswith("{"):
+        try:
+            envelope = json.loads(text)
+        except ValueError:
+            envelope = None
+        if isinstance(envelope, dict) and isinstance(envelope.get("yaml"), str):
+            seq = envelope.get("seq")
+            if isinstance(seq, bool) or not isinstance(seq, int):
+                seq = None
+            return seq, envelope["yaml"]
+    return None, text
+
+
+class ValidationSession:
+    """Latest-wins validation scheduler for one WebSocket connection.
+
+    Args:
+        validate: Coroutine function producing the report of a document.
+        send: Coroutine function sending one JSON message to the client.
+        max_inflight: Validations of this connection allowed to run at
+            once (default ``settings.ws_validate_max_inflight``).  Pass 1
+            when *validate* keeps state between calls.
+    """
+
+    def __init__(
+        self,
+        validate: Callable[[str], Awaitable[dict]],
+        send: Callable[[dict], Awaitable[None]],
+        max_inflight: int | None = None,
+    ) -> None:
+        self._validate = validate
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        limit = settings.ws_validate_max_inflight if max_inflight is None else max_inflight
+        self._inflight = asyncio.Semaphore(max(limit, 1))
+        self._received = 0  # documents received so far; orders them
+        self._pending: tuple[int, int, str] | None = None  # (order, seq, text)
+        self._ready = asyncio.Event()
+        self._running: set[asyncio.Task] = set()
+        self._closed = False
+        self.superseded = 0
+
+    async def submit(self, seq: int | None, content: str) -> None:
+        """Queue *content*, replacing any document still waiting to start.
+
+        Without a client *seq* the document's position on this
+        connection (starting at 1) is used.
+        """
+        self._received += 1
+        if seq is None:
+            seq = self._received
+        if self._pending is not None:
+            await self._superseded(self._pending[1])
+        self._pending = (self._received, seq, content)
+        self._ready.set()
+
+    async def run(self) -> None:
+        """Start pending documents as slots free up, until cancelled."""
+        limiter = _global_limiter()
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            await self._inflight.acquire()
+            try:
+                await limiter.acquire()
+            except BaseException:
+                self._inflight.release()
+                raise
+            # Take the document only now: whatever arrived while waiting
+            # for the slots has already replaced older ones.
+            pending, self._pending = self._pending, None
+            if pending is None:
+                limiter.release()
+                self._inflight.release()
+                continue
+            task = asyncio.create_task(self._run_one(*pending, limiter))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def close(self) -> None:
+        """Stop sending; running validations finish and are discarded."""
+        self._closed = True
+        self._pending = None
+
+    async def _run_one(
+        self, order: int, seq: int, content: str, limiter: asyncio.Semaphore
+    ) -> None:
+        try:
+            try:
+                message = {"status": "ok", "seq": seq, "report": await self._validate(content)}
+            except Exception as exc:
+                message = {"status": "error", "seq": seq, "message": str(exc)}
+        finally:
+            limiter.release()
+            self._inflight.release()
+        if order != self._received:
+            await self._superseded(seq)
+            return
+        await self.send(message)
+
+    async def _superseded(self, seq: int) -> None:
+        self.superseded += 1
+        await self.send({"status": "superseded", "seq": seq})
+
+    async def send(self, message: dict) -> None:
+        """Send *message* to the client, serialized with the reports."""
+        if self._closed:
+            return
+        async with self._send_lock:
+            try:
+                await self._send(message)
+            except Exception:
+                self.close()  # connection gone; the reader loop will notice
@@ -0,0 +1,268 @@
+"""Process pool for CPU-bound bbdsl work.
+
+Validation, export and diff are synchronous and can take seconds on
+large systems.  Running them on the event loop stalls every other
+request and WebSocket served by the same uvicorn worker, so the async
+endpoints hand them to this pool instead.
+
+Unlike :class:`concurrent.futures.ProcessPoolExecutor`, each worker is
+owned individually, which allows:
+
+* a per-call timeout that kills the worker running the runaway call,
+* recycling a worker after a fixed number of tasks, and
+* rejecting work up front once the wait queue is full.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+
+class WorkerPoolError(RuntimeError):
+    """Base class for errors raised by the pool itself (not by tasks)."""
+
+
+class PoolSaturatedError(WorkerPoolError):
+    """All workers are busy and the wait queue is full."""
+
+
+class TaskTimeoutError(WorkerPoolError):
+    """A task exceeded its timeout; the worker running it was killed."""
+
+
+class WorkerCrashedError(WorkerPoolError):
+    """The worker process died while running a task."""
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: receive ``(fn, args, kwargs)``, send back the outcome."""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        fn, args, kwargs = message
+        try:
+            outcome = ("ok", fn(*args, **kwargs))
+        except Exception as exc:
+            outcome = ("error", exc)
+        try:
+            conn.send(outcome)
+        except Exception as exc:  # result or exception not picklable
+            conn.send(("error", RuntimeError(f"{type(exc).__name__}: {exc}")))
+
+
+class _Worker:
+    """A single worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def call(self, fn: Callable, args: tuple, kwargs: dict) -> tuple[str, Any]:
+        """Blocking round trip; run in a thread so the loop stays free."""
+        self.conn.send((fn, args, kwargs))
+        return self.conn.recv()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class WorkerPool:
+    """Bounded pool of recyclable worker processes.
+
+    Args:
+        processes: Number of worker processes.  ``0`` runs tasks in a
+            thread of the current process instead (useful for tests and
+            single-core deployments); timeouts then cannot kill the task.
+        max_queue: Tasks allowed to wait for a free worker before
+            :class:`PoolSaturatedError` is raised.
+        timeout: Default per-call timeout in seconds.
+        max_tasks_per_worker: Recycle a worker after this many tasks.
+        start_method: ``multiprocessing`` start method for workers.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        max_queue: int,
+        timeout: float,
+        max_tasks_per_worker: int,
+        start_method: str = "spawn",
+    ) -> None:
+        self.processes = processes
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: list[_Worker] = []
+        self._busy = 0
+        self._pending = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._closed = False
+        self.completed = 0
+        self.timeouts = 0
+        self.recycled = 0
+
+    async def run(
+        self,
+        fn: Callable,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn(*args, **kwargs)`` in a worker and await its result.
+
+        *fn* must be a module-level (picklable) callable.  Exceptions
+        raised by *fn* are re-raised here unchanged.  Raises
+        :class:`WorkerPoolError` once the pool has been shut down.
+        """
+        if self._closed:
+            raise WorkerPoolError("Worker pool is shut down")
+        timeout = self.timeout if timeout is None else timeout
+        capacity = max(self.processes, 1) + self.max_queue
+        if self._pending >= capacity:
+            raise PoolSaturatedError(
+                f"Worker pool is saturated ({self._pending} tasks pending)"
+            )
+        self._pending += 1
+        try:
+            if self.processes <= 0:
+                return await self._run_inline(fn, args, kwargs, timeout)
+            return await self._run_in_worker(fn, args, kwargs, timeout)
+        finally:
+            self._pending -= 1
+
+    async def _run_inline(self, fn, args, kwargs, timeout) -> Any:
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(fn, *args, **kwargs), timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TaskTimeoutError(f"Task exceeded {timeout:g}s") from None
+        finally:
+            self.completed += 1
+
+    async def _run_in_worker(self, fn, args, kwargs, timeout) -> Any:
+        worker = await self._acquire()
+        try:
+            status, value = await asyncio.wait_for(
+                asyncio.to_thread(worker.call, fn, args, kwargs), timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            await asyncio.to_thread(worker.kill)
+            self._release(None)
+            raise TaskTimeoutError(f"Task exceeded {timeout:g}s; worker killed") from None
+        except (EOFError, OSError):
+            await asyncio.to_thread(worker.kill)
+            self._release(None)
+            raise WorkerCrashedError("Worker process exited unexpectedly") from None
+        except BaseException:
+            # Cancelled while the worker was busy: its reply would arrive
+            # out of order for the next caller, so discard the worker.
+            await asyncio.shield(asyncio.to_thread(worker.kill))
+            self._release(None)
+            raise
+
+        self.completed += 1
+        worker.tasks += 1
+        if self._closed or worker.tasks >= self.max_tasks_per_worker:
+            # Shut down while this task ran, or worn out: stop, don't park.
+            if not self._closed:
+                self.recycled += 1
+            await asyncio.to_thread(worker.stop)
+            self._release(None)
+        else:
+            self._release(worker)
+
+        if status == "error":
+            raise value
+        return value
+
+    async def _acquire(self) -> _Worker:
+        while not self._closed and self._busy >= self.processes:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # pass the slot we were handed to the next waiter
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        if self._closed:
+            raise WorkerPoolError("Worker pool is shut down")
+        self._busy += 1
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await asyncio.to_thread(_Worker, self._ctx)
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, worker: _Worker | None) -> None:
+        self._busy -= 1
+        if worker is not None:
+            self._idle.append(worker)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def shutdown(self) -> None:
+        """Stop all idle workers and reject further calls.
+
+        Busy workers are stopped when their task ends, and callers still
+        waiting for a worker get :class:`WorkerPoolError`.
+        """
+        self._closed = True
+        waiters, self._waiters = self._waiters, deque()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            await asyncio.to_thread(worker.stop)
+
+    def stats(self) -> dict:
+        """Return a JSON-serializable snapshot of pool counters."""
+        return {
+            "processes": self.processes,
+            "busy": self._busy,
+            "idle": len(self._idle),
+            "pending": self._pending,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled,
+        }
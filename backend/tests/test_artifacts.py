@@ -0,0 +1,130 @@
+"""Tests for precomputed export artifacts and their ETag-aware endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.core.database import Base, async_session, engine
+from app.main import app
+from app.models.artifact import ExportArtifact
+from app.models.convention import Convention
+from app.models.user import User
+from app.services import artifact_service
+from app.services.artifact_service import ARTIFACT_FORMATS, build_all_artifacts, get_artifact
+from app.services.bbdsl_service import content_hash
+
+CONTENT = 'bbdsl: "0.3"\nsystem:\n  name: Artifacts\n'
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+def exports(monkeypatch) -> list[tuple[str, str]]:
+    """Replace the pooled exporter; returns the (format, locale) pairs rendered."""
+    calls: list[tuple[str, str]] = []
+    running = 0
+
+    async def fake_run_in_pool(fn, content, fmt, locale):
+        nonlocal running
+        running += 1
+        try:
+            assert running == 1, "artifacts must be rendered one at a time"
+            await asyncio.sleep(0)
+            calls.append((fmt, locale))
+            if fmt == "svg":
+                raise ValueError("no tree to draw")
+            return f"{fmt}:{locale}"
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(artifact_service, "run_in_pool", fake_run_in_pool)
+    return calls
+
+
+@pytest.fixture
+async def conv_id() -> int:
+    async with async_session() as db:
+        user = User(name="author", github_id="gh-author")
+        db.add(user)
+        await db.flush()
+        conv = Convention(
+            name="Artifacts",
+            namespace="test/artifacts",
+            yaml_content=CONTENT,
+            content_sha256=content_hash(CONTENT),
+            author_id=user.id,
+        )
+        db.add(conv)
+        await db.commit()
+        return conv.id
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_build_all_stores_every_format_and_locale_in_turn(exports):
+    await build_all_artifacts(CONTENT, locales=["en", "zh-TW"])
+
+    assert len(exports) == 2 * len(ARTIFACT_FORMATS)
+    async with async_session() as db:
+        rows = (await db.execute(select(ExportArtifact))).scalars().all()
+    stored = {(row.fmt, row.locale) for row in rows}
+    expected = {(fmt, loc) for fmt in ARTIFACT_FORMATS for loc in ("en", "zh-TW")}
+    assert stored == expected - {("svg", "en"), ("svg", "zh-TW")}
+    bml = await get_artifact(content_hash(CONTENT), "bml", "zh-TW")
+    assert bml.body == "bml:zh-TW"
+    assert bml.size == len("bml:zh-TW")
+
+    # Stored formats are skipped; only the failed ones are retried.
+    exports.clear()
+    await build_all_artifacts(CONTENT, locales=["en", "zh-TW"])
+    assert exports == [("svg", "en"), ("svg", "zh-TW")]
+
+
+@pytest.mark.asyncio
+async def test_export_carries_a_strong_etag_and_answers_304(client, exports, conv_id):
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/export/html")
+    assert resp.status_code == 200
+    assert resp.text == "html:en"
+    etag = resp.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        resp = await client.get(
+            f"/api/v1/conventions/{conv_id}/export/html",
+            headers={"If-None-Match": header},
+        )
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+        assert resp.content == b""
+
+    resp = await client.get(
+        f"/api/v1/conventions/{conv_id}/export/html", headers={"If-None-Match": '"other"'}
+    )
+    assert resp.status_code == 200
+    # Rendered once, then served from the artifact table.
+    assert exports == [("html", "en")]
+
+
+@pytest.mark.asyncio
+async def test_export_reports_exporter_errors(client, exports, conv_id):
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/export/svg")
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "no tree to draw"
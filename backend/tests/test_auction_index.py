@@ -0,0 +1,89 @@
+"""Tests for the compiled auction trie."""
+
+import pytest
+
+from app.services.auction_index import (
+    AuctionTrie,
+    compile_trie,
+    decode_bid,
+    encode_bid,
+    parse_sequence,
+)
+
+SYSTEM = """\
+bbdsl: "0.3"
+conventions:
+  stayman:
+    id: "bbdsl/stayman-v1"
+    description: {en: "Ask for 4-card major after 1NT"}
+    trigger:
+      after: ["1NT", "2NT"]
+      bid: "2C"
+    responses:
+      - bid: "2D"
+        meaning: {description: {en: "No 4-card major"}}
+      - bid: "2H"
+        meaning: {description: {en: "4+ hearts"}}
+openings:
+  - bid: "1C"
+    id: "open-1c"
+    meaning: {description: {en: "16+ HCP"}}
+    responses:
+      - bid: "1D"
+        meaning: {description: {en: "Negative"}}
+        responses:
+          - bid: "1H"
+            meaning: {description: {en: "Relay"}}
+  - bid: "1NT"
+    id: "open-1nt"
+    meaning: {description: {en: "13-15 balanced"}}
+    responses:
+      - bid: "2C"
+        ref: "bbdsl/stayman-v1"
+        meaning: {description: {en: "Stayman"}, artificial: true}
+      - bid: "9Z"
+        meaning: {description: {en: "malformed, skipped"}}
+"""
+
+
+def test_bid_codes_round_trip():
+    assert [decode_bid(encode_bid(b)) for b in ["1C", "1nt", "2♥", "7N", "p", "X", "rdbl"]] == [
+        "1C", "1NT", "2H", "7NT", "P", "X", "XX"
+    ]
+    assert parse_sequence("1NT-2C") == parse_sequence("1nt 2♣") == parse_sequence(["1NT", "2C"])
+    with pytest.raises(ValueError):
+        encode_bid("8C")
+
+
+def test_lookup_follows_openings_and_nested_responses():
+    trie = compile_trie(SYSTEM)
+    assert [bid for bid, _ in trie.children(0)] == ["1C", "1NT", "2NT"]
+    node = trie.find(parse_sequence("1C-1D-1H"))
+    assert trie.payloads[node]["meaning"]["description"]["en"] == "Relay"
+    assert trie.find(parse_sequence("1C-1H")) is None
+
+
+def test_convention_responses_are_grafted_by_trigger_and_ref():
+    trie = compile_trie(SYSTEM)
+    node = trie.find(parse_sequence("1NT-2C"))
+    payload = trie.payloads[node]
+    # The opening's own response wins; the convention only fills gaps.
+    assert payload["meaning"]["description"]["en"] == "Stayman"
+    assert payload["convention"] == "bbdsl/stayman-v1"
+    assert [bid for bid, _ in trie.children(node)] == ["2D", "2H"]
+    # Second trigger auction, not defined by any opening.
+    assert trie.find(parse_sequence("2NT-2C-2H")) is not None
+
+
+def test_serialized_trie_answers_the_same_lookups():
+    trie = compile_trie(SYSTEM)
+    loaded = AuctionTrie.from_bytes(trie.to_bytes())
+    assert loaded.node_count == trie.node_count
+    for seq in ["1C-1D-1H", "1NT-2C-2D", "2NT-2C"]:
+        codes = parse_sequence(seq)
+        assert loaded.payloads[loaded.find(codes)] == trie.payloads[trie.find(codes)]
+
+
+def test_compile_rejects_non_mapping():
+    with pytest.raises(ValueError):
+        compile_trie("- just\n- a list\n")
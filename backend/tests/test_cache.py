@@ -0,0 +1,53 @@
+"""Tests for the bounded LRU cache used by the service layer."""
+
+from app.services.cache import LRUCache, cache_stats
+
+
+def test_lru_hit_and_miss_counters():
+    cache: LRUCache[str, int] = LRUCache("test-counters", max_entries=4, max_bytes=100)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_evicts_by_entry_count():
+    cache: LRUCache[str, int] = LRUCache("test-entries", max_entries=2, max_bytes=100)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_evicts_by_size():
+    cache: LRUCache[str, str] = LRUCache("test-bytes", max_entries=10, max_bytes=10)
+    cache.put("a", "x", size=6)
+    cache.put("b", "y", size=6)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 6
+
+
+def test_lru_skips_oversized_entries():
+    cache: LRUCache[str, str] = LRUCache("test-oversized", max_entries=10, max_bytes=10)
+    cache.put("big", "z", size=11)
+    assert len(cache) == 0
+    assert cache.stats()["evictions"] == 0
+
+
+def test_lru_replacing_a_key_updates_size():
+    cache: LRUCache[str, str] = LRUCache("test-replace", max_entries=10, max_bytes=10)
+    cache.put("a", "x", size=4)
+    cache.put("a", "y", size=7)
+    assert cache.get("a") == "y"
+    assert cache.stats()["bytes"] == 7
+
+
+def test_cache_stats_lists_registered_caches():
+    LRUCache("test-registry", max_entries=1, max_bytes=1)
+    assert "test-registry" in cache_stats()
@@ -0,0 +1,214 @@
+"""Tests for the tiered /diff endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import Base, async_session, engine
+from app.main import app
+from app.models.convention import Convention
+from app.models.diff import DiffRecord
+from app.models.user import User
+from app.services import diff_service
+from app.services.bbdsl_service import content_hash
+
+SYSTEM_A = 'bbdsl: "0.3"\nopenings:\n  - bid: "1NT"\n  - bid: "2C"\n'
+SYSTEM_B = 'bbdsl: "0.3"\nopenings:\n  - bid: "1NT"\n'
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    diff_service._diff_cache.clear()
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_structural_diff_then_simulation_phase(client):
+    body = {"yaml_a": SYSTEM_A, "yaml_b": SYSTEM_B, "mode": "structural", "n_deals": 10}
+    resp = await client.post("/api/v1/diff", json=body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert [c["status"] for c in report["diff_cases"]] == ["same", "only_a"]
+    assert report["simulation"]["status"] == "not_requested"
+    url = report["simulation"]["url"]
+    assert (await client.get(url)).status_code == 404
+
+    resp = await client.post("/api/v1/diff", json={**body, "simulate": True})
+    assert resp.json()["simulation"]["status"] in ("running", "ready")
+    resp = await client.get(url + "&wait=10")
+    assert resp.status_code == 200
+    assert resp.json()["n_deals"] == 10
+
+    resp = await client.post("/api/v1/diff", json={**body, "simulate": True})
+    assert resp.json()["simulation"]["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_diff_by_registry_reference(client):
+    async with async_session() as db:
+        user = User(name="author")
+        db.add(user)
+        await db.flush()
+        conv = Convention(
+            name="A",
+            namespace="test",
+            version="1.0.0",
+            yaml_content=SYSTEM_A,
+            content_sha256=content_hash(SYSTEM_A),
+            author_id=user.id,
+        )
+        db.add(conv)
+        await db.commit()
+
+    body = {
+        "ref_a": {"id": conv.id},
+        "ref_b": {"namespace": "test", "version": "1.0.0"},
+        "yaml_b": None,
+        "mode": "structural",
+    }
+    resp = await client.post("/api/v1/diff", json=body)
+    assert resp.status_code == 200
+    assert {c["status"] for c in resp.json()["diff_cases"]} == {"same"}
+
+    resp = await client.post(
+        "/api/v1/diff", json={**body, "ref_b": None, "yaml_b": SYSTEM_B}
+    )
+    assert [c["status"] for c in resp.json()["diff_cases"]] == ["same", "only_a"]
+
+    resp = await client.post("/api/v1/diff", json={**body, "ref_a": {"id": 999}})
+    assert resp.status_code == 404
+    resp = await client.post("/api/v1/diff", json={**body, "yaml_a": SYSTEM_A})
+    assert resp.status_code == 422  # both yaml_a and ref_a
+
+
+def _simulation_url(n_deals: int = 10, seed: int = 42) -> str:
+    return (
+        f"/api/v1/diff/simulation/{content_hash(SYSTEM_A)}/{content_hash(SYSTEM_B)}"
+        f"?n_deals={n_deals}&seed={seed}"
+    )
+
+
+async def _other_process_runs_it(heartbeat_age: float) -> diff_service.DiffKey:
+    """Record the simulation as running in another process."""
+    key = diff_service._diff_key(content_hash(SYSTEM_A), content_hash(SYSTEM_B), 10, 42)
+    sha_a, sha_b, n_deals, seed, shard_deals, version = key
+    async with async_session() as db:
+        db.add(
+            DiffRecord(
+                sha_a=sha_a,
+                sha_b=sha_b,
+                n_deals=n_deals,
+                seed=seed,
+                shard_deals=shard_deals,
+                bbdsl_version=version,
+                status="running",
+                updated_at=datetime.now(timezone.utc) - timedelta(seconds=heartbeat_age),
+            )
+        )
+        await db.commit()
+    return key
+
+
+@pytest.mark.asyncio
+async def test_failed_simulation_is_reported_and_restarted(client, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise RuntimeError("comparator crashed")
+
+    monkeypatch.setattr(diff_service, "compare_parallel", broken)
+    body = {
+        "yaml_a": SYSTEM_A, "yaml_b": SYSTEM_B, "mode": "structural", "n_deals": 10,
+        "simulate": True,
+    }
+    await client.post("/api/v1/diff", json=body)
+    resp = await client.get(_simulation_url() + "&wait=5")
+    assert resp.status_code == 422
+    assert resp.json() == {"status": "failed", "error": "RuntimeError: comparator crashed"}
+
+    monkeypatch.undo()
+    resp = await client.post("/api/v1/diff", json=body)
+    assert resp.json()["simulation"]["status"] == "running"
+    resp = await client.get(_simulation_url() + "&wait=10")
+    assert resp.status_code == 200
+    assert resp.json()["n_deals"] == 10
+
+
+@pytest.mark.asyncio
+async def test_simulation_running_in_another_process(client):
+    key = await _other_process_runs_it(heartbeat_age=0)
+    resp = await client.get(_simulation_url())
+    assert resp.status_code == 202
+    assert resp.json() == {"status": "running"}
+
+    # A simulated diff waits for the other run instead of repeating it.
+    waiting = asyncio.ensure_future(
+        diff_service.compare_cached(SYSTEM_A, SYSTEM_B, n_deals=10, seed=42)
+    )
+    await asyncio.sleep(0.1)
+    assert not waiting.done()
+    async with async_session() as db:
+        await db.execute(
+            update(DiffRecord)
+            .where(DiffRecord.sha_a == key[0])
+            .values(status="ready", report={"n_deals": 10, "diff_cases": []})
+        )
+        await db.commit()
+    report, _ = await asyncio.wait_for(waiting, 5)
+    assert report == {"n_deals": 10, "diff_cases": []}
+    assert (await client.get(_simulation_url())).json() == report
+
+
+@pytest.mark.asyncio
+async def test_abandoned_simulation_is_failed_and_taken_over(client):
+    await _other_process_runs_it(heartbeat_age=settings.diff_simulation_stale_seconds + 5)
+    resp = await client.get(_simulation_url())
+    assert resp.status_code == 422
+    assert resp.json()["status"] == "failed"
+
+    body = {
+        "yaml_a": SYSTEM_A, "yaml_b": SYSTEM_B, "mode": "structural", "n_deals": 10,
+        "simulate": True,
+    }
+    await client.post("/api/v1/diff", json=body)
+    resp = await client.get(_simulation_url() + "&wait=10")
+    assert resp.status_code == 200
+    assert resp.json()["n_deals"] == 10
+
+
+@pytest.mark.asyncio
+async def test_each_direction_is_simulated_and_cached_separately(monkeypatch):
+    calls: list[tuple[str, str]] = []
+
+    async def asymmetric(yaml_a, yaml_b, n_deals, seed, shard_size=None):
+        # Not the mirror image of the reverse comparison.
+        calls.append((yaml_a, yaml_b))
+        return {"system_a": yaml_a, "system_b": yaml_b, "only_a_count": len(calls)}
+
+    monkeypatch.setattr(diff_service, "compare_parallel", asymmetric)
+    forward, cached = await diff_service.compare_cached(SYSTEM_A, SYSTEM_B, 10, 42)
+    assert not cached
+    backward, cached = await diff_service.compare_cached(SYSTEM_B, SYSTEM_A, 10, 42)
+    assert not cached
+    assert backward == {"system_a": SYSTEM_B, "system_b": SYSTEM_A, "only_a_count": 2}
+
+    diff_service._diff_cache.clear()  # served from the table from here on
+    assert await diff_service.compare_cached(SYSTEM_A, SYSTEM_B, 10, 42) == (forward, True)
+    assert await diff_service.compare_cached(SYSTEM_B, SYSTEM_A, 10, 42) == (backward, True)
+    assert calls == [(SYSTEM_A, SYSTEM_B), (SYSTEM_B, SYSTEM_A)]
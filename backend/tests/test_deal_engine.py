@@ -0,0 +1,62 @@
+"""Tests for the vectorized deal engine."""
+
+import numpy as np
+import pytest
+
+from app.services import deal_engine
+from app.services.pbn import split_pbn
+
+PATTERNS = {
+    "balanced": {"shapes": ["4-3-3-3", "4-4-3-2", "5-3-3-2"]},
+    "precision_2d": {"shapes_exact": ["4=4=1=4", "4=4=0=5"]},
+}
+
+
+def test_deal_is_reproducible_and_uses_every_card_once():
+    deals = deal_engine.deal(200, 7)
+    assert deals.shape == (200, 4, 13)
+    assert np.array_equal(deals, deal_engine.deal(200, 7))
+    assert not np.array_equal(deals, deal_engine.deal(200, 8))
+    cards = np.sort(deals.reshape(200, 52), axis=1)
+    assert (cards == np.arange(52)).all()
+
+
+def test_summary_matches_per_hand_evaluation():
+    deals = deal_engine.deal(50, 1)
+    summary = deal_engine.summarize(deals)
+    hcp = deal_engine.hcp(summary)
+    lengths = deal_engine.suit_lengths(summary)
+    for board in range(50):
+        for seat in range(4):
+            hand = [int(c) for c in deals[board, seat]]
+            assert hcp[board, seat] == sum(max(4 - c % 13, 0) for c in hand)
+            assert list(lengths[board, seat]) == [sum(c // 13 == s for c in hand) for s in range(4)]
+    assert (hcp.sum(axis=1) == 40).all()
+    # A copied (unpadded) array gives the same result.
+    assert np.array_equal(summary, deal_engine.summarize(np.ascontiguousarray(deals)))
+
+
+def test_shape_classes_follow_pattern_definitions():
+    patterns = deal_engine.compile_patterns(PATTERNS)
+    summary = np.array([[0x4333, 0x3433, 0x4414, 0x1444]], dtype=np.uint32)
+    classes = deal_engine.shape_classes(summary, patterns)
+    assert classes["balanced"].tolist() == [[True, True, False, False]]
+    assert classes["precision_2d"].tolist() == [[False, False, True, False]]
+
+
+def test_compile_patterns_rejects_bad_shapes():
+    with pytest.raises(ValueError):
+        deal_engine.compile_patterns({"broken": {"shapes": ["4-4-4-2"]}})
+
+
+def test_pbn_boards_render_valid_records():
+    boards = deal_engine.pbn_boards(3, 11, first_board=5)
+    assert '[Board "5"]' in boards[0]
+    assert '[Dealer "N"]' in boards[0]
+    assert '[Vulnerable "NS"]' in boards[0]
+    deal_tag = boards[0].splitlines()[-1]
+    hands = deal_tag.split('"')[1].removeprefix("N:").split()
+    assert len(hands) == 4
+    assert all(len(hand.replace(".", "")) == 13 and hand.count(".") == 3 for hand in hands)
+    _, parsed = split_pbn("\n\n".join(boards))
+    assert len(parsed) == 3
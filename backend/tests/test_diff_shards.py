@@ -0,0 +1,176 @@
+"""Tests for diff sharding and deterministic report merging."""
+
+import random
+
+import pytest
+
+from app.services.diff_shards import merge_reports, mirror_report, plan_shards
+from app.services.pbn import derive_seed
+
+
+def _fake_diff(n_deals: int, seed: int) -> dict:
+    return {
+        "seed": seed,
+        "n_deals": n_deals,
+        "summary": {
+            "deals_same": n_deals - 1,
+            "deals_different": 1,
+            "agreement": (n_deals - 1) / n_deals,
+        },
+        "diff_cases": [{"bid": f"{seed}-{i}", "status": "different"} for i in range(2)],
+        "system_a": "Precision",
+    }
+
+
+MEANINGS_A = {"1C": "16+", "1D": "11-15", "1H": "5+ hearts", "1NT": "13-15", "2C": "6+ clubs"}
+MEANINGS_B = {"1C": "3+ clubs", "1D": "11-15", "1H": "5+ hearts", "1NT": "15-17", "2D": "weak"}
+
+
+def _report_for_deals(deals: list[str]) -> dict:
+    """Comparison report of the deals whose openings are *deals*, like bbdsl's."""
+    cases: dict[str, dict] = {}
+    same = 0
+    for bid in deals:
+        a, b = MEANINGS_A.get(bid), MEANINGS_B.get(bid)
+        if a is None or b is None:
+            status = "only_a" if b is None else "only_b"
+        else:
+            status = "same" if a == b else "different"
+        same += status == "same"
+        cases.setdefault(bid, {"bid": bid, "system_a": a, "system_b": b, "status": status})
+    return {
+        "system_a": "Precision",
+        "system_b": "2/1",
+        "n_deals": len(deals),
+        "summary": {
+            "deals_same": same,
+            "deals_different": len(deals) - same,
+            "agreement": same / len(deals),
+        },
+        "diff_cases": list(cases.values()),
+    }
+
+
+def test_plan_shards_covers_deal_range_with_derived_seeds():
+    shards = plan_shards(250, 42, 100)
+    assert [n for n, _ in shards] == [100, 100, 50]
+    assert [s for _, s in shards] == [derive_seed(42, i) for i in range(3)]
+
+
+def test_single_shard_is_returned_unchanged():
+    report = _fake_diff(20, 42)
+    assert plan_shards(20, 42, 100) == [(20, 42)]
+    assert merge_reports([(20, report)]) is report
+
+
+def test_sharded_report_equals_single_run_on_the_same_deals():
+    rng = random.Random(5)
+    deals = rng.choices(sorted(MEANINGS_A.keys() | MEANINGS_B.keys()), k=250)
+    shards = [deals[i : i + 100] for i in range(0, len(deals), 100)]
+    merged = merge_reports([(len(d), _report_for_deals(d)) for d in shards])
+    single = _report_for_deals(deals)
+    assert merged["summary"].pop("agreement") == pytest.approx(single["summary"].pop("agreement"))
+    assert merged == single
+    assert len({c["bid"] for c in merged["diff_cases"]}) == len(merged["diff_cases"])
+
+
+def test_merge_keeps_a_differing_status_for_each_bid():
+    same = {"n_deals": 1, "diff_cases": [{"bid": "1NT", "status": "same"}]}
+    different = {"n_deals": 1, "diff_cases": [{"bid": "1NT", "status": "different"}]}
+    merged = merge_reports([(1, same), (1, different), (1, same)])
+    assert merged == {"n_deals": 3, "diff_cases": [{"bid": "1NT", "status": "different"}]}
+
+
+def test_merge_sums_counts_keys_cases_and_weights_rates():
+    shards = plan_shards(150, 7, 100)
+    merged = merge_reports([(n, _fake_diff(n, s)) for n, s in shards])
+    assert merged["summary"]["deals_same"] == 148
+    assert merged["summary"]["deals_different"] == 2
+    assert merged["summary"]["agreement"] == (99 + 49) / 150
+    first_seed = shards[0][1]
+    assert [c["bid"] for c in merged["diff_cases"]][:2] == [f"{first_seed}-0", f"{first_seed}-1"]
+    assert len(merged["diff_cases"]) == 4
+    assert merged["system_a"] == "Precision"
+
+
+# The comparison report as the platform consumes it: bid-level cases as
+# read by the frontend's DiffViewer, under the request parameters and the
+# deal summary.
+COMPARATOR_FIELDS = {"system_a", "system_b", "n_deals", "seed", "summary", "diff_cases"}
+CASE_FIELDS = {"bid", "system_a", "system_b", "status"}
+
+
+def test_merge_preserves_the_comparator_report_schema():
+    rng = random.Random(11)
+    bids = sorted(MEANINGS_A.keys() | MEANINGS_B.keys())
+    shards = plan_shards(300, 42, 100)
+    reports = [{**_report_for_deals(rng.choices(bids, k=n)), "seed": s} for n, s in shards]
+    assert all(r.keys() == COMPARATOR_FIELDS for r in reports)
+
+    merged = merge_reports([(n, r) for (n, _), r in zip(shards, reports)])
+    assert merged.keys() == COMPARATOR_FIELDS
+    assert merged["seed"] == shards[0][1]
+    assert merged["n_deals"] == 300
+    assert merged["summary"]["deals_same"] + merged["summary"]["deals_different"] == 300
+    assert all(case.keys() == CASE_FIELDS for case in merged["diff_cases"])
+
+
+def test_unknown_fields_the_shards_disagree_on_mark_the_report_partial(caplog):
+    # A difference matrix and example hands, as the plan describes the
+    # report: their per-shard values must not pass for the whole run's.
+    first = {
+        "n_deals": 100,
+        "system_a": "Precision",
+        "summary": {"matrix": {"1NT": {"different": 12}}, "deals_same": 88},
+        "examples": [{"board": 3, "bid": "1NT"}],
+    }
+    second = {
+        "n_deals": 50,
+        "system_a": "Precision",
+        "summary": {"matrix": {"1NT": {"different": 5}}, "deals_same": 45},
+        "examples": [{"board": 17, "bid": "1NT"}],
+    }
+    merged = merge_reports([(100, first), (50, second)])
+    assert merged == {
+        "n_deals": 150,
+        "system_a": "Precision",
+        "summary": {"matrix": {"1NT": {}}, "deals_same": 133},
+        "partial": True,
+        "unmerged_fields": ["summary.matrix.1NT.different", "examples"],
+    }
+    assert "summary.matrix.1NT.different" in caplog.text
+
+    third = {**second, "system_a": "2/1", "examples": first["examples"]}
+    merged = merge_reports([(100, first), (50, third)])
+    assert merged["unmerged_fields"] == ["system_a", "summary.matrix.1NT.different"]
+    assert merged["examples"] == first["examples"]
+
+
+def test_merge_is_independent_of_completion_order():
+    shards = plan_shards(400, 3, 100)
+    reports = {s: _fake_diff(n, s) for n, s in reversed(shards)}
+    merged = merge_reports([(n, reports[s]) for n, s in shards])
+    again = merge_reports([(n, _fake_diff(n, s)) for n, s in shards])
+    assert merged == again
+
+
+def test_mirror_report_swaps_sides_and_statuses():
+    report = {
+        "system_a": "SAYC",
+        "system_b": "2/1",
+        "only_a_count": 3,
+        "diff_cases": [
+            {"bid": "1C", "system_a": "3+ clubs", "system_b": None, "status": "only_a"},
+            {"bid": "1NT", "system_a": "15-17", "system_b": "15-17", "status": "same"},
+        ],
+    }
+    mirrored = mirror_report(report)
+    assert mirrored["system_a"] == "2/1"
+    assert mirrored["system_b"] == "SAYC"
+    assert mirrored["only_b_count"] == 3
+    assert mirrored["diff_cases"][0] == {
+        "bid": "1C", "system_a": None, "system_b": "3+ clubs", "status": "only_b"
+    }
+    assert mirrored["diff_cases"][1]["status"] == "same"
+    assert mirror_report(mirrored) == report
+    assert report["system_a"] == "SAYC"
@@ -1,9 +1,23 @@
 """Tests for the export API endpoint."""
 
+import io
+import zipfile
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.main import app
+from app.services import bbdsl_service
+from app.services.export_service import BOARD_CHUNK_SIZE, open_bundle_stream
+from app.services.pbn import (
+    PBN_HEADER,
+    board_vulnerability,
+    format_board,
+    pbn_board_to_lin,
+    split_pbn,
+)
+
+LIN_VUL = {"None": "o", "NS": "n", "EW": "e", "All": "b"}
 
 
 @pytest.fixture
@@ -23,3 +37,129 @@ async def test_export_unsupported_format(client):
         json={"yaml_content": "system: {}"},
     )
     assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_bundle_rejects_unsupported_format(client):
+    """A bundle with an unknown format should return 400 before exporting."""
+    resp = await client.post(
+        "/api/v1/export/bundle",
+        json={"yaml_content": "system: {}", "formats": ["bml", "pdf"]},
+    )
+    assert resp.status_code == 400
+
+
+def _fake_pbn(doc, n_deals, seed, locale):
+    # bbdsl numbers every export from board 1 with that board's tags.
+    return PBN_HEADER + "\n\n".join(
+        format_board(i, "N:AK.QJ.T98.7654 QJ.AK.7654.T98 T98.7654.AK.QJ 7654.T98.QJ.AK")
+        for i in range(1, n_deals + 1)
+    )
+
+
+def _fake_lin(doc, n_deals, seed, locale):
+    return "\n".join(
+        f"pn|N,E,S,W|st||qx|o{i}|md|{'1234'[(i - 1) % 4]}AK,,,|sv|o|ah|Board {i}|mb||"
+        for i in range(1, n_deals + 1)
+    )
+
+
+@pytest.fixture
+def fake_exporters(monkeypatch):
+    monkeypatch.setattr(bbdsl_service.pool, "processes", 0)
+    monkeypatch.setattr(bbdsl_service, "load_document", lambda content: object())
+    monkeypatch.setattr(bbdsl_service, "export_pbn", _fake_pbn)
+    monkeypatch.setattr(bbdsl_service, "export_lin", _fake_lin)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["pbn", "lin"])
+async def test_streamed_boards_are_numbered_across_chunks(client, fake_exporters, fmt):
+    """Every chunk continues the board numbering, dealer and vulnerability."""
+    n_deals = 2 * BOARD_CHUNK_SIZE + 3
+    resp = await client.post(
+        f"/api/v1/export/{fmt}",
+        json={"yaml_content": "system: {}", "n_deals": n_deals, "seed": 7},
+    )
+    assert resp.status_code == 200
+
+    if fmt == "pbn":
+        _, records = split_pbn(resp.text)
+        lines = [pbn_board_to_lin(record) for record in records]
+    else:
+        lines = resp.text.splitlines()
+    assert len(lines) == n_deals
+    for board, line in enumerate(lines, start=1):
+        assert f"ah|Board {board}|" in line
+        assert f"md|{'1234'[(board - 1) % 4]}" in line
+        assert f"sv|{LIN_VUL[board_vulnerability(board)]}|" in line
+
+
+@pytest.mark.asyncio
+async def test_bundle_streams_a_readable_zip(client, monkeypatch):
+    """The streamed bundle opens with zipfile, one entry per export."""
+    monkeypatch.setattr(bbdsl_service.pool, "processes", 0)
+    monkeypatch.setattr(bbdsl_service, "load_document", lambda content: {"system": {}})
+    for fmt in ("bml", "html"):
+        monkeypatch.setattr(
+            bbdsl_service,
+            f"export_{fmt}",
+            lambda doc, locale, fmt=fmt: f"{fmt} for {locale}\n" + "x" * 70_000,
+        )
+
+    chunks = []
+    async with client.stream(
+        "POST",
+        "/api/v1/export/bundle",
+        json={
+            "yaml_content": "system: {}",
+            "formats": ["bml", "html", "bboalert"],
+            "locales": ["en", "zh-TW"],
+        },
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/zip"
+        async for chunk in resp.aiter_bytes():
+            chunks.append(chunk)
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == [
+        "en/system.bml",
+        "en/system.html",
+        "errors/bboalert-en.txt",
+        "errors/bboalert-zh-TW.txt",
+        "zh-TW/system.bml",
+        "zh-TW/system.html",
+    ]
+    assert archive.read("zh-TW/system.html").decode() == "html for zh-TW\n" + "x" * 70_000
+    # The fake document has no system name, so the BBOalert export fails.
+    assert archive.read("errors/bboalert-en.txt").decode().startswith("AttributeError: ")
+    for info in archive.infolist():
+        # Written without seeking back: sizes follow each entry's data.
+        assert info.flag_bits & 0x08
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.asyncio
+async def test_bundle_entries_are_sent_as_they_finish(monkeypatch):
+    """Each entry leaves the sink before the archive is closed."""
+    monkeypatch.setattr(bbdsl_service.pool, "processes", 0)
+    monkeypatch.setattr(bbdsl_service, "load_document", lambda content: {"system": {}})
+    monkeypatch.setattr(bbdsl_service, "export_bml", lambda doc, locale: f"bml {locale}")
+
+    stream = await open_bundle_stream("system: {}", ["bml"], ["en", "fr", "de"], 10, 1)
+    pieces = [piece async for piece in stream]
+
+    # One piece per entry (local header, data, descriptor), then the
+    # central directory.
+    assert len(pieces) == 4
+    for piece in pieces[:3]:
+        assert piece.startswith(b"PK\x03\x04")
+    assert pieces[3].startswith(b"PK\x01\x02")
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(pieces)))
+    assert {name: archive.read(name) for name in archive.namelist()} == {
+        "en/system.bml": b"bml en",
+        "fr/system.bml": b"bml fr",
+        "de/system.bml": b"bml de",
+    }
@@ -0,0 +1,55 @@
+"""Tests for structural fingerprints (MinHash + LSH)."""
+
+from app.services.auction_index import compile_trie
+from app.services.fingerprint import (
+    BANDS,
+    auction_shingles,
+    band_keys,
+    fingerprint_content,
+    minhash,
+    signature_from_bytes,
+    signature_to_bytes,
+    similarity,
+)
+
+SYSTEM = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning:
+      description: {en: "15-17 balanced"}
+      hand: {hcp: {min: 15, max: 17}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}, forcing: true}
+      - bid: "2D"
+        meaning: {description: {en: "Transfer"}}
+"""
+
+
+def test_shingles_cover_auctions_and_structural_meaning():
+    shingles = auction_shingles(compile_trie(SYSTEM))
+    assert {"1NT", "1NT-2C", "1NT-2D"} <= shingles
+    assert '1NT={"hand":{"hcp":{"max":17,"min":15}}}' in shingles
+    assert '1NT-2C={"forcing":true}' in shingles
+    # Descriptions are prose, not structure.
+    reworded = SYSTEM.replace("Transfer", "Jacoby transfer to hearts")
+    assert auction_shingles(compile_trie(reworded)) == shingles
+
+
+def test_minhash_estimates_jaccard_similarity():
+    a = {f"s{i}" for i in range(1000)}
+    b = {f"s{i}" for i in range(300, 1300)}
+    estimate = similarity(minhash(a), minhash(b))
+    assert abs(estimate - 700 / 1300) < 0.1
+    assert similarity(minhash(a), minhash(set(a))) == 1.0
+
+
+def test_identical_systems_share_every_band():
+    signature, count = fingerprint_content(SYSTEM)
+    assert count == 5
+    keys = band_keys(signature)
+    assert len(keys) == BANDS
+    assert band_keys(signature_from_bytes(signature_to_bytes(signature))) == keys
+    changed, _ = fingerprint_content(SYSTEM.replace("max: 17", "max: 18"))
+    assert 0 < similarity(signature, changed) < 1
@@ -0,0 +1,118 @@
+"""Tests for vectorized opening classification."""
+
+import numpy as np
+import pytest
+
+from app.services.hand_classifier import (
+    compile_classifier,
+    pack_hand,
+    parse_pbn_hands,
+    unpack_hands,
+)
+
+SYSTEM = """\
+bbdsl: "0.3"
+definitions:
+  patterns:
+    balanced:
+      shapes: ["4-3-3-3", "4-4-3-2", "5-3-3-2"]
+openings:
+  - bid: "1C"
+    priority: 10
+    meaning:
+      hand:
+        hcp: {min: 12, max: 21}
+        clubs: {min: 1}
+  - bid: "1H"
+    priority: 80
+    meaning:
+      hand:
+        hcp: {min: 12, max: 21}
+        hearts: {min: 5}
+  - bid: "1NT"
+    priority: 90
+    meaning:
+      hand:
+        hcp: {min: 15, max: 17}
+        shape: {ref: balanced}
+        controls: {min: 3}
+  - bid: "2C"
+    meaning:
+      hand:
+        hcp: {min: 22}
+"""
+
+
+def test_parse_pbn_hands_maps_cards_to_codes():
+    cards = parse_pbn_hands(["AK2.KQ3.Q54.J432"])
+    assert cards.shape == (1, 13)
+    assert sorted(cards[0].tolist())[:3] == [0, 1, 12]  # SA, SK, S2
+    with pytest.raises(ValueError, match="Hand 1"):
+        parse_pbn_hands(["AK2.KQ3.Q54.J432", "AA2.KQ3.Q54.J432"])
+    with pytest.raises(ValueError, match="Hand 0"):
+        parse_pbn_hands(["AK2.KQ3.Q54"])
+
+
+def test_packed_hands_round_trip():
+    cards = parse_pbn_hands(["AK2.KQ3.Q54.J432", "T98765432.2.3.42"])
+    packed = b"".join(pack_hand(hand) for hand in cards)
+    assert np.array_equal(unpack_hands(packed), np.sort(cards, axis=1))
+    with pytest.raises(ValueError):
+        unpack_hands(pack_hand([0, 1, 2]))
+
+
+def test_highest_priority_opening_wins():
+    classifier = compile_classifier(SYSTEM)
+    hands = parse_pbn_hands(
+        [
+            "AK2.KQ3.Q54.J432",  # 15 balanced: 1NT (90) over 1C (10)
+            "A.AKJ542.K32.432",  # 15, six hearts: 1H (80) over 1C (10)
+            "AK.AKQJ.AKQJ.AKQ",  # 2C
+            "5432.432.432.432",  # nothing: pass
+            "AQ2.KQ3.Q54.J432",  # 14 balanced: 1C
+        ]
+    )
+    assert classifier.classify(hands).tolist() == ["1NT", "1H", "2C", "P", "1C"]
+    assert classifier.ignored == ["controls"]
+
+
+def test_priority_and_document_order_beat_specificity():
+    # The spec's precision example: 16+ always opens 1C, even with a hand
+    # that also fits the (much rarer) 1NT or 2C.
+    system = """\
+bbdsl: "0.3"
+definitions:
+  patterns:
+    balanced:
+      shapes: ["4-3-3-3", "4-4-3-2", "5-3-3-2"]
+openings:
+  - bid: "2C"
+    meaning:
+      hand: {hcp: {min: 22}}
+  - bid: "1NT"
+    priority: 90
+    meaning:
+      hand: {hcp: {min: 16, max: 18}, shape: {ref: balanced}}
+  - bid: "1C"
+    priority: 100
+    meaning:
+      hand: {hcp: {min: 16}}
+  - bid: "2D"
+    meaning:
+      hand: {hcp: {min: 22}}
+selection_rules:
+  opening_selection: {rules: []}
+"""
+    classifier = compile_classifier(system)
+    hands = parse_pbn_hands(["AK2.KQ3.KQ4.J432", "AK.AKQJ.AKQJ.AKQ"])
+    assert classifier.classify(hands).tolist() == ["1C", "1C"]
+    assert classifier.ignored == ["selection_rules"]
+
+    # Among equal priorities the document order decides: 2C precedes 1C.
+    unranked = compile_classifier(system.replace("priority: 100", "priority: 0"))
+    assert unranked.classify(hands).tolist() == ["1NT", "2C"]
+
+
+def test_unknown_shape_reference_is_rejected():
+    with pytest.raises(ValueError, match="1NT"):
+        compile_classifier(SYSTEM.replace("ref: balanced", "ref: flat"))
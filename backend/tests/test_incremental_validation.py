@@ -0,0 +1,152 @@
+"""Tests for section-level incremental validation."""
+
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from app.services.incremental_validation import IncrementalValidator, split_sections
+
+DOC = """\
+bbdsl: "0.3"
+system:
+  name: Test
+  version: "1.0.0"
+definitions:
+  patterns:
+    balanced:
+      shapes: ["4-3-3-3"]
+conventions:
+  stayman:
+    id: "bbdsl/stayman-v1"
+  jacoby:
+    id: "bbdsl/jacoby-v1"
+openings:
+  - bid: "1NT"
+export:
+  bboalert:
+    enabled: true
+"""
+
+
+class FakeValidator:
+    """Records the documents it validates and reports one warning per call."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def __call__(self, content: str) -> dict:
+        self.calls.append(content)
+        results = [{"rule_id": "val-012-shape-format", "severity": "error", "message": "x"}]
+        if "jacoby" in content:
+            results.append(
+                {"rule_id": "val-011-convention-id-format", "severity": "warning", "message": "y"}
+            )
+        return {"error_count": 1, "warning_count": len(results) - 1, "results": results}
+
+
+def test_split_sections_splits_convention_entries():
+    names = [s.name for s in split_sections(DOC)]
+    assert names == [
+        "bbdsl",
+        "system",
+        "definitions",
+        "conventions",
+        "conventions/stayman",
+        "conventions/jacoby",
+        "openings",
+        "export",
+    ]
+    assert "".join(s.text for s in split_sections(DOC)) == DOC
+
+
+@pytest.mark.asyncio
+async def test_first_message_validates_full_document():
+    fake = FakeValidator()
+    report = await IncrementalValidator(fake).validate(DOC)
+    assert fake.calls == [DOC]
+    assert report["incremental"]["mode"] == "full"
+    assert report["error_count"] == 1
+    assert report["warning_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unvalidated_section_edit_reuses_results():
+    fake = FakeValidator()
+    inc = IncrementalValidator(fake)
+    await inc.validate(DOC)
+    edited = DOC.replace("enabled: true", "enabled: false").replace(
+        "name: Test", "name: Renamed  # comment"
+    )
+    report = await inc.validate(edited)
+    assert len(fake.calls) == 1
+    assert report["incremental"]["mode"] == "reused"
+    assert set(report["incremental"]["changed_sections"]) == {"export", "system"}
+    assert report["warning_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_definitions_edit_reruns_only_dependent_rules():
+    fake = FakeValidator()
+    inc = IncrementalValidator(fake)
+    await inc.validate(DOC)
+    # Only rules reading ``definitions`` are stale; the projection skips
+    # sections none of them read.
+    edited = DOC.replace('"4-3-3-3"', '"4-4-3-2"')
+    report = await inc.validate(edited)
+    assert report["incremental"]["mode"] == "partial"
+    assert "val-012" in report["incremental"]["rerun_rules"]
+    assert "val-011" not in report["incremental"]["rerun_rules"]
+    projected = fake.calls[-1]
+    assert "export:" not in projected
+    assert "definitions:" in projected
+    # val-011 result kept from the cached full run.
+    assert report["warning_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_rules_force_full_validation():
+    async def validate(content: str) -> dict:
+        return {"results": [{"rule_id": "custom-rule", "severity": "warning"}]}
+
+    inc = IncrementalValidator(validate)
+    await inc.validate(DOC)
+    report = await inc.validate(DOC.replace("enabled: true", "enabled: false"))
+    assert report["incremental"]["mode"] == "full"
+
+
+class OverridingValidator:
+    """Reports val-012 and val-011, applying ``validation.rules`` severities."""
+
+    async def __call__(self, content: str) -> dict:
+        doc = yaml.safe_load(content) or {}
+        overrides = {
+            rule["id"]: rule["severity"]
+            for rule in (doc.get("validation") or {}).get("rules", [])
+        }
+        results = []
+        if "definitions" in doc:
+            shapes = doc["definitions"]["patterns"]["balanced"]["shapes"]
+            results += [{"rule_id": "val-012-shape-format", "message": s} for s in shapes]
+        if "conventions" in doc:
+            results.append({"rule_id": "val-011-convention-id-format", "message": "id"})
+        for result in results:
+            key = result["rule_id"][:7]
+            result["severity"] = overrides.get(key, "warning")
+        errors = sum(r["severity"] == "error" for r in results)
+        return {"error_count": errors, "warning_count": len(results) - errors, "results": results}
+
+
+@pytest.mark.asyncio
+async def test_partial_report_keeps_severity_overrides():
+    doc = DOC + "validation:\n  rules:\n    - {id: val-012, severity: error}\n"
+    inc = IncrementalValidator(OverridingValidator())
+    await inc.validate(doc)
+    edited = doc.replace('"4-3-3-3"', '"4-4-3-2", "5-3-3-2"')
+    incremental = await inc.validate(edited)
+    assert incremental["incremental"]["mode"] == "partial"
+
+    full = await IncrementalValidator(OverridingValidator()).validate(edited)
+    del incremental["incremental"], full["incremental"]
+    assert incremental == full
+    assert full["error_count"] == 2
@@ -0,0 +1,21 @@
+"""Tests for keyset pagination cursors."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc), 42)
+    cursor = encode_cursor("newest", key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "newest", 2) == key
+    assert decode_cursor(encode_cursor("name", ("Précision", 7)), "name", 2) == ("Précision", 7)
+
+
+@pytest.mark.parametrize("cursor", ["%%%", "bm90IGpzb24", encode_cursor("name", ("a", 1))])
+def test_bad_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "newest", 2)
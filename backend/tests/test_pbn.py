@@ -0,0 +1,79 @@
+"""Tests for PBN splitting and LIN conversion helpers."""
+
+from app.services.pbn import (
+    derive_seed,
+    pbn_board_to_lin,
+    pbn_to_lin,
+    renumber_board,
+    renumber_lin_board,
+    split_pbn,
+)
+
+PBN = """\
+% PBN 2.1
+% EXPORT
+
+[Event "Practice"]
+[Board "1"]
+[Dealer "N"]
+[Vulnerable "None"]
+[Deal "N:AK.QJ.T98.7654 QJ.AK.7654.T98 T98.7654.AK.QJ 7654.T98.QJ.AK"]
+
+[Event "Practice"]
+[Board "2"]
+[Dealer "E"]
+[Vulnerable "NS"]
+[Deal "E:QJ.AK.7654.T98 T98.7654.AK.QJ 7654.T98.QJ.AK AK.QJ.T98.7654"]
+"""
+
+
+def test_split_pbn_separates_header_and_boards():
+    header, boards = split_pbn(PBN)
+    assert header == "% PBN 2.1\n% EXPORT\n"
+    assert len(boards) == 2
+    assert boards[1].startswith('[Event "Practice"]')
+
+
+def test_pbn_to_lin_emits_one_line_per_board():
+    lines = pbn_to_lin(PBN).splitlines()
+    assert len(lines) == 2
+    assert "md|1AKQJT987654" in lines[0]
+    assert "sv|o" in lines[0]
+    assert "md|2QJAK7654T98" in lines[1]
+    assert "sv|n" in lines[1]
+    assert "ah|Board 2" in lines[1]
+
+
+def test_renumber_board_replaces_or_adds_tag():
+    _, boards = split_pbn(PBN)
+    assert '[Board "17"]' in renumber_board(boards[0], 17)
+    assert renumber_board('[Deal "N:..."]', 3).startswith('[Board "3"]')
+
+
+def test_renumber_board_sets_dealer_and_vulnerability():
+    _, boards = split_pbn(PBN)
+    record = renumber_board(boards[0], 252)
+    assert '[Dealer "W"]' in record
+    assert '[Vulnerable "NS"]' in record
+    assert record.count("[Dealer") == record.count("[Vulnerable") == 1
+    assert renumber_board('[Deal "N:..."]', 2).splitlines() == [
+        '[Board "2"]', '[Dealer "E"]', '[Vulnerable "NS"]', '[Deal "N:..."]'
+    ]
+
+
+def test_renumber_lin_board_rewrites_number_dealer_and_vulnerability():
+    line = "pn|a,b,c,d|st||qx|o1|md|1AKQJT987654,,,|sv|o|ah|Board 1|mb|1C|"
+    assert renumber_lin_board(line, 252) == (
+        "pn|a,b,c,d|st||qx|o252|md|4AKQJT987654,,,|sv|n|ah|Board 252|mb|1C|"
+    )
+    assert renumber_lin_board("md|1AK,,,|", 6) == "md|2AK,,,|sv|e|ah|Board 6|"
+
+
+def test_board_without_tags_converts_to_default_lin():
+    assert pbn_board_to_lin("") == "pn|N,E,S,W|st|||md|1|sv|o|mb||"
+
+
+def test_derive_seed_is_stable_and_keeps_index_zero():
+    assert derive_seed(42, 0) == 42
+    assert derive_seed(42, 1) == derive_seed(42, 1)
+    assert len({derive_seed(42, i) for i in range(100)}) == 100
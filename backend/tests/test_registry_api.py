@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import json
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
@@ -9,7 +11,14 @@ from sqlalchemy import select
 from app.core.database import async_session, create_tables, engine, Base
 from app.core.security import create_access_token
 from app.main import app
+from app.models.convention import Convention
+from app.models.rating import Comment, Rating
 from app.models.user import User
+from app.services.bbdsl_service import content_hash
+from app.services.rating_service import record_rating, repair_rating_aggregates
+from app.services.search_service import index_convention
+from app.services.similarity_service import ensure_fingerprint
+from app.services.tag_service import parse_tags, set_convention_tags
 
 
 # ────────────────────── Fixtures ──────────────────────
@@ -127,3 +136,475 @@ async def test_list_namespaces(client):
     data = resp.json()
     assert "items" in data
     assert "total" in data
+
+
+@pytest.mark.asyncio
+async def test_list_conventions_projection(client, test_user):
+    async with async_session() as db:
+        conv = Convention(
+            name="Listed",
+            namespace="test/listed",
+            yaml_content="bbdsl: '0.3'\n",
+            content_sha256=content_hash("bbdsl: '0.3'\n"),
+            author_id=test_user.id,
+        )
+        db.add(conv)
+        await db.flush()
+        db.add_all(
+            [
+                Rating(convention_id=conv.id, user_id=test_user.id, score=4),
+                Comment(convention_id=conv.id, user_id=test_user.id, content="Nice"),
+            ]
+        )
+        await record_rating(db, conv.id, None, 4)
+        await db.commit()
+
+    item = (await client.get("/api/v1/conventions")).json()["items"][0]
+    assert item["author_name"] == "testuser"
+    assert "yaml_content" not in item and "rating_avg" not in item
+
+    resp = await client.get(
+        "/api/v1/conventions",
+        params={"fields": "name,rating_avg,rating_count,comment_count,content_sha256"},
+    )
+    assert resp.json()["items"] == [
+        {
+            "id": conv.id,
+            "name": "Listed",
+            "rating_avg": 4.0,
+            "rating_count": 1,
+            "comment_count": 1,
+            "content_sha256": conv.content_sha256,
+        }
+    ]
+    resp = await client.get("/api/v1/conventions", params={"fields": "name,yaml_content"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_conventions_keyset_pages(client, test_user):
+    async with async_session() as db:
+        db.add_all(
+            Convention(
+                name=f"Conv {i}",
+                namespace=f"test/page{i}",
+                yaml_content="bbdsl: '0.3'\n",
+                downloads=i % 3,  # ties, broken by id
+                author_id=test_user.id,
+            )
+            for i in range(7)
+        )
+        await db.commit()
+
+    for sort in ("newest", "downloads", "name"):
+        expected = [
+            c["id"]
+            for c in (
+                await client.get("/api/v1/conventions", params={"sort": sort, "page_size": 100})
+            ).json()["items"]
+        ]
+        seen, cursor, totals = [], None, []
+        while True:
+            params = {"sort": sort, "page_size": 3, "fields": "name"}
+            if cursor:
+                params["cursor"] = cursor
+            data = (await client.get("/api/v1/conventions", params=params)).json()
+            seen += [c["id"] for c in data["items"]]
+            totals.append(data["total"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected and len(seen) == 7
+        assert totals == [7, None, None]  # counted on the first page only
+
+    data = (await client.get("/api/v1/conventions", params={"page": 3, "page_size": 3})).json()
+    assert (len(data["items"]), data["total"], data["next_cursor"]) == (1, 7, None)
+
+    first = (await client.get("/api/v1/conventions", params={"page_size": 3})).json()
+    resp = await client.get(
+        "/api/v1/conventions",
+        params={"sort": "name", "cursor": first["next_cursor"], "count": "exact"},
+    )
+    assert resp.status_code == 400  # cursor of another sort
+    resp = await client.get(
+        "/api/v1/conventions", params={"cursor": first["next_cursor"], "count": "exact"}
+    )
+    assert resp.json()["total"] == 7
+
+
+SEARCH_YAML = """\
+bbdsl: "0.3"
+system:
+  name: {{en: "{name}", zh-TW: "{zh}"}}
+openings:
+  - bid: "1NT"
+    meaning: {{description: {{en: "{meaning}", zh-TW: "平均牌型"}}}}
+"""
+
+
+@pytest.mark.asyncio
+async def test_full_text_search(client, test_user, auth_headers):
+    rows = [
+        ("Precision Club", "精準制", "Stayman", "strong,club"),
+        ("Two Over One", "二蓋一", "Precision relay", "natural"),
+        ("Standard American", "標準美式", "Balanced", "natural"),
+    ]
+    ids = []
+    async with async_session() as db:
+        for i, (name, zh, meaning, tags) in enumerate(rows):
+            conv = Convention(
+                name=name,
+                namespace=f"test/search{i}",
+                tags=tags,
+                yaml_content=SEARCH_YAML.format(name=name, zh=zh, meaning=meaning),
+                author_id=test_user.id,
+            )
+            db.add(conv)
+            await db.flush()
+            await index_convention(db, conv)
+            ids.append(conv.id)
+        await db.commit()
+
+    async def search(q, **params):
+        resp = await client.get("/api/v1/conventions", params={"q": q, **params})
+        assert resp.status_code == 200
+        return [c["id"] for c in resp.json()["items"]]
+
+    # A name match outranks a match in the YAML's prose.
+    assert await search("precision") == [ids[0], ids[1]]
+    assert await search("prec") == [ids[0], ids[1]]  # the last word is a prefix
+    assert await search("relay precision") == [ids[1]]
+    assert await search("精準") == [ids[0]]
+    assert await search("美式") == [ids[2]]
+    assert sorted(await search("natural")) == [ids[1], ids[2]]
+    assert await search("stayman", sort="newest") == [ids[0]]
+    assert await search("stayman精準") == [ids[0]]  # mixed scripts are separate terms
+    first = (await client.get("/api/v1/conventions", params={"q": "平均", "page_size": 2})).json()
+    assert first["total"] == 3
+    params = {"q": "平均", "cursor": first["next_cursor"]}
+    rest = (await client.get("/api/v1/conventions", params=params)).json()
+    assert sorted(c["id"] for c in first["items"] + rest["items"]) == ids
+
+    resp = await client.put(
+        f"/api/v1/conventions/{ids[0]}", json={"name": "Polish Club"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert await search("polish") == [ids[0]]
+
+    resp = await client.delete(f"/api/v1/conventions/{ids[1]}", headers=auth_headers)
+    assert resp.status_code == 204
+    assert await search("relay") == []
+
+
+@pytest.mark.asyncio
+async def test_tag_filter_and_counts(client, test_user, auth_headers):
+    assert parse_tags(" 2/1 , Strong Club,2/1,, strong  club ") == ["2/1", "strong club"]
+    ids = []
+    async with async_session() as db:
+        for i, tags in enumerate(["2/1,natural", "2/1-variant,natural", "Precision,strong club"]):
+            conv = Convention(
+                name=f"Tagged {i}",
+                namespace=f"test/tagged{i}",
+                tags=tags,
+                yaml_content="bbdsl: '0.3'\n",
+                author_id=test_user.id,
+            )
+            db.add(conv)
+            await db.flush()
+            await set_convention_tags(db, conv.id, conv.tags)
+            ids.append(conv.id)
+        await db.commit()
+
+    async def tagged(*tags, **params):
+        resp = await client.get("/api/v1/conventions", params={"tag": list(tags), **params})
+        assert resp.status_code == 200
+        return sorted(c["id"] for c in resp.json()["items"])
+
+    assert await tagged("2/1") == [ids[0]]  # no longer a substring match
+    assert await tagged("NATURAL") == [ids[0], ids[1]]
+    assert await tagged("2/1", "natural") == [ids[0]]
+    assert await tagged("2/1,natural") == [ids[0]]
+    assert await tagged("2/1", "precision", tag_mode="any") == [ids[0], ids[2]]
+    assert await tagged("2/1", "unknown") == []
+    assert await tagged("unknown", "precision", tag_mode="any") == [ids[2]]
+
+    resp = await client.get("/api/v1/tags")
+    assert resp.headers["cache-control"].startswith("public")
+    assert resp.json()["items"][0] == {"name": "natural", "count": 2}
+    resp = await client.get("/api/v1/tags", params={"q": "2/1"})
+    assert [t["name"] for t in resp.json()["items"]] == ["2/1", "2/1-variant"]
+
+    resp = await client.put(
+        f"/api/v1/conventions/{ids[0]}", json={"tags": "2/1"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert await tagged("natural") == [ids[1]]
+    resp = await client.delete(f"/api/v1/conventions/{ids[1]}", headers=auth_headers)
+    assert resp.status_code == 204
+    counts = {t["name"]: t["count"] for t in (await client.get("/api/v1/tags")).json()["items"]}
+    assert counts == {"2/1": 1, "precision": 1, "strong club": 1}
+
+
+@pytest.mark.asyncio
+async def test_rating_aggregates(client, test_user, auth_headers):
+    async with async_session() as db:
+        other = User(name="other", github_id="gh-67890", email="other@example.com")
+        convs = [
+            Convention(
+                name=f"Rated {i}",
+                namespace=f"test/rated{i}",
+                yaml_content="bbdsl: '0.3'\n",
+                author_id=test_user.id,
+            )
+            for i in range(3)
+        ]
+        db.add_all([other, *convs])
+        await db.commit()
+        ids = [c.id for c in convs]
+    other_headers = {"Authorization": f"Bearer {create_access_token({'sub': other.id})}"}
+
+    async def rate(conv_id, score, headers):
+        resp = await client.post(
+            f"/api/v1/conventions/{conv_id}/ratings", json={"score": score}, headers=headers
+        )
+        assert resp.status_code == 200
+
+    await rate(ids[0], 5, auth_headers)
+    await rate(ids[0], 2, other_headers)
+    await rate(ids[0], 3, other_headers)  # re-rating moves the score
+    await rate(ids[1], 5, other_headers)
+
+    stats = (
+        await client.get(f"/api/v1/conventions/{ids[0]}/ratings", headers=auth_headers)
+    ).json()
+    assert (stats["average"], stats["count"], stats["user_rating"]) == (4.0, 2, 5)
+    assert stats["histogram"] == [0, 0, 1, 0, 1]
+
+    resp = await client.get(
+        "/api/v1/conventions", params={"sort": "rating", "fields": "rating_avg,rating_count"}
+    )
+    assert [(c["id"], c["rating_avg"], c["rating_count"]) for c in resp.json()["items"]] == [
+        (ids[1], 5.0, 1),
+        (ids[0], 4.0, 2),
+        (ids[2], None, 0),
+    ]
+
+    # Rows written behind the aggregates' back are picked up by the repair job.
+    async with async_session() as db:
+        db.add(Rating(convention_id=ids[2], user_id=test_user.id, score=1))
+        await db.commit()
+    assert await repair_rating_aggregates(batch_size=2) == 1
+    assert await repair_rating_aggregates() == 0
+    stats = (await client.get(f"/api/v1/conventions/{ids[2]}/ratings")).json()
+    assert (stats["average"], stats["count"], stats["histogram"]) == (1.0, 1, [1, 0, 0, 0, 0])
+
+
+# ────────────────────── Auction index ──────────────────────
+
+
+AUCTION_YAML = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "15-17 balanced"}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+"""
+
+
+@pytest.mark.asyncio
+async def test_auction_lookup(client, test_user):
+    async with async_session() as db:
+        conv = Convention(
+            name="Auction test",
+            namespace="test/auction",
+            yaml_content=AUCTION_YAML,
+            author_id=test_user.id,
+        )
+        db.add(conv)
+        await db.commit()
+        conv_id = conv.id
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/auction", params={"seq": "1nt-2c"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["sequence"] == ["1NT", "2C"]
+    assert data["node"]["meaning"]["description"]["en"] == "Stayman"
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/auction")
+    assert [c["bid"] for c in resp.json()["continuations"]] == ["1NT"]
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/auction", params={"seq": "1NT-3C"})
+    assert resp.status_code == 404
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/auction", params={"seq": "1Q"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tree_tile(client, test_user):
+    async with async_session() as db:
+        conv = Convention(
+            name="Tile test",
+            namespace="test/tiles",
+            yaml_content=AUCTION_YAML,
+            author_id=test_user.id,
+        )
+        db.add(conv)
+        await db.commit()
+        conv_id = conv.id
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/tree.svg?depth=1")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/svg+xml"
+    assert 'data-auction="1NT" data-children="1"' in resp.text
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/tree.svg?prefix=1NT")
+    assert resp.status_code == 200
+    assert "data-children" not in resp.text
+
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/tree.svg?prefix=2C")
+    assert resp.status_code == 404
+    resp = await client.get(f"/api/v1/conventions/{conv_id}/tree.svg?depth=99")
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_similar_conventions(client, test_user):
+    variants = {
+        "test/base": AUCTION_YAML,
+        "test/base-v2": AUCTION_YAML.replace('"Stayman"', '"Puppet Stayman"'),
+        "test/other": 'bbdsl: "0.3"\nopenings:\n  - bid: "2C"\n  - bid: "2D"\n',
+    }
+    async with async_session() as db:
+        convs = {
+            ns: Convention(
+                name=ns,
+                namespace=ns,
+                yaml_content=content,
+                content_sha256=content_hash(content),
+                author_id=test_user.id,
+            )
+            for ns, content in variants.items()
+        }
+        db.add_all(convs.values())
+        await db.commit()
+    for content in variants.values():
+        await ensure_fingerprint(content)
+
+    resp = await client.get(f"/api/v1/conventions/{convs['test/base'].id}/similar")
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    # Descriptions do not count, so the reworded copy is identical in structure.
+    assert [(item["namespace"], item["similarity"]) for item in items] == [
+        ("test/base-v2", 1.0)
+    ]
+    resp = await client.get("/api/v1/conventions/9999/similar")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_diff_versions_is_http_cacheable(client, test_user):
+    async with async_session() as db:
+        for version, content in (
+            ("1.0.0", AUCTION_YAML),
+            ("1.1.0", AUCTION_YAML.replace("Stayman", "Puppet Stayman")),
+        ):
+            db.add(
+                Convention(
+                    name="Diff test",
+                    namespace="difftest",
+                    version=version,
+                    yaml_content=content,
+                    content_sha256=content_hash(content),
+                    author_id=test_user.id,
+                )
+            )
+        await db.commit()
+
+    url = "/api/v1/conventions/ns/difftest/diff?from=1.0.0&to=1.1.0"
+    resp = await client.get(url)
+    assert resp.status_code == 200
+    assert [c["status"] for c in resp.json()["diff_cases"]] == ["same", "different"]
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"].startswith("public")
+
+    resp = await client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    resp = await client.get(url + "&locale=zh-TW", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    resp = await client.get("/api/v1/conventions/ns/difftest/diff?from=1.0.0&to=9.9.9")
+    assert resp.status_code == 404
+
+
+CLASSIFY_YAML = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning:
+      description: {en: "15-17"}
+      hand: {hcp: {min: 15, max: 17}}
+"""
+
+
+@pytest.mark.asyncio
+async def test_classify_streams_opening_per_hand(client, test_user):
+    async with async_session() as db:
+        conv = Convention(
+            name="Classify test",
+            namespace="test/classify",
+            yaml_content=CLASSIFY_YAML,
+            author_id=test_user.id,
+        )
+        db.add(conv)
+        await db.commit()
+        conv_id = conv.id
+
+    resp = await client.post(
+        f"/api/v1/conventions/{conv_id}/classify",
+        json={"hands": ["AK2.KQ3.Q54.J432", "5432.432.432.432"]},
+    )
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [{"hand": 0, "bid": "1NT"}, {"hand": 1, "bid": "P"}]
+
+    resp = await client.post(
+        f"/api/v1/conventions/{conv_id}/classify", json={"hands": ["AK2"]}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_over_long_tags_are_rejected(client, test_user, auth_headers):
+    with pytest.raises(ValueError, match="64 characters"):
+        parse_tags("natural, " + "x" * 65)
+    assert parse_tags("x" * 64 + " , " + "  y " * 20) == ["x" * 64, " ".join("y" * 20)]
+
+    body = {
+        "name": "Long Tags",
+        "namespace": "test/longtags",
+        "tags": "natural," + "x" * 65,
+        "yaml_content": "bbdsl: '0.3'\n",
+    }
+    resp = await client.post("/api/v1/conventions", json=body, headers=auth_headers)
+    assert resp.status_code == 422
+    assert "64 characters" in resp.text
+
+    async with async_session() as db:
+        conv = Convention(
+            name="Tagged",
+            namespace="test/longtags",
+            tags="natural",
+            yaml_content="bbdsl: '0.3'\n",
+            author_id=test_user.id,
+        )
+        db.add(conv)
+        await db.flush()
+        await set_convention_tags(db, conv.id, conv.tags)
+        await db.commit()
+    resp = await client.put(
+        f"/api/v1/conventions/{conv.id}", json={"tags": "y" * 80}, headers=auth_headers
+    )
+    assert resp.status_code == 422
+    resp = await client.get("/api/v1/tags")
+    assert [t["name"] for t in resp.json()["items"]] == ["natural"]
@@ -0,0 +1,208 @@
+"""Tests for the bulk revalidation job and its admin endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import Base, async_session, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.convention import Convention
+from app.models.revalidation import RevalidationResult, RevalidationRun
+from app.models.share import Share
+from app.models.user import User
+from app.services import revalidation_service
+from app.services.revalidation_service import (
+    RevalidationError,
+    create_run,
+    get_run,
+    is_active,
+    run_revalidation,
+)
+
+VALID_YAML = 'bbdsl: "0.3"\nsystem:\n  name: Test {n}\n'
+BROKEN_YAML = "bbdsl: [unclosed\n"
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+async def admin(monkeypatch) -> User:
+    async with async_session() as db:
+        user = User(name="admin", github_id="gh-admin")
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+    monkeypatch.setattr(settings, "admin_user_ids", [user.id])
+    return user
+
+
+async def _store(admin: User, contents: list[str]) -> None:
+    async with async_session() as db:
+        for i, content in enumerate(contents):
+            db.add(
+                Convention(
+                    name=f"System {i}",
+                    namespace=f"test/s{i}",
+                    yaml_content=content,
+                    author_id=admin.id,
+                )
+            )
+        db.add(Share(yaml_content=BROKEN_YAML))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_run_records_every_row_and_resumes_after_interruption(admin):
+    contents = [VALID_YAML.format(n=n) for n in range(4)]
+    contents[2] = BROKEN_YAML
+    await _store(admin, contents)
+    run = await create_run(["conventions", "shares"])
+
+    def interrupt(run, source):
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        await run_revalidation(run.id, batch_size=2, on_progress=interrupt)
+    stopped = await get_run(run.id)
+    assert stopped.status == "failed"
+    assert stopped.cursor == {"conventions": 2}
+    assert stopped.processed == 2
+
+    done = await run_revalidation(run.id, batch_size=2)
+    assert done.status == "completed"
+    assert done.processed == 5
+    assert done.invalid == 2
+    async with async_session() as db:
+        results = (await db.execute(select(RevalidationResult))).scalars().all()
+    assert sorted((r.source, r.row_id) for r in results) == [
+        ("conventions", 1), ("conventions", 2), ("conventions", 3), ("conventions", 4),
+        ("shares", 1),
+    ]
+    assert {(r.source, r.row_id) for r in results if not r.valid} == {
+        ("conventions", 3), ("shares", 1)
+    }
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints(client, admin):
+    await _store(admin, [VALID_YAML.format(n=0), BROKEN_YAML])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.id})}"}
+
+    resp = await client.post("/api/v1/admin/revalidations", json={}, headers=headers)
+    assert resp.status_code == 202
+    run_id = resp.json()["id"]
+
+    resp = await client.get(f"/api/v1/admin/revalidations/{run_id}", headers=headers)
+    assert resp.json()["status"] == "completed"
+    assert resp.json()["processed"] == 2
+    resp = await client.get(
+        f"/api/v1/admin/revalidations/{run_id}/failures", headers=headers
+    )
+    assert [f["row_id"] for f in resp.json()] == [2]
+    resp = await client.post(
+        f"/api/v1/admin/revalidations/{run_id}/resume", headers=headers
+    )
+    assert resp.status_code == 409
+
+    resp = await client.post(
+        "/api/v1/admin/revalidations", json={"sources": ["users"]}, headers=headers
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_require_admin(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "admin_user_ids", [])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.id})}"}
+    resp = await client.post("/api/v1/admin/revalidations", json={}, headers=headers)
+    assert resp.status_code == 403
+
+
+async def _set_heartbeat(run_id: int, status: str, age_seconds: float) -> None:
+    async with async_session() as db:
+        await db.execute(
+            update(RevalidationRun)
+            .where(RevalidationRun.id == run_id)
+            .values(
+                status=status,
+                heartbeat_at=datetime.now(timezone.utc) - timedelta(seconds=age_seconds),
+            )
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_only_one_caller_claims_a_run(admin):
+    await _store(admin, [VALID_YAML.format(n=n) for n in range(3)])
+    run = await create_run(["conventions"])
+
+    outcomes = await asyncio.gather(
+        run_revalidation(run.id, batch_size=1),
+        run_revalidation(run.id, batch_size=1),
+        return_exceptions=True,
+    )
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], RevalidationError)
+    done = await get_run(run.id)
+    assert done.status == "completed"
+    assert done.processed == 3
+
+
+@pytest.mark.asyncio
+async def test_run_left_running_by_a_dead_process_is_taken_over(admin):
+    await _store(admin, [VALID_YAML.format(n=0)])
+    run = await create_run(["conventions"])
+
+    await _set_heartbeat(run.id, "running", age_seconds=5)
+    assert is_active(await get_run(run.id))
+    with pytest.raises(RevalidationError, match="already running"):
+        await run_revalidation(run.id)
+
+    await _set_heartbeat(run.id, "running", age_seconds=settings.revalidation_stale_seconds + 5)
+    assert not is_active(await get_run(run.id))
+    done = await run_revalidation(run.id)
+    assert done.status == "completed"
+    assert done.processed == 1
+
+
+@pytest.mark.asyncio
+async def test_run_stops_when_another_process_takes_it_over(admin, monkeypatch):
+    await _store(admin, [VALID_YAML.format(n=n) for n in range(3)])
+    run = await create_run(["conventions"])
+    process_batch = revalidation_service._process_batch
+
+    async def slow_batch(run_id, source, rows):
+        if rows[0].id == 2:
+            # This process stalled; another one claimed the run meanwhile.
+            await _set_heartbeat(run_id, "running", age_seconds=0)
+        return await process_batch(run_id, source, rows)
+
+    monkeypatch.setattr(revalidation_service, "_process_batch", slow_batch)
+    with pytest.raises(RevalidationError, match="taken over"):
+        await run_revalidation(run.id, batch_size=1)
+    stolen = await get_run(run.id)
+    assert stolen.status == "running"  # left to the new holder
+    assert stolen.processed == 1
+    assert stolen.cursor == {"conventions": 1}
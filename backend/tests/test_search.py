@@ -0,0 +1,40 @@
+"""Tests for the full-text search helpers."""
+
+from app.services.search_service import _fts5_query, _tsquery, query_terms, yaml_search_text
+
+SYSTEM = """\
+bbdsl: "0.3"
+system:
+  name: {en: "Precision Club", zh-TW: "精準制"}
+  description: {en: "Strong club system"}
+openings:
+  - bid: "1C"
+    meaning: {description: {en: "16+ HCP", zh-TW: "強梅花"}}
+    notes: "Artificial"
+    responses:
+      - bid: "1D"
+        meaning: {description: {en: "Negative"}}
+"""
+
+
+def test_yaml_search_text_collects_prose_in_every_locale():
+    body = yaml_search_text(SYSTEM)
+    for text in ("Precision Club", "精準制", "Strong club system", "強梅花", "Artificial"):
+        assert text in body
+    assert "1C" not in body and "0.3" not in body  # bids and versions are not prose
+    assert yaml_search_text("a: [unclosed") == ""
+
+
+def test_query_terms_and_backend_queries():
+    terms = query_terms("Strong 精準 cl")
+    assert terms == ["strong", "精準", "cl"]
+    assert _fts5_query(terms) == '"strong" "精 準" "cl"*'
+    assert _tsquery(terms) == "strong & (精 <-> 準) & cl:*"
+    # Query syntax is never passed through.
+    assert query_terms('"a" OR b* -c:') == ["a", "or", "b", "c"]
+
+
+def test_query_terms_split_cjk_out_of_latin_words():
+    assert query_terms("stayman斯台曼") == ["stayman", "斯台曼"]
+    assert query_terms("2/1進局forcing") == ["2", "1", "進局", "forcing"]
+    assert _fts5_query(query_terms("stayman斯台曼")) == '"stayman" "斯 台 曼"'
@@ -0,0 +1,76 @@
+"""Tests for JWT handling and the authentication dependencies."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.core.config import settings
+from app.core.database import Base, async_session, engine
+from app.core.security import create_access_token, get_current_user, require_admin
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def user() -> User:
+    async with async_session() as db:
+        user = User(name="member", github_id="gh-member")
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+
+async def _user_of(token: str) -> User | None:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    async with async_session() as db:
+        return await get_current_user(credentials, db)
+
+
+def _token(claims: dict) -> str:
+    return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def test_integer_subject_is_encoded_as_a_string():
+    token = create_access_token({"sub": 42})
+    payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    assert payload["sub"] == "42"
+
+
+@pytest.mark.asyncio
+async def test_token_resolves_to_its_user(user):
+    found = await _user_of(create_access_token({"sub": user.id}))
+    assert found is not None and found.id == user.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token",
+    [_token({"sub": "not-a-number"}), _token({"name": "no subject"}), "not.a.jwt"],
+    ids=["non-numeric", "missing", "malformed"],
+)
+async def test_unusable_subject_is_anonymous(user, token):
+    assert await _user_of(token) is None
+
+
+@pytest.mark.asyncio
+async def test_require_admin_checks_the_admin_list(user, monkeypatch):
+    monkeypatch.setattr(settings, "admin_user_ids", [])
+    with pytest.raises(HTTPException) as exc_info:
+        await require_admin(user)
+    assert exc_info.value.status_code == 403
+
+    monkeypatch.setattr(settings, "admin_user_ids", [user.id])
+    assert await require_admin(user) is user
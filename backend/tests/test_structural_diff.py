@@ -0,0 +1,53 @@
+"""Tests for the structural (bid-by-bid) system comparison."""
+
+from app.services.auction_index import compile_trie
+from app.services.diff_shards import mirror_report
+from app.services.structural_diff import structural_diff
+
+SYSTEM_A = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "15-17", zh-TW: "15-17 點"}, hand: {hcp: {min: 15, max: 17}}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+  - bid: "2C"
+    meaning: {description: {en: "Strong"}}
+"""
+
+SYSTEM_B = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "12-14"}, hand: {hcp: {min: 12, max: 14}}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+      - bid: "2D"
+        meaning: {description: {en: "Transfer"}}
+"""
+
+
+def test_cases_classify_every_auction_in_order():
+    report = structural_diff(compile_trie(SYSTEM_A), compile_trie(SYSTEM_B))
+    assert report["mode"] == "structural"
+    assert [(c["bid"], c["status"]) for c in report["diff_cases"]] == [
+        ("1NT", "different"),
+        ("1NT-2C", "same"),
+        ("1NT-2D", "only_b"),
+        ("2C", "only_a"),
+    ]
+    assert report["diff_cases"][0]["system_a"] == "15-17"
+    assert report["diff_cases"][3]["system_b"] is None
+    assert report["summary"] == {
+        "same": 1, "different": 1, "only_a": 1, "only_b": 1, "total": 4
+    }
+
+
+def test_reverse_comparison_mirrors_and_localizes():
+    trie_a, trie_b = compile_trie(SYSTEM_A), compile_trie(SYSTEM_B)
+    forward = structural_diff(trie_a, trie_b)
+    assert structural_diff(trie_b, trie_a) == mirror_report(forward)
+    localized = structural_diff(trie_a, trie_b, locale="zh-TW")
+    assert localized["diff_cases"][0]["system_a"] == "15-17 點"
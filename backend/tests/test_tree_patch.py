@@ -0,0 +1,57 @@
+"""Tests for the live bidding-tree preview patches."""
+
+from app.services.auction_index import compile_trie
+from app.services.tree_patch import TreePatcher, tree_nodes
+
+SYSTEM_A = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "15-17"}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+  - bid: "2C"
+    meaning: {description: {en: "Strong"}}
+"""
+
+SYSTEM_B = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "12-14"}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+      - bid: "2D"
+        meaning: {description: {en: "Transfer"}}
+"""
+
+
+def test_tree_nodes_in_bidding_order():
+    nodes = tree_nodes(compile_trie(SYSTEM_A))
+    assert list(nodes) == ["1NT", "1NT-2C", "2C"]
+    assert nodes["1NT-2C"] == {
+        "bid": "2C",
+        "payload": {"meaning": {"description": {"en": "Stayman"}}},
+    }
+
+
+def test_patches_carry_only_changed_nodes():
+    patcher = TreePatcher()
+    first = patcher.message(1, tree_nodes(compile_trie(SYSTEM_A)))
+    assert first["ops"] == [
+        {"op": "replace", "path": "/nodes", "value": tree_nodes(compile_trie(SYSTEM_A))}
+    ]
+
+    second = patcher.message(2, tree_nodes(compile_trie(SYSTEM_B)))
+    assert second["node_count"] == 3
+    assert [(op["op"], op["path"]) for op in second["ops"]] == [
+        ("remove", "/nodes/2C"),
+        ("replace", "/nodes/1NT"),
+        ("add", "/nodes/1NT-2D"),
+    ]
+    assert patcher.message(3, tree_nodes(compile_trie(SYSTEM_B)))["ops"] == []
+
+    patcher.reset()
+    assert patcher.message(4, {})["ops"] == [{"op": "replace", "path": "/nodes", "value": {}}]
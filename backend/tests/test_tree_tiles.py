@@ -0,0 +1,57 @@
+"""Tests for level-of-detail bidding-tree SVG tiles."""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.services.auction_index import compile_trie, parse_sequence
+from app.services.tree_tiles import render_tile
+
+SYSTEM = """\
+bbdsl: "0.3"
+openings:
+  - bid: "1NT"
+    meaning: {description: {en: "15-17 balanced", zh-TW: "15-17 平均牌型"}}
+    responses:
+      - bid: "2C"
+        meaning: {description: {en: "Stayman"}}
+        responses:
+          - bid: "2D"
+            meaning: {description: {en: "No major"}}
+          - bid: "2H"
+            meaning: {description: {en: "Four hearts"}}
+      - bid: "2D"
+        meaning: {description: {en: "Transfer <hearts>"}}
+  - bid: "1C"
+    meaning: {description: {en: "Clubs"}}
+"""
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _nodes(svg: str) -> dict[str, dict]:
+    root = ET.fromstring(svg)
+    return {g.get("data-auction"): g.attrib for g in root.iter(f"{SVG}g")}
+
+
+def test_tile_collapses_nodes_below_depth():
+    trie = compile_trie(SYSTEM)
+    nodes = _nodes(render_tile(trie, [], 2))
+    assert set(nodes) == {"", "1C", "1NT", "1NT-2C", "1NT-2D"}
+    assert nodes["1NT-2C"]["class"] == "bbdsl-node bbdsl-collapsed"
+    assert nodes["1NT-2C"]["data-children"] == "2"
+    assert "data-children" not in nodes["1NT-2D"]
+
+
+def test_tile_expands_from_prefix_and_localizes_labels():
+    trie = compile_trie(SYSTEM)
+    nodes = _nodes(render_tile(trie, parse_sequence("1NT-2C"), 1))
+    assert set(nodes) == {"1NT-2C", "1NT-2C-2D", "1NT-2C-2H"}
+    assert "data-children" not in render_tile(trie, parse_sequence("1NT-2C"), 1)
+    assert "15-17 平均牌型" in render_tile(trie, [], 1, locale="zh-TW")
+    assert "Transfer &lt;hearts&gt;" in render_tile(trie, parse_sequence("1NT"), 1)
+
+
+def test_unknown_prefix_raises_key_error():
+    with pytest.raises(KeyError):
+        render_tile(compile_trie(SYSTEM), parse_sequence("2C"), 2)
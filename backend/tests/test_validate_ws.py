@@ -1,15 +1,190 @@
 """Tests for the WebSocket validation endpoint."""
 
+import asyncio
+import weakref
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from starlette.testclient import TestClient
 
+from app import main
+from app.api.v1 import validate as validate_api
+from app.core.config import settings
 from app.main import app
+from app.services import validation_session
+from app.services.validation_session import ValidationSession, parse_message
+from app.services.worker_pool import WorkerPool
 
 
 # Note: WebSocket testing requires starlette.testclient.TestClient
 # These are placeholder tests for the validation service.
 
 
+@pytest.fixture(autouse=True)
+def _lifespan_pool(monkeypatch):
+    """Give the app lifespan its own pool: it shuts that pool down on exit."""
+    pool = WorkerPool(processes=0, max_queue=1, timeout=5, max_tasks_per_worker=1)
+    monkeypatch.setattr(main, "pool", pool)
+
+
 def test_placeholder():
     """Placeholder — real WebSocket tests use TestClient."""
     assert True
+
+
+# ── Coalescing and sequence numbers ──
+
+def test_parse_message():
+    assert parse_message("system: {}\n") == (None, "system: {}\n")
+    assert parse_message('{"seq": 7, "yaml": "a: 1"}') == (7, "a: 1")
+    assert parse_message('{"seq": "x", "yaml": "a: 1"}') == (None, "a: 1")
+    # Flow-style YAML that is not an envelope is validated as is.
+    assert parse_message('{"system": {}}') == (None, '{"system": {}}')
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent: list[dict] = []
+        self.validated: list[str] = []
+        self.gate = asyncio.Event()
+
+    async def validate(self, text: str) -> dict:
+        self.validated.append(text)
+        await self.gate.wait()
+        if text == "bad":
+            raise ValueError("broken")
+        return {"error_count": 0, "text": text}
+
+    async def send(self, message: dict) -> None:
+        self.sent.append(message)
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_session_keeps_only_newest_pending_document():
+    rec = _Recorder()
+    session = ValidationSession(rec.validate, rec.send, max_inflight=1)
+    dispatcher = asyncio.create_task(session.run())
+    try:
+        await session.submit(1, "one")
+        await _settle()  # "one" starts and blocks on the gate
+        for seq, text in ((2, "two"), (3, "three"), (4, "four")):
+            await session.submit(seq, text)
+        rec.gate.set()
+        await _settle()
+    finally:
+        dispatcher.cancel()
+
+    # "two" and "three" never ran; "one" ran but its report was discarded.
+    assert rec.validated == ["one", "four"]
+    assert rec.sent == [
+        {"status": "superseded", "seq": 2},
+        {"status": "superseded", "seq": 3},
+        {"status": "superseded", "seq": 1},
+        {"status": "ok", "seq": 4, "report": {"error_count": 0, "text": "four"}},
+    ]
+    assert session.superseded == 3
+
+
+async def test_session_numbers_bare_documents_and_reports_errors():
+    rec = _Recorder()
+    rec.gate.set()
+    session = ValidationSession(rec.validate, rec.send)
+    dispatcher = asyncio.create_task(session.run())
+    try:
+        await session.submit(None, "ok")
+        await _settle()
+        await session.submit(None, "bad")
+        await _settle()
+    finally:
+        dispatcher.cancel()
+    assert [(m["status"], m["seq"]) for m in rec.sent] == [("ok", 1), ("error", 2)]
+    assert rec.sent[1]["message"] == "broken"
+
+
+async def test_session_respects_global_limit(monkeypatch):
+    monkeypatch.setattr(settings, "ws_validate_max_concurrent", 1)
+    monkeypatch.setattr(validation_session, "_global_slots", weakref.WeakKeyDictionary())
+    first, second = _Recorder(), _Recorder()
+    sessions = [
+        ValidationSession(first.validate, first.send),
+        ValidationSession(second.validate, second.send),
+    ]
+    dispatchers = [asyncio.create_task(s.run()) for s in sessions]
+    try:
+        await sessions[0].submit(1, "a")
+        await sessions[1].submit(1, "b")
+        await _settle()
+        assert first.validated == ["a"] and second.validated == []
+        first.gate.set()
+        second.gate.set()
+        await _settle()
+        assert second.validated == ["b"]
+    finally:
+        for dispatcher in dispatchers:
+            dispatcher.cancel()
+
+
+def test_ws_validate_echoes_client_seq():
+    with TestClient(app) as client, client.websocket_connect("/api/v1/validate") as ws:
+        ws.send_text('{"seq": 41, "yaml": "bbdsl: \\"0.3\\"\\n"}')
+        message = ws.receive_json()
+        assert message["seq"] == 41
+        assert message["status"] in ("ok", "error")
+        ws.send_text('bbdsl: "0.3"\n')
+        assert ws.receive_json()["seq"] == 2
+
+
+def test_ws_validate_delta_protocol(monkeypatch):
+    async def fake_validate(text: str) -> dict:
+        results = [
+            {"rule_id": "val-000", "severity": "warning", "message": line}
+            for line in text.splitlines()
+            if line.startswith("TODO")
+        ]
+        return {"error_count": 0, "warning_count": len(results), "results": results}
+
+    monkeypatch.setattr(validate_api, "_validate_uncached", fake_validate)
+    with TestClient(app) as client, client.websocket_connect(
+        "/api/v1/validate?protocol=2"
+    ) as ws:
+        ws.send_json({"type": "sync", "version": 1, "text": "a: 1\nTODO one\n"})
+        first = ws.receive_json()
+        assert (first["type"], first["version"], first["reset"]) == ("diagnostics", 1, True)
+        assert [d["message"] for d in first["added"]] == ["TODO one"]
+
+        # Replace "one" by "two": one diagnostic removed, one added.
+        change = {"offset": 10, "length": 3, "text": "two"}
+        ws.send_json({"type": "edit", "base": 1, "version": 2, "changes": [change]})
+        second = ws.receive_json()
+        assert second["version"] == 2 and second["reset"] is False
+        assert [d["message"] for d in second["added"]] == ["TODO two"]
+        assert second["removed"] == [first["added"][0]["id"]]
+
+        ws.send_json({"type": "edit", "base": 1, "version": 3, "changes": [change]})
+        assert ws.receive_json() == {
+            "type": "resync",
+            "version": 2,
+            "reason": "Edit is based on version 1, buffer is at 2",
+        }
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+
+def test_ws_preview_pushes_tree_patches():
+    one = 'openings:\n  - bid: "1NT"\n'
+    with TestClient(app) as client, client.websocket_connect("/api/v1/preview") as ws:
+        ws.send_text(one)
+        first = ws.receive_json()
+        assert (first["type"], first["version"], first["node_count"]) == ("patch", 1, 1)
+        assert first["ops"][0]["path"] == "/nodes"
+
+        ws.send_text(one + '    responses:\n      - bid: "2C"\n')
+        assert ws.receive_json()["ops"] == [
+            {"op": "add", "path": "/nodes/1NT-2C", "value": {"bid": "2C", "payload": {}}}
+        ]
+        ws.send_text("- not a mapping")
+        assert ws.receive_json()["type"] == "error"
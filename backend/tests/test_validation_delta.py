@@ -0,0 +1,73 @@
+"""Tests for the delta protocol of the validation WebSocket."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.validation_delta import DiagnosticsDelta, EditBuffer, OutOfSyncError
+
+
+def _edit(offset, length, text):
+    return {"offset": offset, "length": length, "text": text}
+
+
+def test_edits_apply_in_order():
+    buffer = EditBuffer()
+    buffer.sync(1, "system:\n  name: Test\n")
+    text = buffer.apply(1, 2, [_edit(16, 4, "Precision"), _edit(0, 0, "# x\n")])
+    assert text == "# x\nsystem:\n  name: Precision\n"
+    assert buffer.version == 2
+
+
+def test_offsets_count_utf16_code_units():
+    buffer = EditBuffer()
+    buffer.sync(1, "a: 🂡 黑桃\n")  # the card is two UTF-16 code units
+    assert buffer.apply(1, 2, [_edit(6, 2, "紅心")], length=9) == "a: 🂡 紅心\n"
+    with pytest.raises(OutOfSyncError, match="surrogate"):
+        buffer.apply(2, 3, [_edit(4, 1, "")])
+
+
+@pytest.mark.parametrize(
+    "base, changes, length",
+    [
+        (7, [_edit(0, 0, "x")], None),  # stale base version
+        (1, [_edit(99, 0, "x")], None),  # outside the document
+        (1, [{"offset": 0}], None),  # malformed
+        (1, [_edit(0, 0, "x")], 3),  # length check fails
+    ],
+)
+def test_bad_edits_leave_buffer_unchanged(base, changes, length):
+    buffer = EditBuffer()
+    buffer.sync(1, "abc")
+    with pytest.raises(OutOfSyncError):
+        buffer.apply(base, 2, changes, length)
+    assert (buffer.version, buffer.text) == (1, "abc")
+
+
+def test_edit_before_sync_needs_resync():
+    with pytest.raises(OutOfSyncError):
+        EditBuffer().apply(0, 1, [])
+
+
+def _report(*messages):
+    results = [{"rule_id": "val-001", "severity": "error", "message": m} for m in messages]
+    return {"error_count": len(results), "warning_count": 0, "results": results}
+
+
+def test_diagnostics_delta():
+    delta = DiagnosticsDelta()
+    first = delta.message(1, _report("a", "b", "b"))
+    assert first["reset"] is True
+    assert [d["message"] for d in first["added"]] == ["a", "b", "b"]
+    assert len({d["id"] for d in first["added"]}) == 3
+
+    second = delta.message(2, _report("b", "c"))
+    assert second["reset"] is False
+    assert [d["message"] for d in second["added"]] == ["c"]
+    ids = {d["message"] + str(i): d["id"] for i, d in enumerate(first["added"])}
+    assert sorted(second["removed"]) == sorted([ids["a0"], ids["b2"]])
+    assert second["summary"] == {"error_count": 2, "warning_count": 0}
+
+    assert delta.message(3, _report("b", "c"))["added"] == []
+    delta.reset()
+    assert len(delta.message(4, _report("b", "c"))["added"]) == 2
@@ -0,0 +1,139 @@
+"""Tests for the persisted validation report cache."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from app.core.database import Base, async_session, engine
+from app.main import app
+from app.models.convention import Convention
+from app.models.user import User
+from app.models.validation import ValidationRecord
+from app.services import validation_service
+from app.services.bbdsl_service import BBDSL_VERSION, content_hash
+from app.services.validation_service import (
+    get_stored_report,
+    purge_stale_reports,
+    schema_version,
+    validate_cached,
+)
+
+CONTENT = 'bbdsl: "0.3"\nsystem:\n  name: Cached\n'
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+def validator_calls(monkeypatch) -> list[str]:
+    """Replace the pooled validator; returns the contents it was run on."""
+    calls: list[str] = []
+
+    async def fake_run_in_pool(fn, content):
+        calls.append(content)
+        return {"results": [], "error_count": 0, "warning_count": len(calls)}
+
+    monkeypatch.setattr(validation_service, "run_in_pool", fake_run_in_pool)
+    return calls
+
+
+async def _add_record(bbdsl_version: str, schema: str, content: str = CONTENT) -> None:
+    async with async_session() as db:
+        db.add(
+            ValidationRecord(
+                content_sha256=content_hash(content),
+                bbdsl_version=bbdsl_version,
+                schema_version=schema,
+                report={"results": [], "error_count": 0, "warning_count": 99},
+            )
+        )
+        await db.commit()
+
+
+def test_schema_version_reads_the_declaration():
+    assert schema_version(CONTENT) == "0.3"
+    assert schema_version("bbdsl_version: 0.2\n") == "0.2"
+    assert schema_version("system: {}\n") == ""
+
+
+@pytest.mark.asyncio
+async def test_second_validation_is_served_from_the_table(validator_calls):
+    first, cached = await validate_cached(CONTENT)
+    assert not cached
+    second, cached = await validate_cached(CONTENT)
+    assert cached
+    assert second == first
+    assert validator_calls == [CONTENT]
+
+
+@pytest.mark.asyncio
+async def test_unstored_validation_is_not_persisted(validator_calls):
+    await validate_cached(CONTENT, store=False)
+    assert await get_stored_report(CONTENT) is None
+    _, cached = await validate_cached(CONTENT)
+    assert not cached
+    assert len(validator_calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "bbdsl_version, schema",
+    [(BBDSL_VERSION, "0.2"), ("0.0.0-old", "0.3")],
+    ids=["other-schema-version", "other-bbdsl-version"],
+)
+async def test_report_of_another_version_is_a_miss(validator_calls, bbdsl_version, schema):
+    await _add_record(bbdsl_version, schema)
+    report, cached = await validate_cached(CONTENT)
+    assert not cached
+    assert report["warning_count"] == 1
+    assert validator_calls == [CONTENT]
+
+
+@pytest.mark.asyncio
+async def test_purge_drops_only_reports_of_other_bbdsl_versions():
+    await _add_record(BBDSL_VERSION, "0.3")
+    await _add_record(BBDSL_VERSION, "0.2")
+    await _add_record("0.0.0-old", "0.3")
+    await _add_record("0.0.0-older", "0.3")
+
+    assert await purge_stale_reports() == 2
+    async with async_session() as db:
+        versions = (await db.execute(select(ValidationRecord.bbdsl_version))).scalars()
+        assert set(versions) == {BBDSL_VERSION}
+    assert await purge_stale_reports() == 0
+    assert (await get_stored_report(CONTENT))["warning_count"] == 99
+
+
+@pytest.mark.asyncio
+async def test_validation_endpoint_reports_validator_errors(monkeypatch):
+    async def failing_run_in_pool(fn, content):
+        raise ValueError("mapping values are not allowed here")
+
+    monkeypatch.setattr(validation_service, "run_in_pool", failing_run_in_pool)
+    async with async_session() as db:
+        user = User(name="author", github_id="gh-author")
+        db.add(user)
+        await db.flush()
+        conv = Convention(
+            name="Broken", namespace="test/broken", yaml_content=CONTENT, author_id=user.id
+        )
+        db.add(conv)
+        await db.commit()
+        conv_id = conv.id
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/v1/conventions/{conv_id}/validation")
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "mapping values are not allowed here"
+    async with async_session() as db:
+        assert await db.scalar(select(func.count()).select_from(ValidationRecord)) == 0
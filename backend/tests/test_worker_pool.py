@@ -0,0 +1,103 @@
+"""Tests for the bbdsl worker process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.services.worker_pool import (
+    PoolSaturatedError,
+    TaskTimeoutError,
+    WorkerPool,
+    WorkerPoolError,
+)
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _fail(message: str) -> None:
+    raise ValueError(message)
+
+
+@pytest.fixture
+async def pool():
+    p = WorkerPool(processes=1, max_queue=1, timeout=10, max_tasks_per_worker=3)
+    yield p
+    await p.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_runs_task_in_another_process(pool):
+    assert await pool.run(_add, 2, 3) == 5
+    assert await pool.run(_pid) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_task_exception_propagates(pool):
+    with pytest.raises(ValueError, match="boom"):
+        await pool.run(_fail, "boom")
+    # The worker survives a task exception.
+    assert await pool.run(_add, 1, 1) == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_worker_and_pool_recovers(pool):
+    pid = await pool.run(_pid)
+    with pytest.raises(TaskTimeoutError):
+        await pool.run(_sleep, 30, timeout=0.5)
+    assert pool.stats()["timeouts"] == 1
+    assert await pool.run(_pid) != pid
+
+
+@pytest.mark.asyncio
+async def test_worker_recycled_after_max_tasks(pool):
+    pids = [await pool.run(_pid) for _ in range(4)]
+    assert len(set(pids[:3])) == 1
+    assert pids[3] != pids[0]
+    assert pool.stats()["recycled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_work(pool):
+    running = asyncio.gather(pool.run(_sleep, 1), pool.run(_sleep, 0))
+    await asyncio.sleep(0.05)
+    with pytest.raises(PoolSaturatedError):
+        await pool.run(_add, 1, 2)
+    assert await running == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_runs_in_thread():
+    inline = WorkerPool(processes=0, max_queue=4, timeout=5, max_tasks_per_worker=10)
+    assert await inline.run(_pid) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stops_busy_workers_and_rejects_new_work(pool):
+    pool.max_queue = 2
+    running = asyncio.create_task(pool.run(_sleep, 0.5))
+    waiting = asyncio.create_task(pool.run(_add, 1, 2))
+    await asyncio.sleep(0.2)
+    await pool.shutdown()
+
+    with pytest.raises(WorkerPoolError, match="shut down"):
+        await waiting
+    assert await running == 0.5
+    assert pool.stats()["idle"] == 0 and pool.stats()["busy"] == 0
+    with pytest.raises(WorkerPoolError, match="shut down"):
+        await pool.run(_add, 1, 2)
+    assert pool.stats()["idle"] == 0
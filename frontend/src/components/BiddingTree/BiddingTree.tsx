@@ -1,9 +1,91 @@
+import { memo, useMemo } from 'react'
+import type { TreeNode } from '../../lib/ws'
+
 interface BiddingTreeProps {
   svgHtml: string
+  /** Live tree from the preview channel, keyed by auction (`1NT-2C`). */
+  nodes?: Record<string, TreeNode>
+}
+
+function describe(node: TreeNode): string {
+  const description = node.payload.meaning?.description
+  if (typeof description === 'string') return description
+  if (description) return description['zh-TW'] ?? description.en ?? Object.values(description)[0] ?? ''
+  return node.payload.convention ?? ''
+}
+
+const STRAINS = ['C', 'D', 'H', 'S', 'NT']
+const CALLS: Record<string, number> = { P: 35, X: 36, XX: 37 }
+
+/** Position of a canonical call in bidding order (as the server sorts them). */
+function bidRank(bid: string): number {
+  if (bid in CALLS) return CALLS[bid]
+  return (Number(bid[0]) - 1) * 5 + STRAINS.indexOf(bid.slice(1))
+}
+
+interface BranchProps {
+  auction: string
+  nodes: Record<string, TreeNode>
+  index: Map<string, string[]>
+}
+
+/**
+ * One node and its subtree.  Patches keep unchanged nodes' identity, so
+ * React only re-renders the branches a patch touched.
+ */
+const Branch = memo(function Branch({ auction, nodes, index }: BranchProps) {
+  const node = nodes[auction]
+  const kids = index.get(auction) ?? []
+  return (
+    <li>
+      <span className="font-mono font-semibold">{node.bid}</span>{' '}
+      <span className="text-gray-600">{describe(node)}</span>
+      {kids.length > 0 && (
+        <ul className="ml-4 border-l pl-2">
+          {kids.map((kid) => (
+            <Branch key={kid} auction={kid} nodes={nodes} index={index} />
+          ))}
+        </ul>
+      )}
+    </li>
+  )
+}, (prev, next) => prev.auction === next.auction && subtreeUnchanged(prev.auction, prev, next))
+
+function subtreeUnchanged(auction: string, prev: BranchProps, next: BranchProps): boolean {
+  if (prev.nodes[auction] !== next.nodes[auction]) return false
+  const before = prev.index.get(auction) ?? []
+  const after = next.index.get(auction) ?? []
+  if (before.length !== after.length) return false
+  return after.every((kid, i) => kid === before[i] && subtreeUnchanged(kid, prev, next))
 }
 
-export default function BiddingTree({ svgHtml }: BiddingTreeProps) {
-  if (!svgHtml) {
+export default function BiddingTree({ svgHtml, nodes }: BiddingTreeProps) {
+  const index = useMemo(() => {
+    const byParent = new Map<string, string[]>()
+    for (const auction of Object.keys(nodes ?? {})) {
+      const cut = auction.lastIndexOf('-')
+      const parent = cut < 0 ? '' : auction.slice(0, cut)
+      const list = byParent.get(parent)
+      if (list) list.push(auction)
+      else byParent.set(parent, [auction])
+    }
+    for (const list of byParent.values()) {
+      list.sort((a, b) => bidRank(nodes![a].bid) - bidRank(nodes![b].bid))
+    }
+    return byParent
+  }, [nodes])
+
+  if (svgHtml) {
+    return (
+      <div
+        className="overflow-auto border rounded bg-white p-2"
+        dangerouslySetInnerHTML={{ __html: svgHtml }}
+      />
+    )
+  }
+
+  const roots = index.get('') ?? []
+  if (!nodes || roots.length === 0) {
     return (
       <p className="text-sm text-gray-400">
         點擊「預覽叫牌樹」按鈕以產生 SVG 圖表。
@@ -12,9 +94,10 @@ export default function BiddingTree({ svgHtml }: BiddingTreeProps) {
   }
 
   return (
-    <div
-      className="overflow-auto border rounded bg-white p-2"
-      dangerouslySetInnerHTML={{ __html: svgHtml }}
-    />
+    <ul className="overflow-auto border rounded bg-white p-2 text-sm">
+      {roots.map((auction) => (
+        <Branch key={auction} auction={auction} nodes={nodes} index={index} />
+      ))}
+    </ul>
   )
 }
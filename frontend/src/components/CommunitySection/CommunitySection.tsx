@@ -41,7 +41,7 @@ export default function CommunitySection({
           page_size: 20,
         })
         setComments(data.items)
-        setCommentTotal(data.total)
+        setCommentTotal(data.total ?? 0)
         setCommentPage(page)
       } catch {
         // ignore
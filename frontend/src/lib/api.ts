@@ -20,9 +20,19 @@ export interface Convention {
 
 export interface ConventionListResponse {
   items: Convention[]
-  total: number
+  /** Null on cursor pages (see the `count` parameter). */
+  total: number | null
+  total_estimated: boolean
   page: number
   page_size: number
+  /** Cursor of the next page; null on the last one. */
+  next_cursor: string | null
+}
+
+export interface TagCount {
+  name: string
+  /** Conventions carrying the tag. */
+  count: number
 }
 
 export interface ConventionCreateRequest {
@@ -51,9 +61,13 @@ export interface NamespaceInfo {
 
 export interface NamespaceListResponse {
   items: NamespaceInfo[]
-  total: number
+  /** Null on cursor pages (see the `count` parameter). */
+  total: number | null
+  total_estimated: boolean
   page: number
   page_size: number
+  /** Cursor of the next page; null on the last one. */
+  next_cursor: string | null
 }
 
 // ── Draft types (5.2.3) ──
@@ -68,9 +82,13 @@ export interface Draft {
 
 export interface DraftListResponse {
   items: Draft[]
-  total: number
+  /** Null on cursor pages (see the `count` parameter). */
+  total: number | null
+  total_estimated: boolean
   page: number
   page_size: number
+  /** Cursor of the next page; null on the last one. */
+  next_cursor: string | null
 }
 
 // ── Share types (5.2.4) ──
@@ -91,6 +109,8 @@ export interface RatingStats {
   convention_id: number
   average: number
   count: number
+  /** Number of 1…5-star ratings. */
+  histogram: number[]
   user_rating: number | null
 }
 
@@ -115,9 +135,13 @@ export interface CommentItem {
 
 export interface CommentListResponse {
   items: CommentItem[]
-  total: number
+  /** Null on cursor pages (see the `count` parameter). */
+  total: number | null
+  total_estimated: boolean
   page: number
   page_size: number
+  /** Cursor of the next page; null on the last one. */
+  next_cursor: string | null
 }
 
 // ── Recommendation types (5.3.6) ──
@@ -181,25 +205,43 @@ export const apiClient = {
   /** List/search conventions with pagination. */
   listConventions(params?: {
     q?: string
-    tag?: string
+    /** Exact tag(s); several match all of them unless `tag_mode` is `any`. */
+    tag?: string | string[]
+    tag_mode?: 'all' | 'any'
     namespace?: string
     author?: string
     sort?: string
     page?: number
     page_size?: number
+    /** Item fields to return (default: the summary fields). */
+    fields?: string[]
+    /** `next_cursor` of the previous page (replaces `page`). */
+    cursor?: string
   }): Promise<ConventionListResponse> {
     const sp = new URLSearchParams()
     if (params?.q) sp.set('q', params.q)
-    if (params?.tag) sp.set('tag', params.tag)
+    for (const tag of [params?.tag ?? []].flat()) sp.append('tag', tag)
+    if (params?.tag_mode) sp.set('tag_mode', params.tag_mode)
     if (params?.namespace) sp.set('namespace', params.namespace)
     if (params?.author) sp.set('author', params.author)
     if (params?.sort) sp.set('sort', params.sort)
     if (params?.page) sp.set('page', String(params.page))
     if (params?.page_size) sp.set('page_size', String(params.page_size))
+    if (params?.fields) sp.set('fields', params.fields.join(','))
+    if (params?.cursor) sp.set('cursor', params.cursor)
     const qs = sp.toString()
     return request(`/conventions${qs ? '?' + qs : ''}`)
   },
 
+  /** Most used tags with their convention counts. */
+  listTags(params?: { q?: string; limit?: number }): Promise<{ items: TagCount[] }> {
+    const sp = new URLSearchParams()
+    if (params?.q) sp.set('q', params.q)
+    if (params?.limit) sp.set('limit', String(params.limit))
+    const qs = sp.toString()
+    return request(`/tags${qs ? '?' + qs : ''}`)
+  },
+
   /** Get a single convention by ID. */
   getConvention(id: number): Promise<Convention> {
     return request(`/conventions/${id}`)
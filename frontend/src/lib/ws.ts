@@ -1,5 +1,11 @@
 /**
- * WebSocket client for real-time BBDSL YAML validation.
+ * WebSocket clients for the editor's live channels (validation, preview).
+ *
+ * Both speak the delta protocol (`?protocol=2`): after an initial `sync`
+ * with the whole document, each change is sent as a single text edit
+ * against the server's copy.  Validation answers with only the
+ * diagnostics that were added or removed; the preview with a JSON Patch
+ * of the bidding tree.  Full state is rebuilt here.
  */
 
 export interface ValidationResultItem {
@@ -16,32 +22,99 @@ export interface ValidationReport {
 }
 
 export interface WsValidationMessage {
-  status: 'ok' | 'error'
+  /** ``superseded``: a newer document was sent before this one's report. */
+  status: 'ok' | 'error' | 'superseded'
+  /** Version of the document this message answers. */
+  seq: number
   report: ValidationReport
   message?: string
 }
 
+/** One auction of the live bidding tree, keyed by auction (`1NT-2C`). */
+export interface TreeNode {
+  bid: string
+  payload: {
+    meaning?: { description?: string | Record<string, string> } & Record<string, unknown>
+    convention?: string
+    [key: string]: unknown
+  }
+}
+
+type Diagnostic = ValidationResultItem & { id: string }
+
+type PatchOp =
+  | { op: 'add' | 'replace'; path: string; value: unknown }
+  | { op: 'remove'; path: string }
+
+type ServerMessage =
+  | {
+      type: 'diagnostics'
+      version: number
+      reset: boolean
+      added: Diagnostic[]
+      removed: string[]
+      summary: Omit<ValidationReport, 'results'>
+    }
+  | { type: 'patch'; version: number; node_count: number; ops: PatchOp[] }
+  | { type: 'resync'; version: number | null }
+  | { type: 'error' | 'superseded'; version?: number; message?: string }
+
+/** The single replacement turning `prev` into `next` (common prefix/suffix). */
+function textEdit(prev: string, next: string) {
+  let start = 0
+  const max = Math.min(prev.length, next.length)
+  while (start < max && prev.charCodeAt(start) === next.charCodeAt(start)) start++
+  let end = 0
+  while (
+    end < max - start &&
+    prev.charCodeAt(prev.length - 1 - end) === next.charCodeAt(next.length - 1 - end)
+  ) {
+    end++
+  }
+  return {
+    offset: start,
+    length: prev.length - start - end,
+    text: next.slice(start, next.length - end),
+  }
+}
+
 /**
- * Create a debounced WebSocket connection for real-time validation.
+ * Debounced, reconnecting edit channel to `/api/v1/{path}?protocol=2`.
  *
- * @param onMessage Callback invoked when a validation report is received.
- * @param debounceMs Debounce delay in milliseconds (default 500).
+ * @param handle Called with every server message except `resync`, and
+ *   the version of the newest document sent.
  */
-export function createValidationWs(
-  onMessage: (msg: WsValidationMessage) => void,
-  debounceMs = 500,
+function createEditChannel(
+  path: string,
+  handle: (data: ServerMessage, version: number) => void,
+  debounceMs: number,
 ) {
   const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws'
-  const url = `${protocol}://${window.location.host}/api/v1/validate`
+  const url = `${protocol}://${window.location.host}/api/v1/${path}?protocol=2`
   let ws: WebSocket | null = null
   let timer: ReturnType<typeof setTimeout> | null = null
+  let version = 0
+  // Text the server holds (null: it holds nothing we can edit).
+  let serverText: string | null = null
+  let latestText = ''
+
+  function sync() {
+    version += 1
+    ws?.send(JSON.stringify({ type: 'sync', version, text: latestText }))
+    serverText = latestText
+  }
 
   function connect() {
     ws = new WebSocket(url)
+    serverText = null
+    ws.onopen = () => {
+      if (latestText) sync()
+    }
     ws.onmessage = (event) => {
       try {
-        const data: WsValidationMessage = JSON.parse(event.data)
-        onMessage(data)
+        const data: ServerMessage = JSON.parse(event.data)
+        if (data.type === 'resync') sync()
+        else handle(data, version)
       } catch {
         console.error('Failed to parse WS message')
       }
@@ -56,11 +129,26 @@ export function createValidationWs(
 
   return {
     send(yamlText: string) {
+      latestText = yamlText
       if (timer) clearTimeout(timer)
       timer = setTimeout(() => {
-        if (ws?.readyState === WebSocket.OPEN) {
-          ws.send(yamlText)
+        if (ws?.readyState !== WebSocket.OPEN) return
+        if (serverText === null) {
+          sync()
+          return
         }
+        const base = version
+        version += 1
+        ws.send(
+          JSON.stringify({
+            type: 'edit',
+            base,
+            version,
+            length: yamlText.length,
+            changes: [textEdit(serverText, yamlText)],
+          }),
+        )
+        serverText = yamlText
       }, debounceMs)
     },
     close() {
@@ -69,3 +157,73 @@ export function createValidationWs(
     },
   }
 }
+
+/**
+ * Create a debounced WebSocket connection for real-time validation.
+ *
+ * @param onMessage Callback invoked when a validation report is received.
+ * @param debounceMs Debounce delay in milliseconds (default 500).
+ */
+export function createValidationWs(
+  onMessage: (msg: WsValidationMessage) => void,
+  debounceMs = 500,
+) {
+  let diagnostics = new Map<string, ValidationResultItem>()
+
+  function report(summary: Partial<ValidationReport>): ValidationReport {
+    return {
+      error_count: summary.error_count ?? 0,
+      warning_count: summary.warning_count ?? 0,
+      results: [...diagnostics.values()],
+    }
+  }
+
+  return createEditChannel(
+    'validate',
+    (data, version) => {
+      if (data.type === 'error' && data.version === version) {
+        onMessage({ status: 'error', seq: version, report: report({}), message: data.message })
+      }
+      if (data.type !== 'diagnostics') return
+      if (data.reset) diagnostics = new Map()
+      for (const id of data.removed) diagnostics.delete(id)
+      for (const { id, ...item } of data.added) diagnostics.set(id, item)
+      // Replies to older documents can still be in flight.
+      if (data.version !== version) return
+      onMessage({ status: 'ok', seq: data.version, report: report(data.summary) })
+    },
+    debounceMs,
+  )
+}
+
+/**
+ * Create a debounced WebSocket connection for the live bidding-tree
+ * preview.  `onTree` receives a new map whose unchanged nodes keep their
+ * identity, so components can skip re-rendering them.
+ */
+export function createPreviewWs(
+  onTree: (nodes: Record<string, TreeNode>) => void,
+  debounceMs = 800,
+) {
+  let nodes: Record<string, TreeNode> = {}
+
+  return createEditChannel(
+    'preview',
+    (data) => {
+      if (data.type !== 'patch') return
+      let next = { ...nodes }
+      for (const op of data.ops) {
+        if (op.path === '/nodes') {
+          next = op.op === 'remove' ? {} : { ...(op.value as Record<string, TreeNode>) }
+          continue
+        }
+        const key = op.path.slice('/nodes/'.length).replace(/~1/g, '/').replace(/~0/g, '~')
+        if (op.op === 'remove') delete next[key]
+        else next[key] = op.value as TreeNode
+      }
+      nodes = next
+      onTree(nodes)
+    },
+    debounceMs,
+  )
+}
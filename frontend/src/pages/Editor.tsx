@@ -5,7 +5,12 @@ import ValidationPanel from '../components/ValidationPanel/ValidationPanel'
 import BiddingTree from '../components/BiddingTree/BiddingTree'
 import ConventionBrowser from '../components/ConventionBrowser/ConventionBrowser'
 import { apiClient } from '../lib/api'
-import { createValidationWs, type ValidationReport } from '../lib/ws'
+import {
+  createPreviewWs,
+  createValidationWs,
+  type TreeNode,
+  type ValidationReport,
+} from '../lib/ws'
 
 const DEFAULT_YAML = `# 在此貼入 BBDSL YAML 內容
 # 或從左側 Registry 瀏覽面板選擇一個 Convention 開始編輯
@@ -16,13 +21,14 @@ export default function Editor() {
   const [yaml, setYaml] = useState(DEFAULT_YAML)
   const [report, setReport] = useState<ValidationReport | null>(null)
   const [svgHtml, setSvgHtml] = useState<string>('')
+  const [treeNodes, setTreeNodes] = useState<Record<string, TreeNode>>({})
   const [exportFormat, setExportFormat] = useState('bml')
   const [showBrowser, setShowBrowser] = useState(true)
   const [shareUrl, setShareUrl] = useState<string | null>(null)
   const [saving, setSaving] = useState(false)
   const [shareStatus, setShareStatus] = useState<string | null>(null)
   const wsRef = useRef<ReturnType<typeof createValidationWs> | null>(null)
-  const svgTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null)
+  const previewRef = useRef<ReturnType<typeof createPreviewWs> | null>(null)
 
   // ── Load content from URL params (convention or share) ──
   useEffect(() => {
@@ -56,23 +62,23 @@ export default function Editor() {
     return () => ws.close()
   }, [])
 
-  // ── Handle YAML changes — validate + auto-preview SVG (5.2.8) ──
+  // ── Live bidding-tree preview: node patches pushed by the server ──
+  useEffect(() => {
+    const preview = createPreviewWs(setTreeNodes)
+    previewRef.current = preview
+
+    return () => preview.close()
+  }, [])
+
+  // ── Handle YAML changes — validate + live tree preview (5.2.8) ──
   const handleYamlChange = useCallback(
     (value: string) => {
       setYaml(value)
       // Send to WebSocket for validation (debounced inside ws client)
       wsRef.current?.send(value)
-
-      // Auto-update SVG preview after 1.5s of inactivity
-      if (svgTimerRef.current) clearTimeout(svgTimerRef.current)
-      svgTimerRef.current = setTimeout(async () => {
-        try {
-          const svg = await apiClient.exportDocument(value, 'svg')
-          setSvgHtml(svg)
-        } catch {
-          // Silently ignore preview errors during editing
-        }
-      }, 1500)
+      // The live tree replaces a manually exported SVG once editing resumes
+      previewRef.current?.send(value)
+      setSvgHtml('')
     },
     [],
   )
@@ -236,7 +242,7 @@ export default function Editor() {
           </div>
           <div className="p-4 flex-1">
             <h3 className="font-semibold mb-2">叫牌樹預覽</h3>
-            <BiddingTree svgHtml={svgHtml} />
+            <BiddingTree svgHtml={svgHtml} nodes={treeNodes} />
           </div>
         </div>
       </div>
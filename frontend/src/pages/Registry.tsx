@@ -1,45 +1,58 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { Link } from 'react-router-dom'
-import { apiClient, type Convention } from '../lib/api'
+import { apiClient, type Convention, type TagCount } from '../lib/api'
 
 const SORT_OPTIONS = [
+  // Server default: relevance when searching, newest otherwise
+  { value: '', label: '相關度' },
   { value: 'newest', label: '最新' },
   { value: 'oldest', label: '最舊' },
   { value: 'downloads', label: '下載數' },
   { value: 'name', label: '名稱' },
+  { value: 'rating', label: '評分' },
 ]
 
 export default function Registry() {
   const [conventions, setConventions] = useState<Convention[]>([])
   const [query, setQuery] = useState('')
   const [tagFilter, setTagFilter] = useState('')
-  const [sort, setSort] = useState('newest')
+  const [sort, setSort] = useState('')
   const [loading, setLoading] = useState(true)
   const [total, setTotal] = useState(0)
   const [page, setPage] = useState(1)
+  const [hasNext, setHasNext] = useState(false)
   const pageSize = 20
+  // Keyset cursors of the pages seen so far, for the current filters
+  const cursorsRef = useRef<{ key: string; pages: (string | null)[] }>({ key: '', pages: [] })
 
-  // Collect all unique tags across results for the filter chips
-  const allTags = Array.from(
-    new Set(
-      conventions
-        .flatMap((c) => (c.tags ? c.tags.split(',').map((t) => t.trim()) : []))
-        .filter(Boolean),
-    ),
-  ).sort()
+  // Most used tags across the registry, for the filter chips
+  const [allTags, setAllTags] = useState<TagCount[]>([])
+
+  useEffect(() => {
+    apiClient
+      .listTags({ limit: 30 })
+      .then((data) => setAllTags(data.items))
+      .catch(() => console.error('Failed to fetch tags'))
+  }, [])
 
   const fetchConventions = useCallback(async () => {
     setLoading(true)
+    const key = JSON.stringify([query, tagFilter, sort])
+    if (cursorsRef.current.key !== key) cursorsRef.current = { key, pages: [] }
+    const cursor = page > 1 ? cursorsRef.current.pages[page - 1] : undefined
     try {
       const data = await apiClient.listConventions({
         q: query || undefined,
         tag: tagFilter || undefined,
-        sort,
-        page,
+        sort: sort || undefined,
+        // Pages reached through "next" use the cursor; others fall back to offset
+        ...(cursor ? { cursor } : { page }),
         page_size: pageSize,
       })
       setConventions(data.items)
-      setTotal(data.total)
+      if (data.total !== null) setTotal(data.total)
+      cursorsRef.current.pages[page] = data.next_cursor
+      setHasNext(data.next_cursor !== null)
     } catch {
       console.error('Failed to fetch conventions')
     } finally {
@@ -79,7 +92,7 @@ export default function Registry() {
           type="text"
           value={query}
           onChange={(e) => setQuery(e.target.value)}
-          placeholder="搜尋 Convention 名稱或 namespace..."
+          placeholder="搜尋 Convention 名稱、說明、標籤或內容..."
           className="flex-1 min-w-[200px] border border-gray-300 rounded-lg px-4 py-2 focus:outline-none focus:ring-2 focus:ring-bbdsl-primary"
         />
         <select
@@ -108,7 +121,7 @@ export default function Registry() {
       {allTags.length > 0 && (
         <div className="mb-6 flex flex-wrap gap-2">
           <span className="text-sm text-gray-500 leading-6">標籤篩選：</span>
-          {allTags.map((tag) => (
+          {allTags.map(({ name: tag, count }) => (
             <button
               key={tag}
               onClick={() => handleTagClick(tag)}
@@ -118,7 +131,7 @@ export default function Registry() {
                   : 'bg-white text-gray-600 border-gray-300 hover:border-bbdsl-primary hover:text-bbdsl-primary'
               }`}
             >
-              {tag}
+              {tag} <span className="opacity-60">{count}</span>
             </button>
           ))}
           {tagFilter && (
@@ -233,7 +246,7 @@ export default function Registry() {
             </span>
             <button
               onClick={() => setPage((p) => p + 1)}
-              disabled={page >= totalPages}
+              disabled={!hasNext}
               className="px-4 py-2 border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition"
             >
               下一頁
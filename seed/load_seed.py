@@ -16,6 +16,7 @@ The script:
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 import re
 import sys
@@ -33,6 +34,8 @@ if str(BACKEND_DIR) not in sys.path:
 from app.core.database import async_session, create_tables  # noqa: E402
 from app.models.convention import Convention  # noqa: E402
 from app.models.user import User  # noqa: E402
+from app.services.search_service import index_convention  # noqa: E402
+from app.services.tag_service import set_convention_tags  # noqa: E402
 
 from sqlalchemy import select  # noqa: E402
 
@@ -143,9 +146,13 @@ async def load_seed() -> None:
                 description=meta["description"],
                 tags=meta["tags"],
                 yaml_content=content,
+                content_sha256=hashlib.sha256(content.encode("utf-8")).hexdigest(),
                 author_id=user.id,
             )
             db.add(conv)
+            await db.flush()
+            await set_convention_tags(db, conv.id, conv.tags)
+            await index_convention(db, conv)
             await db.commit()
             await db.refresh(conv)
             print(